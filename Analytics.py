@@ -0,0 +1,336 @@
+from __future__ import annotations
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_CHUNKSIZE = 100_000           # 한 번에 읽는 행 수 (메모리보다 큰 로그도 chunk 단위로 처리)
+YEAR_SEC          = 365.25 * 86400
+
+
+def drawdown(total: np.ndarray, peak0: float = -np.inf) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    자산 곡선 → (낙폭 비율 ≤ 0, 직전 고점)
+    • peak0: 앞 chunk 까지의 고점 (이어서 계산할 때)
+    """
+    peak = np.maximum.accumulate(np.maximum(total, peak0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dd = np.where(peak > 0, total / peak - 1.0, 0.0)
+    return dd, peak
+
+
+class EquityStats:
+    """
+    자산 스냅샷 스트림 통계 (chunk 를 순서대로 update, 결과는 전체를 한 번에 계산한 것과 같음)
+    • 낙폭: 누적 고점 대비, 최대 낙폭의 고점·저점 시각과 가장 긴 낙폭 기간
+    • 수익률: 연속 스냅샷 간 total_equity 변화율 → Sharpe · Sortino (무위험 수익률 0)
+    • 연환산: periods_per_year 미지정 시 기록 기간 대비 스냅샷 수로 추정 (장외 시간 반영)
+    """
+
+    def __init__(self, periods_per_year: Optional[float] = None) -> None:
+        self.periods_per_year = periods_per_year
+        self.rows     = 0
+        self.first_ts = self.last_ts = None
+        self.first    = self.last = None
+        self.sum_eq   = 0.0
+        # 수익률 합계 (평균·분산·하방 편차)
+        self.n = 0
+        self.sum_r = self.sum_r2 = self.sum_down2 = 0.0
+        # 낙폭
+        self.peak = -np.inf
+        self.peak_ts: Optional[float] = None
+        self.max_dd = 0.0
+        self.max_dd_peak_ts = self.max_dd_trough_ts = None
+        self.longest_dd_sec = 0.0
+
+    def update(self, ts: np.ndarray, total: np.ndarray) -> None:
+        if len(total) == 0:
+            return
+        ts    = np.asarray(ts, dtype=np.float64)
+        total = np.asarray(total, dtype=np.float64)
+
+        prev = np.concatenate(([self.last], total[:-1])) if self.last is not None else total[:-1]
+        cur  = total if self.last is not None else total[1:]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.where(prev != 0, cur / prev - 1.0, 0.0)
+        self.n         += len(r)
+        self.sum_r     += float(r.sum())
+        self.sum_r2    += float((r * r).sum())
+        self.sum_down2 += float((np.minimum(r, 0.0) ** 2).sum())
+
+        dd, peak = drawdown(total, self.peak)
+        # 고점 갱신 시각: 새 고점이 나온 위치의 ts 를 앞으로 채움
+        new_peak = peak > np.concatenate(([self.peak], peak[:-1]))
+        idx = np.maximum.accumulate(np.where(new_peak, np.arange(len(total)), -1))
+        peak_ts = np.where(idx >= 0, ts[np.maximum(idx, 0)], np.nan if self.peak_ts is None else self.peak_ts)
+
+        i = int(dd.argmin())
+        if dd[i] < self.max_dd:
+            self.max_dd = float(dd[i])
+            self.max_dd_peak_ts, self.max_dd_trough_ts = float(peak_ts[i]), float(ts[i])
+
+        # 낙폭 기간 = 고점 이후 다시 고점을 넘을 때까지 (진행 중이면 마지막 스냅샷까지)
+        under = dd < 0
+        if under.any():
+            self.longest_dd_sec = max(self.longest_dd_sec, float(np.nanmax(np.where(under, ts - peak_ts, 0.0))))
+
+        self.peak, self.peak_ts = float(peak[-1]), float(peak_ts[-1])
+        if self.first is None:
+            self.first, self.first_ts = float(total[0]), float(ts[0])
+        self.last, self.last_ts = float(total[-1]), float(ts[-1])
+        self.rows   += len(total)
+        self.sum_eq += float(total.sum())
+
+    def result(self) -> Dict[str, float]:
+        span = (self.last_ts - self.first_ts) if self.rows else 0.0
+        ppy  = self.periods_per_year or (self.n / (span / YEAR_SEC) if span > 0 else 0.0)
+        mean = self.sum_r / self.n if self.n else 0.0
+        var  = (self.sum_r2 - self.n * mean * mean) / (self.n - 1) if self.n > 1 else 0.0
+        std  = math.sqrt(max(var, 0.0))
+        down = math.sqrt(self.sum_down2 / self.n) if self.n else 0.0
+        return {
+            "snapshots":        self.rows,
+            "start_ts":         self.first_ts,
+            "end_ts":           self.last_ts,
+            "days":             span / 86400,
+            "start_equity":     self.first or 0.0,
+            "end_equity":       self.last or 0.0,
+            "mean_equity":      self.sum_eq / self.rows if self.rows else 0.0,
+            "return_pct":       (self.last / self.first - 1) * 100 if self.first else 0.0,
+            "max_drawdown_pct": self.max_dd * 100,
+            "max_dd_peak_ts":   self.max_dd_peak_ts,
+            "max_dd_trough_ts": self.max_dd_trough_ts,
+            "longest_dd_days":  self.longest_dd_sec / 86400,
+            "current_dd_pct":   (self.last / self.peak - 1) * 100 if self.rows and self.peak > 0 else 0.0,
+            "periods_per_year": ppy,
+            "sharpe":           mean / std * math.sqrt(ppy) if std > 0 else 0.0,
+            "sortino":          mean / down * math.sqrt(ppy) if down > 0 else 0.0,
+        }
+
+
+@dataclass
+class SymbolPnl:
+    """종목별 누적 실현손익 · 거래 통계"""
+    buys:          int   = 0
+    sells:         int   = 0
+    closes:        int   = 0              # 원가를 짝지은 매도 수 (승률 분모)
+    wins:          int   = 0
+    buy_notional:  float = 0.0
+    sell_notional: float = 0.0
+    realized:      float = 0.0
+    unmatched_qty: float = 0.0            # 기록 시작 전 매수분이라 원가를 알 수 없는 매도 수량 (손익 0 처리)
+    lots: np.ndarray = field(default_factory=lambda: np.empty((0, 2)))   # 미청산 (수량, 원가 합계), FIFO 순
+
+    @property
+    def open_qty(self) -> float:
+        return float(self.lots[:, 0].sum())
+
+    @property
+    def open_cost(self) -> float:
+        return float(self.lots[:, 1].sum())
+
+
+class FifoLedger:
+    """
+    FIFO 원가 기준 실현손익 (chunk 단위, 종목별 벡터화)
+    • 매수를 누적 수량 → 누적 원가 곡선으로 두면, 매도가 소진하는 구간 [c_prev, c] 의 원가는
+      np.interp 두 번으로 계산 (매수 로트 순회 없음)
+    • 소진 위치 c_k = min(c_(k-1) + 매도_k, 매도 시점까지 매수 누적 A_k)
+      = S_k + min(0, cummin(A - S))  (S: 매도 누적) → 보유보다 많이 판 수량은 이후 매수를 당겨 쓰지 않음
+    • 다음 chunk 로는 미청산 로트만 넘김
+    """
+
+    def __init__(self) -> None:
+        self.symbols: Dict[str, SymbolPnl] = {}
+
+    def update(self, trades: pd.DataFrame) -> None:
+        if trades.empty:
+            return
+        for sym, df in trades.groupby("symbol", sort=False):
+            self._update_symbol(self.symbols.setdefault(str(sym), SymbolPnl()), df)
+
+    @staticmethod
+    def _update_symbol(st: SymbolPnl, df: pd.DataFrame) -> None:
+        buy      = (df["side"] == "buy").to_numpy()
+        qty      = df["qty"].to_numpy(dtype=np.float64)
+        price    = df["price"].to_numpy(dtype=np.float64)
+        notional = qty * price
+
+        # 매수 곡선: 이월 로트 + 이번 chunk 매수 (시간순 = FIFO 순)
+        b_qty  = np.concatenate((st.lots[:, 0], qty[buy]))
+        b_cost = np.concatenate((st.lots[:, 1], notional[buy]))
+        cum_q  = np.concatenate(([0.0], np.cumsum(b_qty)))
+        cum_c  = np.concatenate(([0.0], np.cumsum(b_cost)))
+
+        s_qty = qty[~buy]
+        S = np.cumsum(s_qty)
+        A = st.open_qty + np.cumsum(np.where(buy, qty, 0.0))[~buy]
+        c = S + np.minimum(0.0, np.minimum.accumulate(A - S)) if len(S) else S
+        c_prev  = np.concatenate(([0.0], c[:-1]))
+        matched = c - c_prev
+        cost    = np.interp(c, cum_q, cum_c) - np.interp(c_prev, cum_q, cum_c)
+        pnl     = matched * price[~buy] - cost
+
+        st.buys   += int(buy.sum())
+        st.sells  += len(s_qty)
+        st.closes += int((matched > 0).sum())
+        st.wins   += int((pnl > 1e-9).sum())
+        st.buy_notional  += float(notional[buy].sum())
+        st.sell_notional += float(notional[~buy].sum())
+        st.realized      += float(pnl.sum())
+        st.unmatched_qty += float((s_qty - matched).sum())
+
+        # 남은 로트: 소진 위치 이후만 이월 (첫 로트는 일부 소진 가능)
+        used = float(c[-1]) if len(c) else 0.0
+        keep = cum_q[1:] > used + 1e-12
+        lots = np.column_stack((b_qty[keep], b_cost[keep]))
+        if len(lots):
+            cut = used - cum_q[:-1][keep][0]
+            if cut > 0:
+                lots[0] = (lots[0, 0] - cut, lots[0, 1] * (1 - cut / lots[0, 0]))
+        st.lots = lots
+
+    def result(self) -> Dict[str, float]:
+        syms = self.symbols.values()
+        closes = sum(s.closes for s in syms)
+        return {
+            "trades":          sum(s.buys + s.sells for s in syms),
+            "buys":            sum(s.buys for s in syms),
+            "sells":           sum(s.sells for s in syms),
+            "win_rate_pct":    100 * sum(s.wins for s in syms) / closes if closes else 0.0,
+            "realized_pnl":    sum(s.realized for s in syms),
+            "traded_notional": sum(s.buy_notional + s.sell_notional for s in syms),
+            "open_cost":       sum(s.open_cost for s in syms),
+            "unmatched_qty":   sum(s.unmatched_qty for s in syms),
+        }
+
+    def per_symbol(self) -> pd.DataFrame:
+        rows = [
+            {
+                "symbol":        sym,
+                "trades":        s.buys + s.sells,
+                "win_rate_pct":  100 * s.wins / s.closes if s.closes else 0.0,
+                "realized_pnl":  s.realized,
+                "buy_notional":  s.buy_notional,
+                "sell_notional": s.sell_notional,
+                "open_qty":      s.open_qty,
+                "open_cost":     s.open_cost,
+            }
+            for sym, s in self.symbols.items()
+        ]
+        df = pd.DataFrame(rows, columns=[
+            "symbol", "trades", "win_rate_pct", "realized_pnl", "buy_notional", "sell_notional", "open_qty", "open_cost",
+        ])
+        return df.sort_values("realized_pnl", ascending=False, ignore_index=True)
+
+
+# ─────────────────────────────────────────────────────────────
+# 보고서
+# ─────────────────────────────────────────────────────────────
+def analyze(
+    equity_chunks: Iterable[pd.DataFrame],
+    trade_chunks: Iterable[pd.DataFrame],
+    periods_per_year: Optional[float] = None,
+) -> Dict[str, object]:
+    """
+    chunk 스트림(ts 오름차순) → 성과 보고서
+    • 반환: {"summary": 전체 지표 dict, "symbols": 종목별 DataFrame, "elapsed_sec": 소요 시간}
+    """
+    t0 = time.perf_counter()
+    eq = EquityStats(periods_per_year)
+    for df in equity_chunks:
+        eq.update(df["ts"].to_numpy(), df["total_equity"].to_numpy())
+    ledger = FifoLedger()
+    for df in trade_chunks:
+        ledger.update(df)
+
+    summary = {**eq.result(), **ledger.result()}
+    mean_eq = summary["mean_equity"]
+    years   = summary["days"] / 365.25
+    # 회전율: 거래 금액(매수+매도)/2 ÷ 평균 자산 (연환산은 기록 기간 기준)
+    summary["turnover"] = summary["traded_notional"] / 2 / mean_eq if mean_eq else 0.0
+    summary["turnover_annual"] = summary["turnover"] / years if years > 0 else 0.0
+    return {"summary": summary, "symbols": ledger.per_symbol(), "elapsed_sec": time.perf_counter() - t0}
+
+
+def report(
+    logger,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    periods_per_year: Optional[float] = None,
+) -> Dict[str, object]:
+    """TradeLogger 기록(csv · sqlite)을 chunk 단위로 읽어 analyze"""
+    return analyze(
+        logger.iter_equity(start, end, chunksize),
+        logger.iter_trades(start, end, chunksize),
+        periods_per_year,
+    )
+
+
+def _fmt_ts(ts: Optional[float]) -> str:
+    if ts is None or ts != ts:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M", time.localtime(ts))
+
+
+def format_report(rep: Dict[str, object], currency: str = "USD") -> str:
+    s = rep["summary"]
+    lines = [
+        f"기간           {_fmt_ts(s['start_ts'])} ~ {_fmt_ts(s['end_ts'])} ({s['days']:.1f}일, 스냅샷 {s['snapshots']:,})",
+        f"자산           {s['start_equity']:,.2f} → {s['end_equity']:,.2f} {currency} ({s['return_pct']:+.2f}%)",
+        f"최대 낙폭      {s['max_drawdown_pct']:.2f}% ({_fmt_ts(s['max_dd_peak_ts'])} → {_fmt_ts(s['max_dd_trough_ts'])})"
+        f", 최장 {s['longest_dd_days']:.1f}일, 현재 {s['current_dd_pct']:.2f}%",
+        f"Sharpe/Sortino {s['sharpe']:.2f} / {s['sortino']:.2f} (연 {s['periods_per_year']:,.0f} 구간 기준)",
+        f"거래           {s['trades']:,}건 (매수 {s['buys']:,} · 매도 {s['sells']:,}), 승률 {s['win_rate_pct']:.1f}%",
+        f"실현손익(FIFO) {s['realized_pnl']:+,.2f} {currency}, 미청산 원가 {s['open_cost']:,.2f}",
+        f"회전율         {s['turnover']:.2f}회 (연 {s['turnover_annual']:.1f}회)",
+    ]
+    if s["unmatched_qty"]:
+        lines.append(f"⚠️ 기록 이전 매수분 매도 {s['unmatched_qty']:g}주는 손익 0 으로 처리")
+    sym = rep["symbols"]
+    if not sym.empty:
+        lines.append("")
+        lines.append(f"{'symbol':<8}{'trades':>8}{'win%':>8}{'realized':>14}{'open qty':>10}{'open cost':>12}")
+        for r in sym.itertuples(index=False):
+            lines.append(
+                f"{r.symbol:<8}{r.trades:>8}{r.win_rate_pct:>7.1f}%{r.realized_pnl:>+14,.2f}{r.open_qty:>10g}{r.open_cost:>12,.2f}"
+            )
+    lines.append(f"\n(분석 {1e3 * rep['elapsed_sec']:.0f}ms)")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import datetime as dt
+    import json
+    from pathlib import Path
+
+    from TradeLogger import BACKENDS, TradeLogger
+    from TradeStore import DEFAULT_DB_NAME
+
+    def _epoch(s: Optional[str]) -> Optional[float]:
+        return dt.datetime.fromisoformat(s).timestamp() if s else None
+
+    ap = argparse.ArgumentParser(description="거래·자산 기록 성과 분석 (낙폭 · Sharpe · Sortino · FIFO 손익)")
+    ap.add_argument("--log-dir", default="logs")
+    ap.add_argument("--backend", choices=BACKENDS, default=None, help="기본: trades.db 가 있으면 sqlite")
+    ap.add_argument("--start", help="YYYY-MM-DD[ HH:MM]")
+    ap.add_argument("--end", help="YYYY-MM-DD[ HH:MM] (미포함)")
+    ap.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    ap.add_argument("--periods-per-year", type=float, default=None, help="기본: 기록 간격으로 추정")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    backend = args.backend or ("sqlite" if (Path(args.log_dir) / DEFAULT_DB_NAME).exists() else "csv")
+    logger = TradeLogger(args.log_dir, backend=backend, flush_interval=0)
+    rep = report(logger, _epoch(args.start), _epoch(args.end), args.chunksize, args.periods_per_year)
+    logger.close()
+    if args.json:
+        print(json.dumps({**rep, "symbols": rep["symbols"].to_dict("records")}, indent=2, ensure_ascii=False))
+    else:
+        print(format_report(rep))
@@ -1,23 +1,30 @@
 from __future__ import annotations
-import time
 import threading
 import datetime as dt
-import statistics
-from typing import List, Dict, Optional
+from concurrent import futures
+from typing import List, Dict, Optional, Union
 
-import numpy as np
 import yaml
 from zoneinfo import ZoneInfo
 
+import Clock
+import Metrics
+from Bars import MinuteBars
+from Strategy import BUY_THRESHOLD, SELL_THRESHOLD, Strategy
+from StreamingIndicators import StreamingScorer
 from TradingBot import TradingBot
-from NewsCrawler import NewsCrawler
-from SentimentAnalyzer import SentimentAnalyzer
-from TradeLogger import TradeLogger
-
-# ───── 시간 설정 (변경 불가) ───────────────────────────
+from Universe import UniversePlanner
+from MarketCalendar import DEFAULT_TICK_OFFSET_SEC, BarScheduler, MarketCalendar
+from Profiler import TickProfiler
+from Events import DEFAULT_MAX_QUIET_TICKS, DEFAULT_PRICE_MOVE_PCT, TRIGGERS, ChangeDetector
+from Deadline import DEFAULT_TICK_DEADLINE_SEC, TickDeadline
+from DataPlane import DataPlane
+from Charts import DEFAULT_FORMAT, DEFAULT_MAX_POINTS
+from Ledger import DEFAULT_CHECKPOINT_EVERY
+from TradeLogger import DEFAULT_BACKEND, DEFAULT_FLUSH_INTERVAL_SEC, DEFAULT_FSYNC, TradeLogger
+
+# ───── 시간 설정 (변경 불가, 정규장·휴장일은 MarketCalendar) ──
 ET            = ZoneInfo("US/Eastern")
-MARKET_OPEN   = dt.time(9, 30, tzinfo=ET)
-MARKET_CLOSE  = dt.time(16, 0, tzinfo=ET)
 # ───────────────────────────────────────────────────────
 
 # ───── 기본 설정값 (config.yaml에서 재정의 가능) ───────
@@ -25,15 +32,51 @@ DEFAULT_SYMBOLS           = ["AAPL", "MSFT", "AMZN"]
 DEFAULT_BUY_UNIT_USD      = 100
 DEFAULT_MOMENTUM_BARS     = 3
 DEFAULT_RSI_PERIOD        = 14
+DEFAULT_RSI_MODE          = "simple"     # simple | wilder
+DEFAULT_STREAMING         = False        # True: 틱마다 새 봉만 반영하는 스트리밍 지표 사용
 DEFAULT_TEST_MODE         = True
 DEFAULT_INTERVAL_SEC      = 60
 DEFAULT_IDLE_INTERVAL_SEC = 30 * 60
+DEFAULT_PIPELINE_WORKERS  = 0            # 틱 내부 동시 I/O 스레드 수 (0: 종목 수 × 2 + 2, 최대 32)
+DEFAULT_UNIVERSE_MODE     = False        # True: 종목을 배치로 나눠 우선순위 순으로 시간 예산 안에서 처리
+DEFAULT_UNIVERSE_BATCH    = 25           # universe 모드 배치 크기
+DEFAULT_TICK_BUDGET_RATIO = 0.8          # universe 모드 틱 시간 예산 (INTERVAL_SEC 대비)
+DEFAULT_NEWS_REFRESH_SEC  = 0            # 종목별 뉴스 재수집 간격 (0: 매 틱, universe 모드 900, 이벤트 모드 300)
+DEFAULT_EVENT_MODE        = False        # True: 입력(분봉·헤드라인·가격·체결)이 바뀐 종목만 재평가
+DEFAULT_METRICS_PORT      = 0            # >0 이면 127.0.0.1:PORT/metrics 로 지연 메트릭 노출
+DEFAULT_NEWS_RATE_PER_SEC = 2            # 뉴스 크롤링 초당 종목 수 (처음 DataPlane.NEWS_BURST 종목은 즉시)
+DEFAULT_PROFILE_TICKS     = 0            # >0 이면 시작 후 N틱 프로파일 (실행 중에는 SIGUSR1 / logs/profile.on)
+DEFAULT_PROFILE_CONTINUOUS = False       # True: 저빈도 상시 샘플링, PROFILE_DUMP_EVERY 틱마다 저장
+DEFAULT_PROFILE_DUMP_EVERY = 60
+DEFAULT_CHART_REPORT_SEC  = 0            # >0 이면 이 주기로 logs/charts 에 차트 파일 갱신 (새 기록이 있을 때만)
+DEFAULT_BAR_STORE         = ""           # 경로 지정 시 매 틱 완성된 분봉을 BarStore 에 추가 (예: data/bars)
+DEFAULT_LOG_DIR           = "logs"       # TradeLogger 기록·차트 폴더 (StrategyEngine 전략별 기본 logs/<NAME>)
 # ───────────────────────────────────────────────────────
 
 # ─── Logger 시작 잔액 설정 (config.yaml에서 재정의 불가) ────
 DEFAULT_START_CASH_USD    = 430
 # ───────────────────────────────────────────────────────
 
+# ───── config.yaml 변경 시 실행 중에 바로 반영되는 키 (그 밖의 키는 워커 재생성) ──
+HOT_RELOAD_KEYS = (
+    "BUY_UNIT_USD", "TEST_MODE", "INTERVAL_SEC", "IDLE_INTERVAL_SEC", "TICK_OFFSET_SEC",
+    "TICK_BUDGET_SEC", "NEWS_REFRESH_SEC", "NEWS_RATE_PER_SEC", "SCORE_WEIGHTS",
+    "BUY_THRESHOLD", "SELL_THRESHOLD", "EXTRA_HOLIDAYS", "EARLY_CLOSES", "UNIVERSE_BATCH",
+    "EVENT_TRIGGERS", "EVENT_PRICE_MOVE_PCT", "EVENT_MAX_QUIET_TICKS",
+    "API_RATE_PER_SEC", "ORDER_RATE_PER_SEC", "CHART_REPORT_SEC", "CHART_FORMAT", "CHART_MAX_POINTS",
+    "TICK_DEADLINE_SEC", "STAGE_BUDGETS", "MAX_POSITIONS",
+)
+# 바뀌면 TradingBot(토큰·HTTP 세션)까지 새로 만들어야 하는 키
+BOT_KEYS = ("APP_KEY", "APP_SECRET", "CANO", "ACNT_PRDT_CD", "URL_BASE", "TOKEN_FILE", "DISCORD_WEBHOOK_URL")
+# 바뀌면 TradeLogger 를 닫고 새로 만들어야 하는 키 (새 logger 는 장부 체크포인트로 잔고·실현손익 복원)
+LOGGER_KEYS = ("LOG_DIR", "LOG_FLUSH_SEC", "LOG_FSYNC", "LOG_BACKEND", "LEDGER_CHECKPOINT_EVERY")
+
+
+def load_config(path: str) -> Dict:
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
 class AutoTrader:
     def __init__(
         self,
@@ -41,35 +84,236 @@ class AutoTrader:
         stop_event: threading.Event,
         config_path: str = "config.yaml",
         symbols: Optional[List[str]] = None,
+        warm: Optional["AutoTrader"] = None,
+        config: Optional[Dict] = None,
+        plane: Optional[DataPlane] = None,
+        name: str = "",
     ) -> None:
-        self.stop_event = stop_event
+        """
+        warm:   이전 AutoTrader (Supervisor 재시작용) → TradingBot·TradeLogger·뉴스/지표/이벤트 캐시 인계
+        config: config_path 파일 대신 쓸 설정 (이미 읽은 설정, StrategyEngine 의 전략별 설정)
+        plane:  여러 전략이 함께 쓰는 DataPlane (없으면 이 인스턴스 전용으로 만들고 틱 시작도 직접)
+        name:   전략 이름 (알림 앞에 [name] 표시)
+        """
+        self.stop_event  = stop_event
+        self.config_path = config_path
+        self.name        = name
+        self.standalone  = plane is None
 
         # config.yaml 로드
-        with open(config_path, encoding="utf-8") as f:
-            cfg = yaml.safe_load(f)
+        cfg = self.cfg = config if config is not None else load_config(config_path)
+
+        # TradingBot 초기화 (API 설정, 계정 정보가 같으면 이전 인스턴스의 토큰·HTTP 세션 재사용)
+        if warm is not None and all(cfg.get(k) == warm.cfg.get(k) for k in BOT_KEYS):
+            self.bot = warm.bot
+        else:
+            self.bot = TradingBot(config_path=config_path, config=config)
+        self.bot.name = name
+
+        # Logger 연동 (기본 USD 단위 시작 잔액 전달, 기존 기록이 있으면 장부 체크포인트로 잔고·실현손익 복원)
+        # 기록 설정이 같으면 이전 인스턴스의 logger 재사용, 바뀌었으면 이전 logger 를 닫고(체크포인트 저장) 새로 생성
+        if warm is not None and all(cfg.get(k) == warm.cfg.get(k) for k in LOGGER_KEYS):
+            self.bot.logger = warm.bot.logger
+        else:
+            if warm is not None and warm.bot.logger:
+                warm.bot.logger.close()
+            self.bot.logger = TradeLogger(
+                log_dir=cfg.get("LOG_DIR", DEFAULT_LOG_DIR),
+                initial_cash=DEFAULT_START_CASH_USD,
+                currency="USD",
+                flush_interval=cfg.get("LOG_FLUSH_SEC", DEFAULT_FLUSH_INTERVAL_SEC),
+                fsync=cfg.get("LOG_FSYNC", DEFAULT_FSYNC),
+                backend=cfg.get("LOG_BACKEND", DEFAULT_BACKEND),
+                checkpoint_every=cfg.get("LEDGER_CHECKPOINT_EVERY", DEFAULT_CHECKPOINT_EVERY),
+            )
+
+        # 사용자 정의 가능한 설정 (워커 재생성 시에만 변경)
+        self.symbols           = cfg.get("SYMBOLS", symbols or DEFAULT_SYMBOLS)
+        self.momentum_bars     = cfg.get("MOMENTUM_BARS", DEFAULT_MOMENTUM_BARS)
+        self.rsi_period        = cfg.get("RSI_PERIOD", DEFAULT_RSI_PERIOD)
+        self.rsi_mode          = cfg.get("RSI_MODE", DEFAULT_RSI_MODE)
+        self.streaming         = cfg.get("STREAMING_INDICATORS", DEFAULT_STREAMING)
+        self.pipeline_workers  = cfg.get("PIPELINE_WORKERS", DEFAULT_PIPELINE_WORKERS)
+        self.universe_mode     = cfg.get("UNIVERSE_MODE", DEFAULT_UNIVERSE_MODE)
+        self.event_mode        = cfg.get("EVENT_MODE", DEFAULT_EVENT_MODE)
 
-        # TradingBot 초기화 (API 설정)
-        self.bot = TradingBot(config_path=config_path)
+        # 시장 데이터(뉴스·감정·분봉·환율) 조회·캐시 — StrategyEngine 이 주면 공유, 아니면 전용
+        self.plane = plane or self._make_plane(cfg)
 
-        # Logger 연동 (기본 USD 단위 시작 잔액 전달)
-        self.bot.logger = TradeLogger(
-            log_dir="logs",
-            initial_cash=DEFAULT_START_CASH_USD,
-            currency="USD",
+        # 내부 상태
+        self.soldout        = {s: False for s in self.symbols}
+        self._last_idle_msg = 0.0
+        self._last_chart    = 0.0
+        self.universe: Optional[UniversePlanner] = (
+            UniversePlanner(self.symbols, cfg.get("UNIVERSE_BATCH", DEFAULT_UNIVERSE_BATCH))
+            if self.universe_mode else None
+        )
+        self.last_coverage: Optional[Dict[str, float]] = None
+        self.last_degraded: Dict[str, List[str]] = {}  # 직전 틱에서 예산을 넘겨 직전 값을 쓴 단계 → 종목
+        self.deadline = TickDeadline(0.0, 0)
+        # 틱 마감 초과 시 대신 쓸 직전 정상 값 (늦게 끝난 조회도 여기에 반영, 분봉·감정은 DataPlane)
+        self._last_cash: Optional[float] = None
+        self._last_holdings: Optional[Dict[str, int]] = None
+        self._tick_cash: Optional[float] = None          # 이번 틱에 결정된 USD 잔고
+        self._inflight: Dict[str, futures.Future] = {}   # 계좌 조회 → 진행 중인 Future
+        self.events: Optional[ChangeDetector] = ChangeDetector() if self.event_mode else None
+
+        # 실행 중 변경 가능한 설정 (HOT_RELOAD_KEYS) + 점수·매매 판단 + 틱 스케줄
+        self._apply_settings(cfg)
+
+        self.streamer: Optional[StreamingScorer] = (
+            StreamingScorer(
+                self.symbols,
+                momentum_bars=self.momentum_bars,
+                rsi_period=self.rsi_period,
+                rsi_mode=self.rsi_mode,
+                weights=self.strategy.weights,
+            )
+            if self.streaming else None
         )
 
-        # 사용자 정의 가능한 설정
-        self.symbols           = cfg.get("SYMBOLS", symbols or DEFAULT_SYMBOLS)
+        # 단계별 지연 메트릭 (HTTP 노출 + 종료 시 logs/metrics_*.json 저장)
+        self.metrics_server = Metrics.serve(cfg.get("METRICS_PORT", DEFAULT_METRICS_PORT))
+        Metrics.dump_at_exit("logs")
+        # 계좌 조회(잔고·보유 종목)용 스레드 (종목별 조회는 DataPlane 풀)
+        self._pool = futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="tick")
+
+        # 온디맨드 프로파일 (logs/profile/*.folded + *.txt, StrategyEngine 에서는 엔진 틱 전체를 엔진이 프로파일)
+        self.profiler: Optional[TickProfiler] = None
+        if self.standalone:
+            self.profiler = profiler_from_config(cfg, self.bot.send_message)
+            self.profiler.install_signal()
+
+        if warm is not None:
+            self._adopt(warm)
+
+    def _make_plane(self, cfg: Dict) -> DataPlane:
+        """단독 실행용 전용 DataPlane"""
+        return DataPlane(
+            self.bot,
+            workers=self.pipeline_workers or min(32, len(self.symbols) * 2 + 2),
+            store_dir=cfg.get("BAR_STORE", DEFAULT_BAR_STORE),
+        )
+
+    # ─── 설정 반영 ─────────────────────────────────────
+    def _build_settings(self, cfg: Dict) -> tuple:
+        """
+        설정 값 확인 + 판단·스케줄 객체 생성 (Strategy, MarketCalendar, BarScheduler)
+        • 잘못된 값(STAGE_BUDGETS 단계 이름, EVENT_TRIGGERS, 날짜 형식 등)은 속성을 바꾸기 전에 여기서 예외
+        """
+        interval_sec = cfg.get("INTERVAL_SEC", DEFAULT_INTERVAL_SEC)
+        for key in ("API_RATE_PER_SEC", "ORDER_RATE_PER_SEC", "NEWS_RATE_PER_SEC"):
+            float(cfg.get(key) or 0)                    # 요청 제한기 값 형식
+        TickDeadline(0.0, cfg.get("TICK_DEADLINE_SEC", DEFAULT_TICK_DEADLINE_SEC), cfg.get("STAGE_BUDGETS") or {})
+        if self.events is not None:
+            ChangeDetector().configure(
+                triggers=cfg.get("EVENT_TRIGGERS", TRIGGERS),
+                price_move_pct=cfg.get("EVENT_PRICE_MOVE_PCT", DEFAULT_PRICE_MOVE_PCT),
+                max_quiet_ticks=cfg.get("EVENT_MAX_QUIET_TICKS", DEFAULT_MAX_QUIET_TICKS),
+            )
+
+        # 점수·매매 판단 (Backtester 와 공유)
+        strategy = Strategy(
+            buy_unit_usd=cfg.get("BUY_UNIT_USD", DEFAULT_BUY_UNIT_USD),
+            momentum_bars=self.momentum_bars,
+            rsi_period=self.rsi_period,
+            rsi_mode=self.rsi_mode,
+            weights=cfg.get("SCORE_WEIGHTS"),
+            buy_threshold=cfg.get("BUY_THRESHOLD", BUY_THRESHOLD),
+            sell_threshold=cfg.get("SELL_THRESHOLD", SELL_THRESHOLD),
+        )
+        # 거래일 달력 + 분봉 마감 기준 틱 스케줄 (INTERVAL_SEC = 봉 길이)
+        calendar  = MarketCalendar(cfg.get("EXTRA_HOLIDAYS", ()), cfg.get("EARLY_CLOSES", ()))
+        scheduler = BarScheduler(calendar, interval_sec, cfg.get("TICK_OFFSET_SEC", DEFAULT_TICK_OFFSET_SEC))
+        return strategy, calendar, scheduler
+
+    def validate_config(self, cfg: Dict) -> None:
+        """실행 중 반영 전 확인 — 잘못된 값이면 예외 (현재 설정은 그대로)"""
+        self._build_settings(cfg)
+
+    def _apply_settings(self, cfg: Dict) -> None:
+        strategy, calendar, scheduler = self._build_settings(cfg)     # 실패하면 여기서 끝 (설정 일부만 바뀌지 않음)
+
         self.buy_unit_usd      = cfg.get("BUY_UNIT_USD", DEFAULT_BUY_UNIT_USD)
-        self.momentum_bars     = cfg.get("MOMENTUM_BARS", DEFAULT_MOMENTUM_BARS)
-        self.rsi_period        = cfg.get("RSI_PERIOD", DEFAULT_RSI_PERIOD)
         self.test_mode         = cfg.get("TEST_MODE", DEFAULT_TEST_MODE)
         self.interval_sec      = cfg.get("INTERVAL_SEC", DEFAULT_INTERVAL_SEC)
         self.idle_interval_sec = cfg.get("IDLE_INTERVAL_SEC", DEFAULT_IDLE_INTERVAL_SEC)
+        self.tick_offset_sec   = cfg.get("TICK_OFFSET_SEC", DEFAULT_TICK_OFFSET_SEC)
+        self.tick_budget_sec   = cfg.get("TICK_BUDGET_SEC", self.interval_sec * DEFAULT_TICK_BUDGET_RATIO)
+        self.news_refresh_sec  = cfg.get(
+            "NEWS_REFRESH_SEC",
+            900 if self.universe_mode else 300 if self.event_mode else DEFAULT_NEWS_REFRESH_SEC,
+        )
+        if self.standalone:
+            self.plane.configure(
+                self.news_refresh_sec,
+                cfg.get("NEWS_RATE_PER_SEC", DEFAULT_NEWS_RATE_PER_SEC),
+                headline_keys=self.event_mode,
+            )
+        self.bot.apply_limits(cfg)
+        self.chart_report_sec  = cfg.get("CHART_REPORT_SEC", DEFAULT_CHART_REPORT_SEC)
+        self.chart_format      = cfg.get("CHART_FORMAT", DEFAULT_FORMAT)
+        self.chart_max_points  = cfg.get("CHART_MAX_POINTS", DEFAULT_MAX_POINTS)
+        self.tick_deadline_sec = cfg.get("TICK_DEADLINE_SEC", DEFAULT_TICK_DEADLINE_SEC)
+        self.stage_budgets     = cfg.get("STAGE_BUDGETS") or {}
+
+        self.strategy = strategy
+        if getattr(self, "streamer", None) is not None:
+            self.streamer.weights = self.strategy.weights
+        self.calendar  = calendar
+        self.scheduler = scheduler
+
+        if self.universe is not None:
+            self.universe.batch_size = cfg.get("UNIVERSE_BATCH", DEFAULT_UNIVERSE_BATCH)
+        if self.events is not None:
+            self.events.configure(
+                triggers=cfg.get("EVENT_TRIGGERS", TRIGGERS),
+                price_move_pct=cfg.get("EVENT_PRICE_MOVE_PCT", DEFAULT_PRICE_MOVE_PCT),
+                max_quiet_ticks=cfg.get("EVENT_MAX_QUIET_TICKS", DEFAULT_MAX_QUIET_TICKS),
+            )
 
-        # 내부 상태
-        self.soldout        = {s: False for s in self.symbols}
-        self._last_idle_msg = 0.0
+    def cold_changes(self, cfg: Dict) -> List[str]:
+        """cfg 와 현재 설정을 비교해 워커 재생성이 필요한 변경 키 목록"""
+        keys = set(cfg) | set(self.cfg)
+        return sorted(k for k in keys if k not in HOT_RELOAD_KEYS and cfg.get(k) != self.cfg.get(k))
+
+    def reload_config(self, cfg: Dict) -> List[str]:
+        """HOT_RELOAD_KEYS 변경분을 실행 중에 반영하고 바뀐 키 목록 반환 (잘못된 값이면 아무것도 바꾸지 않고 예외)"""
+        changed = sorted(k for k in HOT_RELOAD_KEYS if cfg.get(k) != self.cfg.get(k))
+        if changed:
+            self._apply_settings(cfg)
+            self.cfg = cfg
+        return changed
+
+    def _adopt(self, warm: "AutoTrader") -> None:
+        """이전 인스턴스의 캐시·상태 인계 후 이전 스레드 풀·프로파일러 정리"""
+        if self.standalone and warm.standalone:
+            self.plane.adopt(warm.plane)
+        self._last_idle_msg = warm._last_idle_msg
+        self._last_chart    = warm._last_chart
+        self._last_cash     = warm._last_cash
+        self._last_holdings = warm._last_holdings
+        self.soldout        = {s: warm.soldout.get(s, False) for s in self.symbols}
+
+        same_indicators = (
+            (warm.symbols, warm.momentum_bars, warm.rsi_period, warm.rsi_mode)
+            == (self.symbols, self.momentum_bars, self.rsi_period, self.rsi_mode)
+        )
+        if self.streamer is not None and warm.streamer is not None and same_indicators:
+            self.streamer = warm.streamer
+            self.streamer.weights = self.strategy.weights
+        if self.universe is not None and warm.universe is not None:
+            self.universe.tick = warm.universe.tick
+            self.universe.last_total.update(warm.universe.last_total)
+            self.universe.news_count.update(warm.universe.news_count)
+            self.universe.last_tick.update(warm.universe.last_tick)
+        if self.events is not None and warm.events is not None:
+            self.events.state = warm.events.state
+
+        if warm.profiler is not None:
+            warm.profiler.close()
+        warm._pool.shutdown(wait=False, cancel_futures=True)
+        warm._release_processes()              # run() 이 close 까지 가지 못한 경우 (예외 종료·생성 실패)
 
     # ─── 4-Factor 스코어 계산 ───────────────────────────
     def compute_scores(
@@ -77,161 +321,139 @@ class AutoTrader:
         *,
         sym: str,
         sentiment: int,
-        price_bars: List[Dict],
+        price_bars: Union[MinuteBars, List[Dict]],
     ) -> Dict[str, int]:
-        score = {"S": sentiment, "M": 0, "R": 0}
-
-        # 1) 가격 Momentum
-        if len(price_bars) >= self.momentum_bars * 2:
-            last = [b["last"] for b in price_bars[: self.momentum_bars]]
-            prev = [b["last"] for b in price_bars[self.momentum_bars : self.momentum_bars * 2]]
-            if statistics.mean(last) > statistics.mean(prev):
-                score["M"] = +1
-            elif statistics.mean(last) < statistics.mean(prev):
-                score["M"] = -1
-
-        # 2) RSI
-        if len(price_bars) >= self.rsi_period + 1:
-            closes   = np.array([b["last"] for b in price_bars[: self.rsi_period + 1]])
-            deltas   = np.diff(closes)
-            gains    = np.where(deltas > 0, deltas, 0.0)
-            losses   = np.where(deltas < 0, -deltas, 0.0)
-            avg_gain = gains[-self.rsi_period :].mean()
-            avg_loss = losses[-self.rsi_period :].mean()
-            rsi      = 100 - 100 / (1 + (avg_gain / (avg_loss + 1e-9)))
-            if rsi < 30:
-                score["R"] = +1
-            elif rsi > 70:
-                score["R"] = -1
-
-        score["total"] = score["S"] * 0.2 + score["M"] * 1.2 + score["R"] * 0.6
-        return score
+        return self.strategy.compute_scores(sym=sym, sentiment=sentiment, price_bars=price_bars)
+
+    def compute_scores_all(
+        self,
+        *,
+        sentiments: Dict[str, int],
+        bars_map: Dict[str, MinuteBars],
+        symbols: Optional[List[str]] = None,
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        전 종목 S/M/R 점수를 한 번에 계산
+        • 기본: 종목 × 봉 행렬 일괄 계산 (Strategy → Indicators.score_symbols)
+        • STREAMING_INDICATORS: 직전 틱 이후 새 봉·수정된 마지막 봉만 반영 (StreamingScorer)
+        """
+        if self.streamer is not None:
+            return self.streamer.score_all(bars_map, sentiments, symbols or self.symbols)
+        return self.strategy.compute_scores_all(
+            sentiments=sentiments,
+            bars_map=bars_map,
+            symbols=symbols or self.symbols,
+        )
 
     # ─── 매매 결정 ─────────────────────────────────────
     def decide_trade(self, total: float, holdings: int) -> str:
-        if total >= 1.0:
-            return "buy"
-        if total <= -1.0 and holdings > 0:
-            return "sell"
-        return "hold"
+        return self.strategy.decide_trade(total, holdings)
+
+    # ─── 장중 여부 ─────────────────────────────────────
+    def is_market_open(self, now: dt.datetime) -> bool:
+        return self.calendar.is_open(now)
 
     # ─── 루프 한 번 ────────────────────────────────────
+    def _idle(self, now: dt.datetime) -> bool:
+        """장외/휴장이고 TEST_MODE=False 면 True + IDLE_INTERVAL_SEC 마다 대기 알림 (다음 개장까지의 대기는 run 에서)"""
+        if self.test_mode or self.is_market_open(now):
+            return False
+        if now.timestamp() - self._last_idle_msg >= self.idle_interval_sec:
+            reason = self.calendar.closed_reason(now.date()) or "장외시간"
+            opens  = self.calendar.next_session(now)[0]
+            self.bot.send_message(f"⏳ AutoTrader 대기 모드 ({reason}) · 다음 개장 {opens:%m/%d %H:%M} ET")
+            self._last_idle_msg = now.timestamp()
+        return True
+
     def loop_once(self) -> None:
-        now        = dt.datetime.now(ET)
-        is_weekend = now.weekday() >= 5
-        in_session = (MARKET_OPEN <= now.time() <= MARKET_CLOSE) and not is_weekend
-
-        # 장외/주말 시 TEST_MODE=False 면 대기
-        if not in_session and not self.test_mode:
-            if now.timestamp() - self._last_idle_msg >= self.idle_interval_sec:
-                reason = "주말" if is_weekend else "장외시간"
-                self.bot.send_message(f"⏳ AutoTrader 대기 모드 ({reason})")
-                self._last_idle_msg = now.timestamp()
-            self.stop_event.wait(timeout=5)
+        if self._idle(Clock.now(ET)):
             return
 
-        # 1) 뉴스 크롤링
-        self.bot.send_message("🤖 NewsCrawler 작동하는 중...")
-        csv_paths = NewsCrawler(self.symbols)
-
-        # 1.1) 감정분석용 CSV 생성
-        self.bot.send_message("🤖 SentimentAnalyzer 작동하는 중...")
-        from SentimentAnalyzer import get_sentiment_analysis
-        get_sentiment_analysis(data_dir="news", out_dir="sentiment")
-
-        # 1.2) sentiment 파일 경로 구성
-        from pathlib import Path
-        sentiment_paths = [
-            Path("sentiment") / f"{Path(p).stem}_sentiment.csv"
-            for p in csv_paths
-        ]
-
-        # 1.3) 종목별 종합 감정 점수 계산
-        sentiments = {
-            sym: SentimentAnalyzer(str(path))
-            for sym, path in zip(self.symbols, sentiment_paths)
-        }
-
-        # 2) 계좌 현금·환율·보유 조회
-        summary  = self.bot.get_account_summary()
-        usdkrw   = summary.get("rate", 0) or 0
-        cash_usd = self.bot.get_usd_balance() if usdkrw else 0
-        holdings = self.bot.get_stock_balance()
-
-        # 3) 차트 데이터 조회
-        bars_map = {
-            sym: self.bot.get_chart_data(code=sym, count=120)
-            for sym in self.symbols
-        }
-
-        # ─── 4) 종목별 분석 및 주문 ───────────────────────
-        for sym in self.symbols:
-            tic = time.time()
-
-            bars       = bars_map.get(sym, [])
-            score_data = self.compute_scores(
-                sym=sym,
-                sentiment=sentiments.get(sym, 0),
-                price_bars=bars,
-            )
-            total  = score_data["total"]
-            action = self.decide_trade(total, holdings.get(sym, 0))
-
-            # 점수 로그
-            self.bot.send_message(
-                f"📊 {sym} 분석 결과 : S {score_data['S'] * 0.2}, "
-                f"M {score_data['M'] * 1.2}, R {score_data['R'] * 0.6} "
-                f"→ 합계 {total} → {action}"
-            )
-
-            price = bars[0]["last"] if bars else 0.0
-
-            # ── 매수 로직 ───────────────────────────────
-            if action == "buy":
-                if holdings.get(sym, 0) > 0:
-                    self.bot.send_message(
-                        f"🚫 {sym} 매수 생략 : 이미 {holdings[sym]}주 보유 중"
+        # 1) 서로 독립적인 I/O 단계를 동시에 시작
+        #    뉴스(종목별 크롤링 → 감정 추론) · 계좌(요약 → USD 잔고) · 보유 종목 · 종목별 분봉
+        #    TICK_DEADLINE_SEC 지정 시 단계별 예산(STAGE_BUDGETS)을 넘긴 단계는 직전 값으로 대신
+        tick_start = Clock.time()
+        dl = self.deadline = TickDeadline(tick_start, self.tick_deadline_sec, self.stage_budgets)
+        self._tick_cash = None
+        self._notify("🤖 NewsCrawler / SentimentAnalyzer 작동하는 중...")
+        if self.standalone:
+            self.plane.begin_tick()
+
+        f_fx   = self.plane.fx()                        # 종목별 조회보다 먼저 (풀 대기열 앞)
+        f_cash = self._submit("account", self._fetch_cash_usd, f_fx)
+        f_hold = self._submit("holdings", self._fetch_holdings)
+
+        # 1.1) 처리 순서: 기본은 전 종목 한 배치, universe 모드는 우선순위 순 배치 + 시간 예산
+        if self.universe is None:
+            holdings = None
+            batches  = [self.symbols]
+        else:
+            holdings = dl.result("holdings", f_hold, self._last_holdings)
+            batches  = self.universe.plan(holdings)
+        deadline = tick_start + self.tick_budget_sec if self.universe is not None else None
+
+        # 2) 배치별로 감정·분봉을 동시에 조회, 준비된 종목부터 점수 계산 및 주문
+        bars_map: Dict[str, MinuteBars] = {}
+        covered: List[str] = []
+        spent = 0.0
+        for batch in batches:
+            if covered and ((deadline is not None and Clock.time() >= deadline) or dl.expired()):
+                break                                   # 첫 배치(보유 종목 포함)는 항상 처리
+            f_sent, f_bars = self._submit_batch(batch)
+            if holdings is None:
+                holdings = dl.result("holdings", f_hold, self._last_holdings)
+            pending = list(batch)
+            while pending:
+                ready = []
+                for sym in pending:
+                    s_ok, sentiment = dl.settle("sentiment", f_sent[sym], self.plane.cached_sentiment(sym), sym)
+                    b_ok, bars      = dl.settle("bars", f_bars[sym], self.plane.last_bars(sym), sym)
+                    if s_ok and b_ok:
+                        ready.append((sym, sentiment, bars))
+                if not ready:
+                    futures.wait(
+                        [f for s in pending for f in (f_sent[s], f_bars[s]) if not f.done()],
+                        timeout=dl.next_due(("sentiment", "bars")),
+                        return_when=futures.FIRST_COMPLETED,
                     )
                     continue
+                for sym, sentiment, bars in ready:
+                    pending.remove(sym)
+                    if self.universe is not None and self.plane.news_count(sym) is not None:
+                        self.universe.record_news(sym, self.plane.news_count(sym))
+                    if bars is None:
+                        continue                        # 분봉 예산 초과 + 직전 분봉 없음 → 이번 틱 판단 생략
+                    bars_map[sym] = bars or MinuteBars.empty()
+                    trigger       = self._triggers(sym, bars_map[sym], holdings)
+                    if trigger is None:
+                        continue                        # 이벤트 모드: 입력 변화 없음
+                    spent += self._trade_symbol(sym, sentiment, bars_map[sym], holdings, f_cash, trigger)
+            covered.extend(batch)
+
+        if self.universe is not None:
+            self.last_coverage = self.universe.coverage(covered, holdings, Clock.time() - tick_start)
+            self._notify(self.universe.format(self.last_coverage))
+        if not dl.behind:
+            self.plane.store_bars(bars_map)
+        self._finish_tick(bars_map, holdings, f_cash, spent)
+
+    def _finish_tick(
+        self,
+        bars_map: Dict[str, MinuteBars],
+        holdings: Dict[str, int],
+        f_cash: futures.Future,
+        spent: float,
+    ) -> None:
+        """틱 마무리: 자산 스냅샷 기록 + 예산을 넘긴 단계 기록"""
+        dl = self.deadline
 
-                qty_planned = int(self.buy_unit_usd / price)
-                if qty_planned == 0:
-                    self.bot.send_message(
-                        f"🚫 제한보다 1주 가격이 높습니다 "
-                        f"(제한 = {self.buy_unit_usd} USD, 1주 가격 = {price:.2f} USD)"
-                    )
-                    continue
-
-                need_usd = qty_planned * price
-
-                if self.test_mode:
-                    self.bot.send_message(
-                        f"[TEST MODE] BUY: {sym} {qty_planned}주 @ {price:.2f}"
-                    )
-                else:
-                    if self.bot.buy("NASD", sym, qty_planned, price):
-                        cash_usd -= need_usd
-
-            elif action == "sell" and holdings.get(sym, 0) > 0 and price > 0:
-                qty = holdings[sym]
-                if self.test_mode:
-                    self.bot.send_message(
-                        f"[TEST MODE] SELL: {sym} {qty:.4f}주 @ {price:.2f}"
-                    )
-                else:
-                    if self.bot.sell("NASD", sym, qty, price):
-                        self.soldout[sym] = True
-
-            elapsed = time.time() - tic
-            if elapsed < 1:
-                self.stop_event.wait(timeout=1 - elapsed)
-
-        # 5) 자산 스냅샷 기록
+        # 3) 자산 스냅샷 기록 (계좌 조회 시점 잔고 − 이번 틱 매수 금액)
+        cash_usd = self._cash(f_cash) - spent
         total_stock_val = 0.0
         for sym, bars in bars_map.items():
             if not bars:
                 continue
-            last_price = bars[0]["last"]
+            last_price = bars.latest_price
             qty        = holdings.get(sym, 0)
             total_stock_val += last_price * qty
 
@@ -241,24 +463,238 @@ class AutoTrader:
                 stock_value=total_stock_val
             )
 
+        # 4) 예산을 넘긴 단계 기록 (알림 대신 콘솔 + degraded_<단계>_total 카운터)
+        self.last_degraded = dl.degraded
+        if dl.degraded:
+            Metrics.inc("tick_degraded_total")
+            print(f"⏰ 틱 예산 초과 → 직전 값 사용: {dl.format()}")
+
+    # ─── 루프 단계 ─────────────────────────────────────
+    def _submit_batch(self, batch: List[str]) -> tuple:
+        notify = self.universe is None and self.events is None and not self.deadline.enabled
+        f_sent = {sym: self.plane.sentiment(sym) for sym in batch}
+        f_bars = {sym: self.plane.bars(sym, notify) for sym in batch}
+        return f_sent, f_bars
+
+    def _submit(self, key: str, fn, *args) -> futures.Future:
+        """
+        같은 조회가 이전 틱에서 아직 진행 중이면 새로 시작하지 않고 그 Future 를 다시 사용
+        • 예산을 넘겨 버려둔 느린 조회가 풀 스레드에 쌓여 다른 단계까지 밀리는 것을 막음
+        """
+        f = self._inflight.get(key)
+        if f is None or f.done():
+            f = self._inflight[key] = self._pool.submit(fn, *args)
+        return f
+
+    def _cash(self, f_cash: futures.Future) -> float:
+        """이번 틱의 USD 잔고 (계좌 예산 초과 시 직전 값, 틱마다 한 번만 결정)"""
+        if self._tick_cash is None:
+            self._tick_cash = self.deadline.result("account", f_cash, self._last_cash)
+        return self._tick_cash
+
+    def _notify(self, msg: str) -> None:
+        """부가 알림 — 이번 틱이 예산을 넘겼으면 생략 (Discord 전송 1건이 최대 3초)"""
+        if self.deadline.behind:
+            Metrics.inc("notify_skipped_total")
+            return
+        self.bot.send_message(msg)
+
+    def _triggers(self, sym: str, bars: MinuteBars, holdings: Dict[str, int]) -> Optional[str]:
+        """재평가 사유 ('' : 이벤트 모드 아님), 입력 변화가 없으면 None"""
+        if self.events is None:
+            return ""
+        qty     = holdings.get(sym, 0)
+        key     = self.plane.headline_key(sym)
+        reasons = self.events.changes(sym, bars, key, qty)
+        if not reasons:
+            self.events.skip(sym)
+            Metrics.inc("event_skipped_total")
+            return None
+        self.events.commit(sym, bars, key, qty)
+        Metrics.inc("event_evaluated_total")
+        return ",".join(reasons)
+
+    @Metrics.timer("tick.account")
+    def _fetch_cash_usd(self, f_fx: futures.Future) -> float:
+        usdkrw = f_fx.result()          # 환율은 DataPlane 공유 (데이터 계좌 요약, 틱당 한 번)
+        cash   = self.bot.get_usd_balance() if usdkrw else 0
+        self._last_cash = cash
+        return cash
+
+    @Metrics.timer("tick.holdings")
+    def _fetch_holdings(self) -> Dict[str, int]:
+        holdings = self._last_holdings = self.bot.get_stock_balance()
+        return holdings
+
+    def _trade_symbol(
+        self,
+        sym: str,
+        sentiment: int,
+        bars: MinuteBars,
+        holdings: Dict[str, int],
+        f_cash: futures.Future,
+        trigger: str = "",
+    ) -> float:
+        """종목 하나의 점수 계산·매매, 매수에 쓴 USD 반환 (trigger: 이벤트 모드 재평가 사유)"""
+        with Metrics.timer("decision"):
+            score_data = self.compute_scores_all(
+                sentiments={sym: sentiment}, bars_map={sym: bars}, symbols=[sym]
+            )[sym]
+            action = self.decide_trade(score_data["total"], holdings.get(sym, 0))
+        return self._execute(sym, score_data, action, bars, holdings, f_cash, trigger)
+
+    def _execute(
+        self,
+        sym: str,
+        score_data: Dict[str, int],
+        action: str,
+        bars: MinuteBars,
+        holdings: Dict[str, int],
+        f_cash: futures.Future,
+        trigger: str = "",
+    ) -> float:
+        """점수·판단 결과 알림 + 주문, 매수에 쓴 USD 반환"""
+        total = score_data["total"]
+        w     = self.strategy.weights
+
+        if self.universe is not None:
+            self.universe.record_score(sym, total)
+
+        # 점수 로그 (universe 모드는 매매 신호만, 틱 예산 초과 시 생략)
+        if self.universe is None or action != "hold":
+            self._notify(
+                f"📊 {sym} 분석 결과{f' [{trigger}]' if trigger else ''} : S {score_data['S'] * w['S']}, "
+                f"M {score_data['M'] * w['M']}, R {score_data['R'] * w['R']} "
+                f"→ 합계 {total} → {action}"
+            )
+
+        price = bars.latest_price
+
+        # ── 매수 로직 ───────────────────────────────
+        if action == "buy":
+            if holdings.get(sym, 0) > 0:
+                self._notify(
+                    f"🚫 {sym} 매수 생략 : 이미 {holdings[sym]}주 보유 중"
+                )
+                return 0.0
+
+            qty_planned = self.strategy.buy_qty(price)
+            if qty_planned == 0:
+                self._notify(
+                    f"🚫 제한보다 1주 가격이 높습니다 "
+                    f"(제한 = {self.buy_unit_usd} USD, 1주 가격 = {price:.2f} USD)"
+                )
+                return 0.0
+
+            need_usd = qty_planned * price
+
+            if self.test_mode:
+                self.bot.send_message(
+                    f"[TEST MODE] BUY: {sym} {qty_planned}주 @ {price:.2f}"
+                )
+            else:
+                self._cash(f_cash)      # 잔고 조회가 주문보다 먼저 끝나야 스냅샷 현금이 맞음
+                with Metrics.timer("order.buy"):
+                    ok = self.bot.buy("NASD", sym, qty_planned, price)
+                if ok:
+                    return need_usd
+
+        elif action == "sell" and holdings.get(sym, 0) > 0 and price > 0:
+            qty = holdings[sym]
+            if self.test_mode:
+                self.bot.send_message(
+                    f"[TEST MODE] SELL: {sym} {qty:.4f}주 @ {price:.2f}"
+                )
+            else:
+                self._cash(f_cash)
+                with Metrics.timer("order.sell"):
+                    ok = self.bot.sell("NASD", sym, qty, price)
+                if ok:
+                    self.soldout[sym] = True
+
+        return 0.0
+
+    # ─── 차트 파일 ─────────────────────────────────────
+    def render_charts(self, force: bool = False) -> None:
+        """CHART_REPORT_SEC 주기로 logs/charts 갱신 (force: 주기 무시, 새 기록이 없으면 어느 쪽이든 렌더 생략)"""
+        if not self.chart_report_sec or not self.bot.logger:
+            return
+        if not force and self.last_degraded:
+            Metrics.inc("chart_renders_deferred_total")     # 직전 틱이 예산을 넘김 → 다음 틱 이후로
+            return
+        now = Clock.time()
+        if not force and now - self._last_chart < self.chart_report_sec:
+            return
+        self._last_chart = now
+        try:
+            self.bot.logger.render_report(fmt=self.chart_format, max_points=self.chart_max_points)
+        except Exception as e:
+            print(f"⚠️ 차트 저장 실패: {e}")
+
     # ─── 메인 루프 ─────────────────────────────────────
+    def step(self) -> None:
+        """loop_once 한 번 (예외는 알림 후 계속)"""
+        try:
+            with Metrics.timer("tick"):
+                self.loop_once()
+        except Exception as e:
+            self.bot.send_message(f"⚠️ 루프 예외: {e}")
+
+    def wait_next(self, fired: float, always: Optional[bool] = None) -> float:
+        """
+        다음 분봉 마감 + TICK_OFFSET_SEC 까지 대기 (장외: 다음 개장까지, 대기 알림 주기로 끊어서), 대기한 틱 시각 반환
+        always: 달력과 무관하게 매 봉 (기본 TEST_MODE)
+        """
+        always  = self.test_mode if always is None else always
+        planned = self.scheduler.next_tick(fired, always=always)
+        fired   = self.scheduler.next_tick(max(fired, Clock.time()), always=always)
+        if self.interval_sec > 0 and fired > planned and self.scheduler.in_session(planned):
+            Metrics.inc("ticks_skipped_total", round((fired - planned) / self.interval_sec))
+        now = Clock.time()
+        if fired - now > self.idle_interval_sec:
+            fired = now + self.idle_interval_sec
+        Clock.wait(self.stop_event, fired - now)
+        return fired
+
+    def _release_processes(self) -> None:
+        """이 인스턴스가 띄운 프로세스·공유 메모리 정리 (ShardedTrader, 기본은 없음)"""
+
+    def close(self) -> None:
+        """스레드 풀·프로파일러 정리, 기록 flush 후 마지막 차트 갱신"""
+        if self.profiler is not None:
+            self.profiler.close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self.standalone:
+            self.plane.close()
+        if self.bot.logger:
+            self.bot.logger.flush()
+        self.render_charts(force=True)
+
     def run(self) -> None:
         mode = "테스트 모드" if self.test_mode else "실거래 모드"
         self.bot.send_message(f"🚀 AutoTrader 루프 시작 ({mode})")
+        fired = Clock.time()
         while not self.stop_event.is_set():
-            start = time.time()
-            try:
-                self.loop_once()
-            except Exception as e:
-                self.bot.send_message(f"⚠️ 루프 예외: {e}")
-
-            elapsed = time.time() - start
-            if elapsed < self.interval_sec:
-                self.stop_event.wait(timeout=self.interval_sec - elapsed)
+            with self.profiler.tick():
+                self.step()
+            self.render_charts()
+            fired = self.wait_next(fired)
 
+        self.close()
+        print(Metrics.REGISTRY.format_table())
         self.bot.send_message("🛑 AutoTrader 종료 완료")
 
 
+def profiler_from_config(cfg: Dict, notify) -> TickProfiler:
+    """PROFILE_* 설정 → TickProfiler (AutoTrader 단독 실행 · StrategyEngine 공용)"""
+    return TickProfiler(
+        start_ticks=cfg.get("PROFILE_TICKS", DEFAULT_PROFILE_TICKS),
+        continuous=cfg.get("PROFILE_CONTINUOUS", DEFAULT_PROFILE_CONTINUOUS),
+        dump_every=cfg.get("PROFILE_DUMP_EVERY", DEFAULT_PROFILE_DUMP_EVERY),
+        notify=notify,
+    )
+
+
 if __name__ == "__main__":
     import signal
 
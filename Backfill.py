@@ -0,0 +1,233 @@
+from __future__ import annotations
+import datetime as dt
+import threading
+from concurrent import futures
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+import Clock
+import Metrics
+from Bars import BAR_DTYPE
+from BarStore import DEFAULT_STORE_DIR, BarStore
+from MarketCalendar import ET, MarketCalendar
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_BACKFILL_DAYS    = 30          # 지금부터 며칠 전까지 채울지
+DEFAULT_BACKFILL_WORKERS = 4           # 동시에 백필하는 종목 수 (요청 간격은 TradingBot RateLimiter)
+DEFAULT_PAGE_SIZE        = 120         # 분봉 조회 1회 최대 봉 수
+DEFAULT_RETRIES          = 5           # 페이지 조회 실패 시 재시도 횟수 (1, 2, 4 … 초 대기)
+DEFAULT_MIN_GAP_BARS     = 5           # 저장된 구간 안에서 정규장 분봉이 이만큼 연속으로 빠져야 빈틈으로 다시 조회
+                                       # (거래가 없어 원래 없는 1~2분 봉까지 매번 다시 받지 않도록)
+STAGE_DIR                = ".backfill" # 저장소 아래 종목별 진행 파일 (<SYM>.stage)
+
+
+@dataclass
+class BackfillResult:
+    symbol:    str
+    pages:     int = 0
+    bars:      int = 0       # 저장소에 새로 들어간 봉 수
+    exhausted: bool = False  # 목표 시각 전에 API 가 더 줄 봉이 없음
+    gaps:      int = 0       # 병합 후에도 남은 빈틈 수 (API 에도 봉이 없음 — 거래 정지·달력에 없는 휴장 등)
+    stopped:   bool = False  # 중단 신호 → 진행 파일 유지, 다시 실행하면 이어서
+    error:     str = ""      # 재시도 후에도 실패 → 진행 파일 유지
+
+
+class Backfiller:
+    """
+    분봉 조회 API 를 NEXT·KEYB 로 최신 → 과거 방향으로 넘기며 BarStore 를 목표 시각까지 채움
+    • 종목별로는 순서대로(이전 페이지의 가장 오래된 봉이 다음 페이지 기준), 종목끼리는 workers 개 동시 진행
+    • 받은 페이지는 root/.backfill/<SYM>.stage 에 최신순으로 이어 씀 → 중단 후 다시 실행하면
+      진행 파일의 가장 오래된 봉부터 이어서 조회 (마지막 페이지가 반쯤 쓰였어도 과거 쪽만 잘려 빈틈 없음)
+    • 저장소에 이미 있는 구간은 건너뜀: 최근 봉 ~ 저장된 마지막 봉, 저장된 첫 봉 이전, 그 사이 빈틈만 조회
+      (빈틈: 이웃한 저장 봉 사이에 정규장 분봉이 min_gap_bars 개 이상 빠진 곳 — 다운타임 뒤 실거래 기록이 이어 붙인 경우 등,
+       장외·주말·휴장은 MarketCalendar 로 제외)
+    • 종목이 끝나면 진행 파일을 저장소에 병합(BarStore.merge)하고 삭제
+    """
+
+    def __init__(
+        self,
+        bot,
+        store: BarStore,
+        *,
+        market: str = "NAS",
+        workers: int = DEFAULT_BACKFILL_WORKERS,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        retries: int = DEFAULT_RETRIES,
+        min_gap_bars: int = DEFAULT_MIN_GAP_BARS,
+        calendar: Optional[MarketCalendar] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> None:
+        self.bot        = bot
+        self.store      = store
+        self.market     = market
+        self.workers    = max(1, workers)
+        self.page_size  = page_size
+        self.retries    = retries
+        self.min_gap_bars = max(1, min_gap_bars)
+        self.calendar   = calendar or MarketCalendar()
+        self.stop_event = stop_event or threading.Event()
+        self.stage_dir  = store.root / STAGE_DIR
+
+    # ─── 진행 파일 ────────────────────────────────────
+    def _stage_path(self, sym: str) -> Path:
+        return self.stage_dir / f"{sym}.stage"
+
+    def _load_stage(self, sym: str) -> np.ndarray:
+        """진행 파일 → BAR_DTYPE (쓰다 만 마지막 레코드는 잘라냄)"""
+        path = self._stage_path(sym)
+        if not path.exists():
+            return np.empty(0, dtype=BAR_DTYPE)
+        size = path.stat().st_size
+        if size % BAR_DTYPE.itemsize:
+            with open(path, "ab") as f:
+                f.truncate(size - size % BAR_DTYPE.itemsize)
+        return np.fromfile(path, dtype=BAR_DTYPE)
+
+    def _page(self, sym: str, before: int) -> np.ndarray:
+        """before 이전 한 페이지 (일시 오류·요청 제한은 대기 후 재시도)"""
+        for attempt in range(self.retries + 1):
+            try:
+                with Metrics.timer("backfill.page"):
+                    return self.bot.get_chart_bars(
+                        market=self.market, code=sym, count=self.page_size, notify=False, before=before
+                    ).data
+            except Exception:
+                Metrics.inc("backfill_retries_total")
+                if attempt == self.retries or self.stop_event.wait(2 ** attempt):
+                    raise
+
+    # ─── 빈틈 ─────────────────────────────────────────
+    def _session_minutes(self, lo: int, hi: int) -> int:
+        """[lo, hi] (분 시작 epoch 초) 안의 정규장 분봉 수"""
+        n, day = 0, dt.datetime.fromtimestamp(lo, ET).date()
+        while day <= dt.datetime.fromtimestamp(hi, ET).date():
+            s = self.calendar.session(day)
+            if s is not None:
+                a, b = max(lo, int(s[0].timestamp())), min(hi, int(s[1].timestamp()) - 60)
+                if a <= b:
+                    n += (b - a) // 60 + 1
+            day += dt.timedelta(days=1)
+        return n
+
+    def gaps(self, sym: str, start: float) -> List[Tuple[int, int]]:
+        """start 이후 저장된 구간 안의 빈틈 [(빈틈 앞 봉 ts, 빈틈 뒤 봉 ts)] (시간순)"""
+        ts    = self.store.columns(sym)["ts"]
+        floor = -(-int(start) // 60) * 60                      # start 이후 첫 분
+        idx   = np.nonzero((np.diff(ts) > 60) & (ts[1:] > floor))[0]
+        return [
+            (int(ts[i]), int(ts[i + 1])) for i in idx
+            if self._session_minutes(max(int(ts[i]) + 60, floor), int(ts[i + 1]) - 60) >= self.min_gap_bars
+        ]
+
+    # ─── 종목 하나 ────────────────────────────────────
+    def backfill_symbol(self, sym: str, start: float) -> BackfillResult:
+        """start(epoch 초) 이후 빠진 봉(최근 · 과거 · 중간 빈틈)을 모두 받아 저장소에 병합"""
+        res = BackfillResult(sym)
+        first, last = self.store.span(sym)
+        # 저장된 구간을 빈틈에서 나눈 조각 [lo, hi] — 이 안의 봉은 다시 받지 않음
+        holes  = self.gaps(sym, start) if first is not None else []
+        seg_lo = np.array([first] + [b for _, b in holes] if first is not None else [], dtype=np.int64)
+        seg_hi = np.array([a for a, _ in holes] + [last] if first is not None else [], dtype=np.int64)
+        staged = self._load_stage(sym)
+        # 진행 중인 현재 분 봉은 제외 (추가 전용 저장소라 덜 찬 OHLC·거래량이 고쳐지지 않음, DataPlane.store_bars 와 같은 기준)
+        cursor = int(staged["ts"].min()) if len(staged) else int(Clock.time()) // 60 * 60
+        stage  = self._stage_path(sym)
+        stage.parent.mkdir(parents=True, exist_ok=True)
+
+        def skip_stored(c: int) -> int:
+            # 저장된 조각 안으로 들어오면 그 조각의 첫 봉 이전(아래 빈틈 또는 첫 봉 이전)으로 건너뜀
+            i = int(np.searchsorted(seg_lo, c, side="left")) - 1
+            return int(seg_lo[i]) if i >= 0 and c <= seg_hi[i] else c
+
+        def stored(ts: np.ndarray) -> np.ndarray:
+            i = np.searchsorted(seg_lo, ts, side="right") - 1
+            return (i >= 0) & (ts <= seg_hi[np.maximum(i, 0)]) if len(seg_lo) else np.zeros(len(ts), dtype=bool)
+
+        cursor = skip_stored(cursor)
+        with open(stage, "ab") as out:
+            while cursor > start:
+                if self.stop_event.is_set():
+                    res.stopped = True
+                    return res
+                try:
+                    page = self._page(sym, cursor)
+                except Exception as e:
+                    res.error = str(e)
+                    return res
+                res.pages += 1
+                Metrics.inc("backfill_pages_total")
+                page = page[page["ts"] < cursor]
+                if len(page) == 0:
+                    res.exhausted = True
+                    break
+                new = page[page["ts"] >= start]
+                new = new[~stored(new["ts"])]
+                if len(new):
+                    out.write(np.sort(new, order="ts")[::-1].tobytes())   # 최신순 → 잘려도 과거 쪽만 손실
+                    out.flush()
+                cursor = skip_stored(int(page["ts"].min()))
+
+        staged = self._load_stage(sym)
+        if len(staged):
+            res.bars += self.store.merge(sym, staged)
+        stage.unlink(missing_ok=True)
+        res.gaps = len(self.gaps(sym, start))
+        Metrics.inc("backfill_bars_total", res.bars)
+        return res
+
+    # ─── 전체 ─────────────────────────────────────────
+    def run(self, symbols: List[str], start: float) -> Dict[str, BackfillResult]:
+        """종목별 backfill_symbol 을 workers 개 스레드에서 동시에 (Ctrl+C → 진행 중인 페이지까지만 받고 중단)"""
+        results: Dict[str, BackfillResult] = {}
+        with futures.ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as pool:
+            fs = {pool.submit(self.backfill_symbol, sym, start): sym for sym in symbols}
+            try:
+                for f in futures.as_completed(fs):
+                    results[fs[f]] = f.result()
+            except KeyboardInterrupt:
+                self.stop_event.set()
+                for f, sym in fs.items():
+                    if not f.cancelled():
+                        try:
+                            results[sym] = f.result()
+                        except futures.CancelledError:
+                            pass
+        return results
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    import yaml
+
+    from TradingBot import TradingBot
+
+    ap = argparse.ArgumentParser(description="분봉 조회 API 로 과거 분봉을 BarStore 에 백필 (중단 후 다시 실행하면 이어서)")
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--symbols", nargs="*", help="기본: config SYMBOLS")
+    ap.add_argument("--store", help=f"기본: config BAR_STORE 또는 {DEFAULT_STORE_DIR}")
+    ap.add_argument("--days", type=float, default=DEFAULT_BACKFILL_DAYS)
+    ap.add_argument("--workers", type=int, default=DEFAULT_BACKFILL_WORKERS)
+    ap.add_argument("--market", default="NAS")
+    args = ap.parse_args()
+
+    with open(args.config, encoding="utf-8") as f:
+        cfg = yaml.safe_load(f) or {}
+    store = BarStore(args.store or cfg.get("BAR_STORE") or DEFAULT_STORE_DIR)
+    bot   = TradingBot(config_path=args.config)
+    cal   = MarketCalendar(cfg.get("EXTRA_HOLIDAYS", ()), cfg.get("EARLY_CLOSES", ()))
+    t0    = time.perf_counter()
+    results = Backfiller(bot, store, market=args.market, workers=args.workers, calendar=cal).run(
+        args.symbols or cfg.get("SYMBOLS", []), Clock.time() - args.days * 86400
+    )
+    for sym, r in sorted(results.items()):
+        state = f"실패: {r.error} (다시 실행하면 이어서)" if r.error else \
+                "중단 (다시 실행하면 이어서)" if r.stopped else "API 제공 범위 끝" if r.exhausted else "완료"
+        if r.gaps and not (r.error or r.stopped):
+            state += f" · 빈틈 {r.gaps}곳 남음 (API 에도 봉 없음)"
+        print(f"{sym:6s} 페이지 {r.pages:5d} · 새 봉 {r.bars:7d} · 저장 {store.count(sym):8d}봉 · {state}")
+    print(f"⏱️ {time.perf_counter() - t0:.1f}s")
@@ -0,0 +1,412 @@
+from __future__ import annotations
+import glob
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+from numpy.lib.stride_tricks import sliding_window_view
+from zoneinfo import ZoneInfo
+
+import Clock
+from Bars import BAR_DTYPE, MinuteBars, et_epoch
+from BarStore import BarColumns, BarStore
+from Indicators import score_matrix
+from Strategy import BUY_THRESHOLD, SELL_THRESHOLD, Strategy, sentiment_from_predictions
+from Ledger import DEFAULT_CHECKPOINT_NAME
+from TradeLogger import TradeLogger
+
+ET = ZoneInfo("US/Eastern")
+
+# ───── 기본 설정값 (AutoTrader 와 동일) ──────────────────────────
+DEFAULT_BUY_UNIT_USD      = 100
+DEFAULT_MOMENTUM_BARS     = 3
+DEFAULT_RSI_PERIOD        = 14
+DEFAULT_RSI_MODE          = "simple"
+DEFAULT_INTERVAL_SEC      = 60
+DEFAULT_START_CASH_USD    = 430
+DEFAULT_CHART_COUNT       = 120          # 실거래 루프의 get_chart_bars(count=120)
+DEFAULT_SENTIMENT_WINDOW  = 24 * 3600    # 감정 점수에 반영할 뉴스 기간 (초)
+DEFAULT_LOG_DIR           = "logs/backtest"
+BAR_SEC                   = 60           # 분봉 길이 (ts = 봉 시작 시각, 종가는 ts + BAR_SEC 에 확정)
+
+
+# ─────────────────────────────────────────────────────────────
+# 입력 데이터
+# ─────────────────────────────────────────────────────────────
+def _et_epoch(col: pd.Series) -> np.ndarray:
+    """epoch 숫자 또는 'YYYY-MM-DD HH:MM:SS [TZ]'(ET) 문자열 → epoch 초"""
+    if pd.api.types.is_numeric_dtype(col):
+        return col.to_numpy(dtype=np.int64)
+    t = pd.to_datetime(col.astype(str).str[:19], errors="coerce")
+    t = t.dt.tz_localize(ET, ambiguous="NaT", nonexistent="shift_forward")
+    return np.array([int(x.timestamp()) if pd.notna(x) else 0 for x in t], dtype=np.int64)
+
+
+def load_bars_csv(path: str | Path) -> np.ndarray:
+    """
+    분봉 CSV (time, open, high, low, last|close, evol|volume) → 시간순 BAR_DTYPE 배열
+    """
+    df = pd.read_csv(path)
+    df = df.rename(columns={"close": "last", "volume": "evol", "ts": "time"})
+    ts = _et_epoch(df["time"])
+    out = np.empty(len(df), dtype=BAR_DTYPE)
+    out["ts"] = ts
+    for col in ("open", "high", "low", "last"):
+        out[col] = df[col].astype(float).to_numpy() if col in df else df["last"].astype(float).to_numpy()
+    out["evol"] = df["evol"].fillna(0).astype(np.int64).to_numpy() if "evol" in df else 0
+    out = out[out["ts"] > 0]
+    out = np.sort(out, order="ts")
+    keep = np.ones(len(out), dtype=bool)               # 같은 시각 중복 봉은 마지막 것만 사용
+    keep[:-1] = out["ts"][1:] != out["ts"][:-1]
+    return out[keep]
+
+
+def save_bars_csv(path: str | Path, bars: MinuteBars) -> None:
+    """MinuteBars → 백테스트용 분봉 CSV (epoch 초, 시간순, 기존 파일과 병합)"""
+    path = Path(path)
+    new  = pd.DataFrame(bars.data[::-1]).rename(columns={"ts": "time"})
+    if path.exists():
+        new = pd.concat([pd.read_csv(path), new]).drop_duplicates("time", keep="last")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    new.sort_values("time").to_csv(path, index=False)
+
+
+def load_news_csv(paths: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    감정 분석 CSV (time, predicted_class | label_name) 여러 개 → (시간순 epoch 초, 예측 클래스)
+    • 같은 (time, title) 뉴스는 한 번만 반영
+    """
+    frames = [pd.read_csv(p) for p in paths]
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    df = pd.concat(frames, ignore_index=True)
+    if "predicted_class" not in df and "label_name" in df:
+        df["predicted_class"] = df["label_name"].map({"negative": 0, "neutral": 1, "positive": 2})
+    df = df.drop_duplicates([c for c in ("time", "title") if c in df])
+    df["ts"] = _et_epoch(df["time"])
+    df = df.dropna(subset=["predicted_class"]).sort_values("ts")
+    return df["ts"].to_numpy(dtype=np.int64), df["predicted_class"].to_numpy(dtype=np.int64)
+
+
+def load_inputs(
+    bars_dir: str, news_dir: Optional[str], symbols: Optional[List[str]] = None
+) -> Tuple[Dict[str, np.ndarray], Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+    """bars_dir/<SYM>.csv, news_dir/<SYM>_*_sentiment.csv 로드"""
+    if symbols is None:
+        symbols = sorted(Path(p).stem for p in glob.glob(os.path.join(bars_dir, "*.csv")))
+    bars = {s: load_bars_csv(Path(bars_dir) / f"{s}.csv") for s in symbols}
+    return bars, _load_news(news_dir, symbols)
+
+
+def load_store_inputs(
+    store_dir: str,
+    news_dir: Optional[str],
+    symbols: Optional[List[str]] = None,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+) -> Tuple[Dict[str, BarColumns], Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+    """
+    BarStore(store_dir) 의 [start, end) 구간 (memory-map 컬럼, 복사 없음) + news_dir 감정 CSV
+    • Backtester 는 ts·last 컬럼만 읽으므로 몇 년치 분봉도 파일 전체를 메모리에 올리지 않음
+    """
+    store = BarStore(store_dir)
+    if symbols is None:
+        symbols = store.symbols()
+    bars = {s: store.columns(s, start, end) for s in symbols}
+    return bars, _load_news(news_dir, symbols)
+
+
+def _load_news(news_dir: Optional[str], symbols: List[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    news = {}
+    for s in symbols:
+        paths = glob.glob(os.path.join(news_dir, f"{s}_*sentiment.csv")) if news_dir else []
+        news[s] = load_news_csv(paths)
+    return news
+
+
+# ─────────────────────────────────────────────────────────────
+# 백테스트 엔진
+# ─────────────────────────────────────────────────────────────
+class Backtester:
+    """
+    저장된 분봉·뉴스 감정을 시간순으로 재생하며 Strategy(실거래와 동일 코드)로 매매 판단
+    • 틱 간격은 INTERVAL_SEC, 틱 시각까지 마감된 봉(ts + BAR_SEC ≤ 틱)만 보이도록 처리 (미래 데이터 차단)
+    • 체결: 판단 시점 종가 ± slippage, 현금 부족 시 주문 거절 (브로커 거절과 동일하게 처리)
+    • 결과는 TradeLogger 로 log_dir/trades.csv·equity.csv 에 기록
+    • fast=True 면 전 틱·전 종목 점수를 행렬 한 번으로 미리 계산 (Indicators.score_matrix)
+    • bars: 종목별 시간순 BAR_DTYPE 배열 또는 BarStore.BarColumns (컬럼 이름·행 슬라이스만 사용)
+    """
+
+    def __init__(
+        self,
+        strategy: Strategy,
+        bars: Dict[str, np.ndarray],
+        news: Optional[Dict[str, Tuple[np.ndarray, np.ndarray]]] = None,
+        *,
+        interval_sec: int = DEFAULT_INTERVAL_SEC,
+        start_cash: float = DEFAULT_START_CASH_USD,
+        chart_count: int = DEFAULT_CHART_COUNT,
+        sentiment_window: int = DEFAULT_SENTIMENT_WINDOW,
+        slippage_bps: float = 0.0,
+        log_dir: Optional[str] = DEFAULT_LOG_DIR,
+    ) -> None:
+        self.strategy         = strategy
+        self.symbols          = list(bars)
+        self.bars             = bars
+        self.news             = news or {}
+        self.interval_sec     = int(interval_sec)
+        self.start_cash       = float(start_cash)
+        self.chart_count      = chart_count
+        self.sentiment_window = sentiment_window
+        self.slippage         = slippage_bps / 10_000
+        self.log_dir          = log_dir
+        self.tick_ts          = self._tick_times()
+        self._prices: Optional[np.ndarray] = None
+
+    # ─── 타임라인 ─────────────────────────────────────
+    def _tick_times(self) -> np.ndarray:
+        """봉이 새로 보이는 시점(봉 마감)만 틱으로 사용 (장외·빈 구간 건너뜀)"""
+        all_ts = [b["ts"] for b in self.bars.values() if len(b)]
+        if not all_ts:
+            return np.empty(0, dtype=np.int64)
+        ts = np.concatenate(all_ts) + BAR_SEC
+        t0 = int(ts.min())
+        k  = np.unique(-((t0 - ts) // self.interval_sec))          # ceil((ts - t0) / interval)
+        return t0 + k * self.interval_sec
+
+    def _visible_counts(self, sym: str) -> np.ndarray:
+        """틱별 보이는 봉 수 — 시작 시각 ts 인 봉은 ts + BAR_SEC 에 종가가 확정되므로 그때부터"""
+        return np.searchsorted(self.bars[sym]["ts"], self.tick_ts - BAR_SEC, side="right")
+
+    def _window(self) -> int:
+        s = self.strategy
+        if s.rsi_mode == "wilder":
+            return self.chart_count
+        return min(self.chart_count, max(s.momentum_bars * 2, s.rsi_period + 1))
+
+    # ─── 감정 점수 ────────────────────────────────────
+    def _news_bounds(self, sym: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        ts, preds = self.news.get(sym, (np.empty(0, np.int64), np.empty(0, np.int64)))
+        hi = np.searchsorted(ts, self.tick_ts, side="right")
+        lo = np.searchsorted(ts, self.tick_ts - self.sentiment_window, side="right")
+        return lo, hi, preds
+
+    def sentiment_series(self, sym: str) -> np.ndarray:
+        """틱별 감정 점수 (Strategy.sentiment_from_predictions 규칙의 벡터 버전)"""
+        lo, hi, preds = self._news_bounds(sym)
+        pos = np.concatenate(([0], np.cumsum(preds == 2)))
+        neg = np.concatenate(([0], np.cumsum(preds == 0)))
+        p, n  = pos[hi] - pos[lo], neg[hi] - neg[lo]
+        total = p + n
+        out   = np.zeros(len(self.tick_ts), dtype=np.int64)
+        has   = total > 0
+        is_pos = has & (p >= (2/3) * total)
+        is_neg = has & ~is_pos & (n >= (2/3) * total)
+        out[is_pos], out[is_neg] = 1, -1
+        return out
+
+    # ─── 점수 사전 계산 (벡터화) ───────────────────────
+    def precompute_scores(self) -> Dict[str, np.ndarray]:
+        """(종목 × 틱) S/M/R/total 행렬"""
+        W, T = self._window(), len(self.tick_ts)
+        rows, lens, sents = [], [], []
+        for sym in self.symbols:
+            closes = self.bars[sym]["last"]
+            counts = self._visible_counts(sym)
+            padded = np.concatenate((np.full(W - 1, np.nan), closes))
+            win    = sliding_window_view(padded, W)                 # win[j] = closes[j-W+1 .. j]
+            idx    = np.clip(counts - 1, 0, max(len(closes) - 1, 0))
+            mat    = win[idx, ::-1] if len(closes) else np.full((T, W), np.nan)
+            mat    = np.where((counts > 0)[:, None], mat, np.nan)
+            rows.append(mat)
+            lens.append(np.minimum(counts, W))
+            sents.append(self.sentiment_series(sym))
+
+        res = score_matrix(
+            np.ascontiguousarray(np.concatenate(rows)),
+            np.concatenate(lens),
+            np.concatenate(sents),
+            momentum_bars=self.strategy.momentum_bars,
+            rsi_period=self.strategy.rsi_period,
+            rsi_mode=self.strategy.rsi_mode,
+            weights=self.strategy.weights,
+        )
+        k = len(self.symbols)
+        return {key: res[key].reshape(k, T) for key in ("S", "M", "R", "total")}
+
+    def price_matrix(self) -> np.ndarray:
+        """(종목 × 틱) 판단 시점 종가 (보이는 봉이 없으면 0, 한 번만 계산)"""
+        if self._prices is not None:
+            return self._prices
+        out = np.zeros((len(self.symbols), len(self.tick_ts)), dtype=np.float64)
+        for i, sym in enumerate(self.symbols):
+            counts = self._visible_counts(sym)
+            has    = counts > 0
+            out[i, has] = self.bars[sym]["last"][counts[has] - 1]
+        self._prices = out
+        return out
+
+    # ─── 재생 ─────────────────────────────────────────
+    def run(self, fast: bool = True, scores: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, float]:
+        """
+        scores: precompute_scores() 결과를 재사용할 때 전달 (가중치만 바꾼 스윕 등)
+        """
+        t_start = time.perf_counter()
+        T = len(self.tick_ts)
+        if fast:
+            pre     = scores if scores is not None else self.precompute_scores()
+            pmat    = self.price_matrix()
+        else:
+            counts  = {s: self._visible_counts(s) for s in self.symbols}
+            bounds  = {s: self._news_bounds(s) for s in self.symbols}
+
+        clock = Clock.VirtualClock(float(self.tick_ts[0]) if T else 0.0, speed=0)
+        Clock.set_clock(clock)
+        try:
+            logger = None
+            if self.log_dir:
+                Path(self.log_dir).mkdir(parents=True, exist_ok=True)
+                for name in ("trades.csv", "equity.csv", DEFAULT_CHECKPOINT_NAME):
+                    (Path(self.log_dir) / name).unlink(missing_ok=True)
+                logger = TradeLogger(log_dir=self.log_dir, initial_cash=self.start_cash, currency="USD")
+
+            cash     = self.start_cash
+            holdings = {s: 0 for s in self.symbols}
+            trades   = 0
+            rejected = 0
+            equity   = np.empty(T, dtype=np.float64)
+
+            for ti in range(T):
+                clock.set_time(float(self.tick_ts[ti]))
+                if fast:
+                    prices = {sym: float(pmat[i, ti]) for i, sym in enumerate(self.symbols)}
+                    scores_t = {
+                        sym: {"total": float(pre["total"][i, ti])}
+                        for i, sym in enumerate(self.symbols)
+                    }
+                else:
+                    views: Dict[str, MinuteBars] = {}
+                    sentiments = {}
+                    for sym in self.symbols:
+                        c = int(counts[sym][ti])
+                        views[sym] = MinuteBars(self.bars[sym][max(0, c - self.chart_count) : c][::-1])
+                        lo, hi, preds = bounds[sym]
+                        sentiments[sym] = sentiment_from_predictions(preds[lo[ti] : hi[ti]].tolist())
+                    prices   = {sym: views[sym].latest_price for sym in self.symbols}
+                    scores_t = self.strategy.compute_scores_all(
+                        sentiments=sentiments, bars_map=views, symbols=self.symbols
+                    )
+
+                # ─── 종목별 매매 (AutoTrader.loop_once 와 같은 규칙) ───
+                for sym in self.symbols:
+                    held   = holdings[sym]
+                    price  = prices[sym]
+                    action = self.strategy.decide_trade(scores_t[sym]["total"], held)
+
+                    if action == "buy":
+                        if held > 0:
+                            continue
+                        qty = self.strategy.buy_qty(price)
+                        if qty == 0:
+                            continue
+                        fill = price * (1 + self.slippage)
+                        if qty * fill > cash:
+                            rejected += 1
+                            continue
+                        cash -= qty * fill
+                        holdings[sym] = qty
+                        trades += 1
+                        if logger:
+                            logger.log_trade(symbol=sym, side="buy", qty=qty, price=fill)
+
+                    elif action == "sell" and held > 0 and price > 0:
+                        fill = price * (1 - self.slippage)
+                        cash += held * fill
+                        holdings[sym] = 0
+                        trades += 1
+                        if logger:
+                            logger.log_trade(symbol=sym, side="sell", qty=held, price=fill)
+
+                stock_val  = sum(prices[s] * q for s, q in holdings.items())
+                equity[ti] = cash + stock_val
+                if logger:
+                    logger.log_snapshot(cash=cash, stock_value=stock_val)
+        finally:
+            if logger:
+                logger.close()
+            Clock.set_clock(Clock.SystemClock())
+
+        final = float(equity[-1]) if T else self.start_cash
+        return {
+            "ticks":       T,
+            "trades":      trades,
+            "rejected":    rejected,
+            "final_cash":  cash,
+            "final_equity": final,
+            "return_pct":  (final / self.start_cash - 1) * 100 if self.start_cash else 0.0,
+            "max_drawdown_pct": float(
+                ((equity / np.maximum.accumulate(equity)) - 1).min() * 100
+            ) if T else 0.0,
+            "elapsed_sec": time.perf_counter() - t_start,
+        }
+
+
+def strategy_from_config(cfg: dict) -> Strategy:
+    """config.yaml 설정 → Strategy (AutoTrader 와 같은 키·기본값, torch 로드 없음)"""
+    return Strategy(
+        buy_unit_usd=cfg.get("BUY_UNIT_USD", DEFAULT_BUY_UNIT_USD),
+        momentum_bars=cfg.get("MOMENTUM_BARS", DEFAULT_MOMENTUM_BARS),
+        rsi_period=cfg.get("RSI_PERIOD", DEFAULT_RSI_PERIOD),
+        rsi_mode=cfg.get("RSI_MODE", DEFAULT_RSI_MODE),
+        weights=cfg.get("SCORE_WEIGHTS"),
+        buy_threshold=cfg.get("BUY_THRESHOLD", BUY_THRESHOLD),
+        sell_threshold=cfg.get("SELL_THRESHOLD", SELL_THRESHOLD),
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    ap = argparse.ArgumentParser(description="저장된 분봉·뉴스 감정으로 전략 백테스트")
+    ap.add_argument("--bars", default="bars", help="종목별 분봉 CSV 폴더 (<SYM>.csv)")
+    ap.add_argument("--store", help="CSV 대신 BarStore 폴더 (예: data/bars, memory-map 으로 읽음)")
+    ap.add_argument("--start", help="BarStore 구간 시작일 YYYY-MM-DD (ET)")
+    ap.add_argument("--end", help="BarStore 구간 종료일 YYYY-MM-DD (ET, 해당 날짜 미포함)")
+    ap.add_argument("--news", default="sentiment", help="감정 분석 CSV 폴더 (<SYM>_*sentiment.csv)")
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--symbols", nargs="*", help="기본: config SYMBOLS 중 분봉 파일이 있는 종목")
+    ap.add_argument("--cash", type=float, default=DEFAULT_START_CASH_USD)
+    ap.add_argument("--slippage-bps", type=float, default=0.0)
+    ap.add_argument("--log-dir", default=DEFAULT_LOG_DIR)
+    ap.add_argument("--slow", action="store_true", help="틱마다 Strategy.compute_scores_all 로 점수 계산")
+    args = ap.parse_args()
+
+    cfg = {}
+    if os.path.exists(args.config):
+        with open(args.config, encoding="utf-8") as f:
+            cfg = yaml.safe_load(f) or {}
+    def day(s: Optional[str]) -> Optional[int]:
+        return et_epoch(s.replace("-", ""), "000000") if s else None
+
+    if args.store:
+        symbols = args.symbols or [s for s in cfg.get("SYMBOLS", []) if (Path(args.store) / s).is_dir()] or None
+        bars, news = load_store_inputs(args.store, args.news, symbols, day(args.start), day(args.end))
+    else:
+        symbols = args.symbols or [
+            s for s in cfg.get("SYMBOLS", []) if (Path(args.bars) / f"{s}.csv").exists()
+        ] or None
+        bars, news = load_inputs(args.bars, args.news, symbols)
+    bt = Backtester(
+        strategy_from_config(cfg), bars, news,
+        interval_sec=cfg.get("INTERVAL_SEC", DEFAULT_INTERVAL_SEC),
+        start_cash=args.cash,
+        slippage_bps=args.slippage_bps,
+        log_dir=args.log_dir,
+    )
+    print(json.dumps(bt.run(fast=not args.slow), indent=2, ensure_ascii=False))
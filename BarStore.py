@@ -0,0 +1,251 @@
+from __future__ import annotations
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from Bars import BAR_DTYPE, MinuteBars
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_STORE_DIR = "data/bars"
+# 컬럼 파일 이름: <컬럼>.<dtype> (예: ts.i8, last.f8) — 리틀엔디언 원시 배열, 헤더 없음
+COLUMNS: Dict[str, np.dtype] = {name: BAR_DTYPE.fields[name][0] for name in BAR_DTYPE.names}
+FILES:   Dict[str, str]      = {name: f"{name}.{dt.str[1:]}" for name, dt in COLUMNS.items()}
+
+
+class BarColumns:
+    """
+    종목 하나의 분봉 (시간순, 오래된 봉이 index 0)
+    • bars["ts"], bars["last"] 등 컬럼은 memory-map view (복사 없음, 필요한 페이지만 디스크에서 읽음)
+    • bars[a:b] 행 슬라이스는 BAR_DTYPE 복사본 (짧은 구간용) → Backtester 의 np.ndarray 입력과 같은 방식으로 사용
+    """
+
+    __slots__ = ("cols",)
+
+    def __init__(self, cols: Dict[str, np.ndarray]) -> None:
+        self.cols = cols
+
+    def __len__(self) -> int:
+        return len(self.cols["ts"])
+
+    def __getitem__(self, key: Union[str, slice]) -> np.ndarray:
+        if isinstance(key, str):
+            return self.cols[key]
+        if not isinstance(key, slice):
+            raise TypeError("BarColumns 는 컬럼 이름 또는 슬라이스만 지원합니다")
+        ts  = self.cols["ts"][key]
+        out = np.empty(len(ts), dtype=BAR_DTYPE)
+        for name in BAR_DTYPE.names:
+            out[name] = self.cols[name][key]
+        return out
+
+    def to_array(self) -> np.ndarray:
+        """전체 구간 BAR_DTYPE 복사본"""
+        return self[:]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self) * BAR_DTYPE.itemsize
+
+
+class BarStore:
+    """
+    종목별 추가 전용(append-only) 컬럼 분봉 저장소: root/<SYM>/{ts.i8, open.f8, high.f8, low.f8, last.f8, evol.i8}
+    • 시간순, 마지막 봉보다 새로운 봉만 뒤에 추가 → 기존 바이트는 바뀌지 않아 읽는 쪽 memory-map 이 그대로 유효
+    • 추가 순서: 값 컬럼 먼저, ts 마지막 → 행 수 = ts 길이, 중간에 실패해 길어진 값 컬럼은 다음 쓰기 전에 잘라냄
+    • 가장 오래된 봉보다 과거 봉·중간 빈틈 봉(백필)은 prepend·merge → <SYM>.new 에 다시 써서 디렉터리 교체 (백필 1회당 한 번)
+    • 쓰기(append·prepend·merge)는 종목별 스레드 잠금 + 프로세스 간 파일 잠금(root/<SYM>.lock)으로 직렬화
+      → 실거래(BAR_STORE)와 Backfill.py 가 같은 종목을 동시에 써도 컬럼 행이 어긋나지 않음
+    • 읽기(columns)는 잠금 없음 (처음 접근 시 복구만 파일 잠금 안에서)
+    """
+
+    def __init__(self, root: str | Path = DEFAULT_STORE_DIR) -> None:
+        self.root = Path(root)
+        self._locks: Dict[str, threading.RLock] = {}
+        self._guard = threading.Lock()
+        self._checked: set = set()
+
+    # ─── 경로·복구 ────────────────────────────────────
+    def _dir(self, sym: str) -> Path:
+        return self.root / sym
+
+    def _lock(self, sym: str) -> threading.RLock:
+        with self._guard:
+            return self._locks.setdefault(sym, threading.RLock())
+
+    @contextmanager
+    def _writing(self, sym: str) -> Iterator[None]:
+        """
+        종목 쓰기 잠금 (스레드 + 프로세스) 후 중단된 쓰기 정리
+        • 파일 잠금은 재진입 불가 → 이 안에서는 _writing 을 다시 잡지 않음
+        """
+        from TokenManager import _FileLock
+
+        with self._lock(sym):
+            self.root.mkdir(parents=True, exist_ok=True)
+            with _FileLock(self.root / f"{sym}.lock"):
+                self._repair_dir(sym)
+                self._checked.add(sym)
+                yield
+
+    def _repair(self, sym: str) -> None:
+        """
+        중단된 쓰기 정리 (종목별 처음 접근 시 한 번, 쓰기는 _writing 에서 매번)
+        • <SYM>.new 만 남음 → 교체 도중 중단, 새 디렉터리 사용 / <SYM> 도 있음 → 다시 쓰기 도중 중단, 버림
+        • 컬럼 길이가 다르면 가장 짧은 행 수로 맞춤
+        """
+        if sym in self._checked:
+            return
+        with self._writing(sym):
+            pass
+
+    def _repair_dir(self, sym: str) -> None:
+        d, new, old = self._dir(sym), self.root / f"{sym}.new", self.root / f"{sym}.old"
+        if new.exists():
+            if d.exists():
+                shutil.rmtree(new)
+            else:
+                new.rename(d)
+        if old.exists():
+            shutil.rmtree(old)
+        if d.exists():
+            rows = min(
+                (d / f).stat().st_size // COLUMNS[c].itemsize if (d / f).exists() else 0
+                for c, f in FILES.items()
+            )
+            for c, f in FILES.items():
+                path = d / f
+                if not path.exists() or path.stat().st_size != rows * COLUMNS[c].itemsize:
+                    with open(path, "ab") as fh:
+                        fh.truncate(rows * COLUMNS[c].itemsize)
+
+    # ─── 조회 ─────────────────────────────────────────
+    def symbols(self) -> List[str]:
+        if not self.root.exists():
+            return []
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir() and "." not in p.name)
+
+    def count(self, sym: str) -> int:
+        self._repair(sym)
+        path = self._dir(sym) / FILES["ts"]
+        return path.stat().st_size // COLUMNS["ts"].itemsize if path.exists() else 0
+
+    def span(self, sym: str) -> Tuple[Optional[int], Optional[int]]:
+        """(가장 오래된 봉 ts, 가장 최근 봉 ts), 비어 있으면 (None, None) — 파일 앞뒤 8바이트만 읽음"""
+        n = self.count(sym)
+        if n == 0:
+            return None, None
+        size = COLUMNS["ts"].itemsize
+        with open(self._dir(sym) / FILES["ts"], "rb") as f:
+            first = np.frombuffer(f.read(size), dtype=COLUMNS["ts"])[0]
+            f.seek((n - 1) * size)
+            last = np.frombuffer(f.read(size), dtype=COLUMNS["ts"])[0]
+        return int(first), int(last)
+
+    def columns(self, sym: str, start: Optional[float] = None, end: Optional[float] = None) -> BarColumns:
+        """
+        [start, end) 구간 (epoch 초) 컬럼 view — 몇 년치여도 파일을 읽어 들이지 않음
+        • 반환 뒤에 추가된 봉은 보이지 않음 (다시 호출하면 보임)
+        """
+        n = self.count(sym)
+        if n == 0:
+            return BarColumns({c: np.empty(0, dtype=dt) for c, dt in COLUMNS.items()})
+        d    = self._dir(sym)
+        cols = {c: np.memmap(d / FILES[c], dtype=dt, mode="r", shape=(n,)) for c, dt in COLUMNS.items()}
+        lo = int(np.searchsorted(cols["ts"], start, side="left")) if start is not None else 0
+        hi = int(np.searchsorted(cols["ts"], end, side="left")) if end is not None else n
+        return BarColumns({c: np.asarray(a[lo:hi]) for c, a in cols.items()})
+
+    def load(self, sym: str, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """[start, end) 구간 BAR_DTYPE 배열 (시간순, 복사본 — load_bars_csv 와 같은 형식)"""
+        return self.columns(sym, start, end).to_array()
+
+    def minute_bars(self, sym: str, count: int = 120, end: Optional[float] = None) -> MinuteBars:
+        """end 이전 최근 count 봉 → MinuteBars (최신 봉이 index 0, get_chart_bars 와 같은 방향)"""
+        cols = self.columns(sym, end=end)
+        return MinuteBars(cols[max(0, len(cols) - count):][::-1])
+
+    # ─── 기록 ─────────────────────────────────────────
+    @staticmethod
+    def _normalize(bars: Union[MinuteBars, np.ndarray]) -> np.ndarray:
+        """시간순 정렬 + 같은 시각 중복 제거 (마지막 것 사용)"""
+        data = bars.data if isinstance(bars, MinuteBars) else np.asarray(bars, dtype=BAR_DTYPE)
+        data = data[data["ts"] > 0]
+        data = data[np.argsort(data["ts"], kind="stable")]
+        keep = np.ones(len(data), dtype=bool)
+        keep[:-1] = data["ts"][1:] != data["ts"][:-1]
+        return data[keep]
+
+    @staticmethod
+    def _write_columns(d: Path, data: np.ndarray, fsync: bool) -> None:
+        """값 컬럼 먼저, ts 마지막으로 이어 쓰기"""
+        for c in [c for c in FILES if c != "ts"] + ["ts"]:
+            with open(d / FILES[c], "ab") as f:
+                f.write(np.ascontiguousarray(data[c], dtype=COLUMNS[c]).tobytes())
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+    def append(self, sym: str, bars: Union[MinuteBars, np.ndarray], fsync: bool = False) -> int:
+        """저장된 마지막 봉보다 새로운 봉만 추가, 추가한 봉 수 반환 (순서·중복 무관)"""
+        data = self._normalize(bars)
+        with self._writing(sym):
+            return self._append(sym, data, fsync)
+
+    def _append(self, sym: str, data: np.ndarray, fsync: bool) -> int:
+        _, last = self.span(sym)
+        if last is not None:
+            data = data[data["ts"] > last]
+        if len(data) == 0:
+            return 0
+        d = self._dir(sym)
+        d.mkdir(parents=True, exist_ok=True)
+        self._write_columns(d, data, fsync)
+        return len(data)
+
+    def prepend(self, sym: str, bars: Union[MinuteBars, np.ndarray]) -> int:
+        """저장된 가장 오래된 봉보다 과거 봉만 앞에 추가 (다시 쓰기는 merge 와 같음), 추가한 봉 수 반환"""
+        data = self._normalize(bars)
+        with self._writing(sym):
+            first, _ = self.span(sym)
+            if first is not None:
+                data = data[data["ts"] < first]
+            return self._merge(sym, data)
+
+    def merge(self, sym: str, bars: Union[MinuteBars, np.ndarray]) -> int:
+        """
+        저장되지 않은 시각의 봉을 모두 제자리에 병합 (백필 결과: 최근 봉 · 과거 봉 · 중간 빈틈), 추가한 봉 수 반환
+        • 모두 마지막 봉 이후면 append 와 같음
+        • 그 외에는 <SYM>.new 에 (기존 봉 + 새 봉, 시간순) 을 쓰고 fsync → <SYM> 을 <SYM>.old 로, <SYM>.new 를 <SYM> 으로 교체
+        • 이미 열린 memory-map 은 교체 전 파일을 계속 가리킴 (POSIX)
+        """
+        data = self._normalize(bars)
+        with self._writing(sym):
+            return self._merge(sym, data)
+
+    def _merge(self, sym: str, data: np.ndarray) -> int:
+        if len(data) == 0:
+            return 0
+        first, last = self.span(sym)
+        if first is None:
+            return self._append(sym, data, fsync=True)
+        if data["ts"][0] > last:
+            return self._append(sym, data, fsync=False)
+        existing = self.load(sym)
+        data = data[~np.isin(data["ts"], existing["ts"])]
+        if len(data) == 0:
+            return 0
+        merged = np.concatenate([existing, data])
+        merged = merged[np.argsort(merged["ts"], kind="stable")]
+        d, new, old = self._dir(sym), self.root / f"{sym}.new", self.root / f"{sym}.old"
+        shutil.rmtree(new, ignore_errors=True)
+        new.mkdir(parents=True)
+        self._write_columns(new, merged, fsync=True)            # 파일 잠금 안 → 그 사이 다른 프로세스의 추가 없음
+        d.rename(old)
+        new.rename(d)
+        shutil.rmtree(old)
+        return len(data)
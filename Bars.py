@@ -0,0 +1,152 @@
+from __future__ import annotations
+import calendar
+import datetime as dt
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+from zoneinfo import ZoneInfo
+
+ET = ZoneInfo("US/Eastern")
+
+# 분봉 1개 = 48 bytes (epoch 초, OHLC float64, 거래량 int64)
+BAR_DTYPE = np.dtype([
+    ("ts",   "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low",  "<f8"),
+    ("last", "<f8"),
+    ("evol", "<i8"),
+])
+
+
+@lru_cache(maxsize=64)
+def _et_offset(ymd: str) -> int:
+    """해당 날짜의 ET UTC 오프셋 (초) — 서머타임 전환은 새벽 2시라 장 시간엔 하루 단위로 충분"""
+    d = dt.datetime(int(ymd[:4]), int(ymd[4:6]), int(ymd[6:8]), 12, tzinfo=ET)
+    return int(d.utcoffset().total_seconds())
+
+
+def et_epoch(ymd: str, hms: str) -> int:
+    """'YYYYMMDD' + 'HHMMSS' (ET) → epoch 초"""
+    t = calendar.timegm((int(ymd[:4]), int(ymd[4:6]), int(ymd[6:8]),
+                         int(hms[:2]), int(hms[2:4]), int(hms[4:6])))
+    return t - _et_offset(ymd)
+
+
+class MinuteBars:
+    """
+    분봉 컨테이너 (NumPy structured array, 최신 봉이 index 0)
+    • 컬럼 속성(ts/open/high/low/last/evol)과 슬라이스는 복사 없는 view
+    • 기존 list[dict] 형식이 필요하면 to_dicts()
+    """
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: np.ndarray) -> None:
+        self.data = data
+
+    # ─── 생성 ─────────────────────────────────────────
+    @classmethod
+    def empty(cls) -> "MinuteBars":
+        return cls(np.empty(0, dtype=BAR_DTYPE))
+
+    @classmethod
+    def from_kis(cls, rows: Iterable[Dict[str, Any]]) -> "MinuteBars":
+        """KIS 분봉 응답(output2) → MinuteBars (중간 dict·시간 문자열 생성 없음)"""
+        ts: List[int] = []
+        o:  List[Any] = []
+        h:  List[Any] = []
+        lo: List[Any] = []
+        c:  List[Any] = []
+        v:  List[Any] = []
+        for it in rows:
+            date = it.get("tymd") or it.get("xymd")
+            hms  = it.get("xhms") or it.get("khms")
+            if not date or not hms:
+                continue
+            ts.append(et_epoch(date, hms))
+            o.append(it.get("open", 0))
+            h.append(it.get("high", 0))
+            lo.append(it.get("low", 0))
+            c.append(it.get("last", 0))
+            v.append(it.get("evol", 0))
+
+        data = np.empty(len(ts), dtype=BAR_DTYPE)
+        if ts:
+            data["ts"]   = ts
+            data["open"] = np.asarray(o,  dtype=np.float64)
+            data["high"] = np.asarray(h,  dtype=np.float64)
+            data["low"]  = np.asarray(lo, dtype=np.float64)
+            data["last"] = np.asarray(c,  dtype=np.float64)
+            data["evol"] = np.asarray(v,  dtype=np.float64).astype(np.int64)
+        return cls(data)
+
+    @classmethod
+    def from_dicts(cls, bars: List[Dict[str, Any]]) -> "MinuteBars":
+        """get_chart_data() 의 list[dict] 형식 → MinuteBars"""
+        data = np.empty(len(bars), dtype=BAR_DTYPE)
+        if bars:
+            data["ts"] = [
+                int(dt.datetime.strptime(b["time"][:19], "%Y-%m-%d %H:%M:%S").replace(tzinfo=ET).timestamp())
+                if b.get("time") else 0
+                for b in bars
+            ]
+            for col in ("open", "high", "low", "last", "evol"):
+                data[col] = [b.get(col, 0) for b in bars]
+        return cls(data)
+
+    # ─── 조회 ─────────────────────────────────────────
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __bool__(self) -> bool:
+        return len(self.data) > 0
+
+    def __getitem__(self, idx: slice) -> "MinuteBars":
+        if not isinstance(idx, slice):
+            raise TypeError("MinuteBars 는 슬라이스만 지원합니다 (단일 봉은 to_dicts() 사용)")
+        return MinuteBars(self.data[idx])
+
+    @property
+    def ts(self) -> np.ndarray:
+        return self.data["ts"]
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.data["open"]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.data["high"]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.data["low"]
+
+    @property
+    def last(self) -> np.ndarray:
+        return self.data["last"]
+
+    @property
+    def evol(self) -> np.ndarray:
+        return self.data["evol"]
+
+    @property
+    def latest_price(self) -> float:
+        return float(self.data["last"][0]) if len(self.data) else 0.0
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """기존 get_chart_data() 반환 형식 (time 문자열 포함)"""
+        out = []
+        for ts, o, h, lo, c, v in self.data.tolist():
+            t = dt.datetime.fromtimestamp(ts, ET)
+            out.append({
+                "time": t.strftime("%Y-%m-%d %H:%M:%S %Z"),
+                "open": o, "high": h, "low": lo, "last": c, "evol": v,
+            })
+        return out
@@ -0,0 +1,201 @@
+from __future__ import annotations
+import json
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, List
+
+import numpy as np
+
+import Metrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_CHART_DIR  = "logs/charts"
+DEFAULT_FORMAT     = "png"            # png | svg
+FORMATS            = ("png", "svg")
+DEFAULT_MAX_POINTS = 2000             # 선 그래프 한 줄당 최대 점 수 (LTTB 다운샘플)
+DEFAULT_DPI        = 110
+STAMP_FILE         = "report.json"    # 마지막 렌더 시점 데이터 버전
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 다운샘플 → 남길 인덱스 (오름차순)
+    • 처음·끝 점 유지, 가운데는 n-2 개 구간마다 이전 선택점·다음 구간 평균점과
+      가장 큰 삼각형을 이루는 점 하나 → 급등락·꼭짓점 모양 유지
+    • len(x) ≤ n 이거나 n < 3 이면 전체 인덱스
+    """
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)     # 가운데 n-2 개 구간 경계
+    out = np.empty(n, dtype=np.int64)
+    out[0], out[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < n - 1 else size
+        cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def _line(ax, x: pd.Series, y: pd.Series, max_points: int, *args, **kwargs) -> None:
+    idx = lttb(x.to_numpy(), y.to_numpy(), max_points)
+    ax.plot(x.to_numpy()[idx], y.to_numpy()[idx], *args, **kwargs)
+
+
+def equity_figures(
+    equity: pd.DataFrame,
+    trades: pd.DataFrame,
+    new_figure: Callable,
+    currency: str = "USD",
+    max_points: int = DEFAULT_MAX_POINTS,
+) -> Dict[str, object]:
+    """
+    TradeLogger 자산·거래 기록(ts: epoch 초) → {이름: Figure}
+    • new_figure: plt.figure (창 출력) 또는 matplotlib.figure.Figure (파일 출력)
+    • 선 그래프는 한 줄당 max_points 개로 LTTB 다운샘플 (0 이하면 전체)
+    """
+    n = max_points if max_points > 0 else len(equity)
+    start_time = equity["ts"].iloc[0]
+    t = (equity["ts"] - start_time) / 60.0
+    mn, mx = 0.0, t.max()
+    figs: Dict[str, object] = {}
+
+    def axes(name: str, title: str, ylabel: str):
+        fig = figs[name] = new_figure()
+        ax = fig.add_subplot()
+        ax.set_title(title)
+        ax.set_xlabel("Elapsed Time (min)")
+        ax.set_ylabel(ylabel)
+        ax.set_xlim(mn, mx)
+        return fig, ax
+
+    # 1. Total Equity
+    fig, ax = axes("total_equity", "Total Equity", f"Amount ({currency})")
+    _line(ax, t, equity["total_equity"], n)
+    fig.tight_layout()
+
+    # 2. Cash vs Stock Value (+ 합산선)
+    fig, ax = axes("cash_vs_stock", "Cash vs Stock Value", f"Amount ({currency})")
+    _line(ax, t, equity["cash"], n, label="Cash")
+    _line(ax, t, equity["stock_value"], n, label="Stock Value")
+    _line(ax, t, equity["cash"] + equity["stock_value"], n, "--", label="Cash + Stock")
+    ax.legend()
+    fig.tight_layout()
+
+    # 3. Cumulative Realized P/L
+    fig, ax = axes("realized_pnl", "Cumulative Realized P/L", f"P/L ({currency})")
+    _line(ax, t, equity["realized_pnl"], n)
+    fig.tight_layout()
+
+    # 4. Buy / Sell by Symbol
+    if not trades.empty:
+        trades = trades.assign(elapsed_min=(trades["ts"] - start_time) / 60.0)
+        syms = trades["symbol"].unique()
+        cmap = _cmap(len(syms))
+        colors = {s: cmap(i) for i, s in enumerate(syms)}
+        for side, title, ylabel in (
+            ("buy",  "Buy Trade Amounts by Symbol",  f"Amount (+buy) ({currency})"),
+            ("sell", "Sell Trade Amounts by Symbol", f"Amount (–sell) ({currency})"),
+        ):
+            rows = trades[trades["side"] == side]
+            if rows.empty:
+                continue
+            fig, ax = axes(f"{side}_trades", title, ylabel)
+            for s in syms:
+                df = rows[rows["symbol"] == s]
+                if df.empty:
+                    continue
+                ax.scatter(df["elapsed_min"], df["amount"], label=s, color=colors[s])
+            ax.legend()
+            fig.tight_layout()
+
+    return figs
+
+
+def _cmap(n: int):
+    import matplotlib
+    return matplotlib.colormaps["tab10"].resampled(max(n, 1))
+
+
+class ChartReport:
+    """
+    창 없이(headless) 차트를 out_dir/<이름>.<fmt> 파일로 저장
+    • pyplot 대신 matplotlib.figure.Figure + Agg → 디스플레이·GUI 백엔드 불필요, 호출 스레드 무관
+    • version(데이터 버전)·설정이 마지막 렌더와 같으면 다시 그리지 않음 (out_dir/report.json)
+    """
+
+    def __init__(
+        self,
+        out_dir: str | Path = DEFAULT_CHART_DIR,
+        fmt: str = DEFAULT_FORMAT,
+        max_points: int = DEFAULT_MAX_POINTS,
+        dpi: int = DEFAULT_DPI,
+    ) -> None:
+        if fmt not in FORMATS:
+            raise ValueError(f"CHART_FORMAT 은 {FORMATS} 중 하나여야 합니다: {fmt!r}")
+        self.out_dir    = Path(out_dir)
+        self.fmt        = fmt
+        self.max_points = max_points
+        self.dpi        = dpi
+
+    @property
+    def stamp_path(self) -> Path:
+        return self.out_dir / STAMP_FILE
+
+    def _stamp(self, version) -> Dict:
+        return {"version": json.loads(json.dumps(version)), "fmt": self.fmt, "max_points": self.max_points}
+
+    def is_fresh(self, version) -> bool:
+        """마지막 렌더 이후 데이터·설정 변경이 없으면 True"""
+        try:
+            saved = json.loads(self.stamp_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        return {k: saved.get(k) for k in ("version", "fmt", "max_points")} == self._stamp(version)
+
+    def render(
+        self,
+        load: Callable[[], tuple],
+        version,
+        currency: str = "USD",
+        force: bool = False,
+    ) -> List[Path]:
+        """
+        load() → (equity, trades) 를 그려 저장하고 파일 경로 목록 반환
+        • 데이터가 그대로면 load() 도 호출하지 않고 빈 목록
+        """
+        if not force and self.is_fresh(version):
+            Metrics.inc("chart_renders_skipped_total")
+            return []
+        from matplotlib.figure import Figure
+
+        with Metrics.timer("chart.render"):
+            equity, trades = load()
+            if equity.empty:
+                return []
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            figs = equity_figures(equity, trades, Figure, currency, self.max_points)
+            paths = []
+            for name, fig in figs.items():
+                path = self.out_dir / f"{name}.{self.fmt}"
+                tmp = path.with_name(f".{path.name}.tmp")
+                fig.savefig(tmp, format=self.fmt, dpi=self.dpi)
+                tmp.replace(path)                        # 읽는 쪽이 반쯤 쓴 파일을 보지 않도록
+                paths.append(path)
+            # 이번에 그리지 않은 (거래가 사라진 구간의) 이전 파일 정리
+            for old in self.out_dir.glob(f"*.{self.fmt}"):
+                if old not in paths:
+                    old.unlink()
+            stamp = dict(self._stamp(version), rendered=time.time(), rows=len(equity), files=[p.name for p in paths])
+            self.stamp_path.write_text(json.dumps(stamp, indent=2), encoding="utf-8")
+        return paths
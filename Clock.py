@@ -0,0 +1,94 @@
+from __future__ import annotations
+import threading
+import time as _time
+import datetime as dt
+from typing import Optional
+
+
+class SystemClock:
+    """실제 시계 (기본값)"""
+
+    def time(self) -> float:
+        return _time.time()
+
+    def now(self, tz: Optional[dt.tzinfo] = None) -> dt.datetime:
+        return dt.datetime.now(tz)
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        return event.wait(timeout=timeout)
+
+    def sleep(self, sec: float) -> None:
+        _time.sleep(max(0.0, sec))
+
+
+class VirtualClock(SystemClock):
+    """
+    가상 시계 (재생·백테스트용)
+    • start 시각부터 실제 경과 시간 × speed 로 진행
+    • wait/sleep 은 실제로는 timeout / speed 만큼만 대기
+    • speed=0 이면 멈춘 시계 → advance()/set_time() 으로만 진행, 대기 없음
+    """
+
+    def __init__(self, start: float, speed: float = 1.0) -> None:
+        self.start       = float(start)
+        self.speed       = float(speed)
+        self._real_start = _time.monotonic()
+        self._offset     = 0.0                  # advance() 로 건너뛴 시간
+        self._lock       = threading.Lock()
+
+    def time(self) -> float:
+        with self._lock:
+            return self.start + self._offset + (_time.monotonic() - self._real_start) * self.speed
+
+    def now(self, tz: Optional[dt.tzinfo] = None) -> dt.datetime:
+        return dt.datetime.fromtimestamp(self.time(), tz)
+
+    def advance(self, sec: float) -> None:
+        with self._lock:
+            self._offset += max(0.0, sec)
+
+    def set_time(self, t: float) -> None:
+        with self._lock:
+            self.start       = float(t)
+            self._offset     = 0.0
+            self._real_start = _time.monotonic()
+
+    def wait(self, event: threading.Event, timeout: Optional[float]) -> bool:
+        if self.speed <= 0:
+            return event.is_set()
+        if timeout is None:
+            return event.wait()
+        return event.wait(timeout=max(0.0, timeout) / self.speed)
+
+    def sleep(self, sec: float) -> None:
+        if self.speed > 0:
+            _time.sleep(max(0.0, sec) / self.speed)
+
+
+# ───── 프로세스 전역 시계 ────────────────────────────────────────
+_CLOCK: SystemClock = SystemClock()
+
+
+def set_clock(clock: SystemClock) -> None:
+    global _CLOCK
+    _CLOCK = clock
+
+
+def get_clock() -> SystemClock:
+    return _CLOCK
+
+
+def time() -> float:
+    return _CLOCK.time()
+
+
+def now(tz: Optional[dt.tzinfo] = None) -> dt.datetime:
+    return _CLOCK.now(tz)
+
+
+def wait(event: threading.Event, timeout: Optional[float]) -> bool:
+    return _CLOCK.wait(event, timeout)
+
+
+def sleep(sec: float) -> None:
+    _CLOCK.sleep(sec)
@@ -0,0 +1,175 @@
+from __future__ import annotations
+import threading
+from concurrent import futures
+from typing import Dict, Optional, Tuple
+
+import Clock
+import Metrics
+from Bars import MinuteBars
+from BarStore import BarStore
+from NewsCrawler import crawl_symbol, headline_key, reset_news_dir
+from RateLimiter import RateLimiter
+from SentimentAnalyzer import analyze_file, load_model, reset_out_dir
+from Strategy import sentiment_from_predictions
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+NEWS_DIR      = "news"
+SENTIMENT_DIR = "sentiment"
+NEWS_BURST    = 10                    # 뉴스 크롤링 처음 NEWS_BURST 종목은 즉시 (이후 NEWS_RATE_PER_SEC)
+
+
+class DataPlane:
+    """
+    전략(AutoTrader) 여럿이 함께 쓰는 시장 데이터: 종목별 뉴스 → 감정 점수, 분봉, 환율
+    • 조회는 bot(데이터 조회용 계좌) 하나로 → 전략이 늘어도 크롤링·모델·분봉 조회 수는 그대로
+    • 같은 틱(begin_tick 이후) 안의 같은 조회는 한 번만, 이전 틱에서 아직 진행 중인 조회도 새로 시작하지 않음
+    • 틱 마감 초과 시 대신 쓸 직전 값(마지막 분봉·감정 점수)과 헤드라인 지문도 여기서 보관
+    """
+
+    def __init__(self, bot, *, workers: int, store_dir: str = "", preload_model: bool = True) -> None:
+        """
+        bot:           데이터 조회용 TradingBot (StrategyEngine 은 첫 전략 생성 후 지정, 샤드 워커는 None)
+        preload_model: 감정 모델 백그라운드 미리 로드 (감정 추론을 하지 않는 샤드 코디네이터는 False)
+        """
+        self.bot              = bot
+        self.bar_store: Optional[BarStore] = BarStore(store_dir) if store_dir else None
+        self.news_refresh_sec = 0.0
+        self.news_limiter     = RateLimiter(0)
+        self.headline_keys    = False
+        self.tick             = 0
+        self._news: Dict[str, tuple] = {}            # sym → (수집 시각, 감정 점수, 헤드라인 지문)
+        self._news_count: Dict[str, int] = {}        # sym → 마지막 추론의 중립 아닌 헤드라인 수 (universe 우선순위)
+        self._last_bars: Dict[str, MinuteBars] = {}
+        self._inflight: Dict[str, Tuple[int, futures.Future]] = {}   # 조회.종목 → (시작한 틱, Future)
+        self._lock = threading.Lock()
+        self._pool = futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tick")
+        # 감정 모델(torch·transformers)은 import 시점이 아니라 여기서 백그라운드 로드 → 시작은 가볍게, 첫 틱 전에 준비
+        if preload_model:
+            self._pool.submit(load_model)
+
+    def configure(self, news_refresh_sec: float, news_rate_per_sec: float, headline_keys: bool) -> None:
+        """
+        news_refresh_sec: 종목별 뉴스 재수집 간격 (0: 매 틱)
+        headline_keys:    헤드라인 지문 계산 (이벤트 모드, 헤드라인이 그대로면 감정 추론 생략)
+        """
+        self.news_refresh_sec = news_refresh_sec
+        self.news_limiter     = RateLimiter(news_rate_per_sec, NEWS_BURST)
+        self.headline_keys    = headline_keys
+
+    def adopt(self, warm: "DataPlane") -> None:
+        """이전 인스턴스의 뉴스·감정·분봉 캐시 인계 후 이전 스레드 풀 정리"""
+        self._news       = warm._news
+        self._news_count = warm._news_count
+        self._last_bars  = warm._last_bars
+        warm.close()
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ─── 틱 ───────────────────────────────────────────
+    def begin_tick(self, reset_files: bool = True) -> None:
+        """
+        새 틱: 이번 틱 조회 공유 범위를 새로 시작하고 뉴스·감정 파일 폴더 초기화 (샤드 워커는 코디네이터가 초기화)
+        • 이전 틱 감정 조회가 아직 진행 중이면 초기화 생략 (크롤링 → 추론 사이의 CSV 를 지우지 않도록, 다음 틱에 정리)
+        """
+        with self._lock:
+            self.tick += 1
+            busy = any(
+                not f.done() for key, (_, f) in self._inflight.items() if key.startswith("sentiment.")
+            )
+        if reset_files and busy:
+            Metrics.inc("news_reset_deferred_total")
+        elif reset_files:
+            reset_news_dir(NEWS_DIR)
+            reset_out_dir(SENTIMENT_DIR)
+
+    def _submit(self, key: str, fn, *args) -> futures.Future:
+        """
+        이번 틱에 이미 시작했거나 이전 틱에서 아직 진행 중인 같은 조회가 있으면 그 Future 를 다시 사용
+        • 전략끼리 같은 종목을 두 번 조회하지 않음
+        • 예산을 넘겨 버려둔 느린 조회가 풀 스레드에 쌓여 다른 단계까지 밀리는 것을 막음
+        """
+        with self._lock:
+            tick, f = self._inflight.get(key, (0, None))
+            if f is None or (f.done() and tick != self.tick):
+                f = self._pool.submit(fn, *args)
+                self._inflight[key] = (self.tick, f)
+        return f
+
+    # ─── 조회 ─────────────────────────────────────────
+    def sentiment(self, sym: str) -> futures.Future:
+        """종목 종합 감정 점수 (Future[int])"""
+        return self._submit(f"sentiment.{sym}", self._sentiment_for, sym)
+
+    def bars(self, sym: str, notify: bool = False) -> futures.Future:
+        """종목 최근 분봉 (Future[MinuteBars], 같은 틱의 다른 전략은 먼저 요청한 쪽의 notify 를 따름)"""
+        return self._submit(f"bars.{sym}", self._fetch_bars, sym, notify)
+
+    def fx(self) -> futures.Future:
+        """USD/KRW 환율 (Future[float], 조회 실패·미제공 시 0)"""
+        return self._submit("fx", self._fetch_fx)
+
+    # ─── 직전 값 ───────────────────────────────────────
+    def last_bars(self, sym: str) -> Optional[MinuteBars]:
+        return self._last_bars.get(sym)
+
+    def cached_sentiment(self, sym: str) -> int:
+        """감정 단계 예산 초과 시 대신 쓸 마지막 감정 점수 (없으면 0: 중립)"""
+        return self._news.get(sym, (0.0, 0, ""))[1]
+
+    def headline_key(self, sym: str) -> str:
+        return self._news.get(sym, (0.0, 0, ""))[2]
+
+    def news_count(self, sym: str) -> Optional[int]:
+        return self._news_count.get(sym)
+
+    # ─── 조회 구현 (풀 스레드) ──────────────────────────
+    def _sentiment_for(self, sym: str) -> int:
+        """
+        종목 하나: 뉴스 크롤링 → 감정 추론 → 종합 감정 점수
+        • news_refresh_sec 안에 이미 계산한 종목은 캐시 사용 (universe 모드에서 크롤링 부하 분산)
+        • 헤드라인 지문 계산 시: 헤드라인이 그대로면 감정 추론 생략
+        """
+        cached = self._news.get(sym)
+        if cached and Clock.time() - cached[0] < self.news_refresh_sec:
+            return cached[1]
+
+        Metrics.observe("news.wait", self.news_limiter.acquire())
+        with Metrics.timer("tick.sentiment"):
+            path = crawl_symbol(sym, NEWS_DIR)
+            key  = headline_key(path) if self.headline_keys else ""
+            if cached and key and key == cached[2]:
+                Metrics.inc("inference_skipped_total")
+                preds, score = None, cached[1]
+            else:
+                preds = analyze_file(path, SENTIMENT_DIR)
+                score = sentiment_from_predictions(preds)
+
+        self._news[sym] = (Clock.time(), score, key)
+        if preds is not None:
+            self._news_count[sym] = sum(1 for p in preds if p != 1)
+        return score
+
+    def _fetch_bars(self, sym: str, notify: bool) -> MinuteBars:
+        bars = self.bot.get_chart_bars(code=sym, count=120, notify=notify)
+        prev = self._last_bars.get(sym)
+        if bars and (not prev or bars.ts[0] >= prev.ts[0]):    # 늦게 끝난 이전 틱 조회가 덮어쓰지 않도록
+            self._last_bars[sym] = bars
+        return bars
+
+    def _fetch_fx(self) -> float:
+        return self.bot.get_account_summary().get("rate", 0) or 0
+
+    # ─── 분봉 저장 ─────────────────────────────────────
+    def store_bars(self, bars_map: Dict[str, MinuteBars]) -> None:
+        """BAR_STORE 지정 시 받은 봉 중 완성된 봉(진행 중인 현재 분 제외)만 저장소에 추가 (이미 있는 봉은 건너뜀)"""
+        if self.bar_store is None:
+            return
+        cutoff = Clock.time() - 60
+        try:
+            with Metrics.timer("tick.store"):
+                for sym, bars in bars_map.items():
+                    if bars:
+                        self.bar_store.append(sym, bars.data[bars.ts <= cutoff])
+        except OSError as e:
+            print(f"⚠️ 분봉 저장 실패: {e}")
@@ -0,0 +1,115 @@
+from __future__ import annotations
+from concurrent import futures
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import Clock
+import Metrics
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_TICK_DEADLINE_SEC = 0          # >0 이면 틱 시작 후 이 시간 안에 판단을 끝냄 (0: 끔)
+# 단계별 예산 (틱 마감 대비 비율, 모든 단계가 틱 시작과 동시에 시작)
+DEFAULT_STAGE_BUDGETS: Dict[str, float] = {
+    "holdings":  0.3,                  # 보유 종목 조회
+    "account":   0.5,                  # 계좌 요약 → USD 잔고
+    "bars":      0.5,                  # 종목별 분봉
+    "sentiment": 0.7,                  # 종목별 뉴스 크롤링 → 감정 추론
+}
+STAGES = tuple(DEFAULT_STAGE_BUDGETS)
+
+
+class TickDeadline:
+    """
+    틱 하나의 마감 시각과 단계별 예산
+    • 단계 결과(Future)를 예산까지만 기다리고, 넘기면 호출 쪽이 준 직전 값(stale)을 대신 사용
+    • 마감 사용 시 실패한 조회(예외)도 예산 초과와 같이 처리 → 한 종목 오류로 틱 전체가 멈추지 않음
+    • 어느 단계가 어떤 종목에서 예산을 넘겼는지 degraded 에 기록
+    • deadline_sec ≤ 0 이면 마감 없음 (모든 대기가 끝날 때까지, 기존 동작)
+    """
+
+    def __init__(self, start: float, deadline_sec: float, budgets: Optional[Dict[str, float]] = None) -> None:
+        if deadline_sec > 0:
+            unknown = set(budgets or {}) - set(STAGES)
+            if unknown:
+                raise ValueError(f"STAGE_BUDGETS 단계는 {STAGES} 중 하나여야 합니다: {sorted(unknown)}")
+        self.start = start
+        self.end: Optional[float] = start + deadline_sec if deadline_sec > 0 else None
+        ratios = {**DEFAULT_STAGE_BUDGETS, **(budgets or {})}
+        self.due: Dict[str, Optional[float]] = {
+            k: min(start + deadline_sec * r, self.end) if self.end is not None else None
+            for k, r in ratios.items()
+        }
+        self.degraded: Dict[str, List[str]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.end is not None
+
+    def remaining(self, stage: Optional[str] = None) -> Optional[float]:
+        """단계(없으면 틱 전체) 마감까지 남은 초, 마감 없음이면 None"""
+        due = self.end if stage is None else self.due[stage]
+        return None if due is None else max(0.0, due - Clock.time())
+
+    def expired(self, stage: Optional[str] = None) -> bool:
+        left = self.remaining(stage)
+        return left is not None and left <= 0
+
+    @property
+    def behind(self) -> bool:
+        """예산을 넘긴 단계가 있거나 틱 마감이 지남 → 부가 작업(알림·차트·저장) 생략"""
+        return bool(self.degraded) or self.expired()
+
+    def mark(self, stage: str, key: str = "") -> None:
+        keys = self.degraded.setdefault(stage, [])
+        if key not in keys:
+            keys.append(key)
+            Metrics.inc(f"degraded_{stage}_total")
+
+    def _failed(self, stage: str, fut: futures.Future, key: str) -> bool:
+        """마감 사용 중 끝난 Future 가 예외로 실패했으면 stale 기록 후 True (마감 없음이면 예외 그대로)"""
+        err = fut.exception()
+        if err is None or not self.enabled:
+            return False
+        print(f"⚠️ {stage}{f' {key}' if key else ''} 조회 실패 → 직전 값 사용: {err}")
+        Metrics.inc(f"failed_{stage}_total")
+        self.mark(stage, key)
+        return True
+
+    # ─── 단계 결과 ────────────────────────────────────
+    def settle(self, stage: str, fut: futures.Future, fallback: Any, key: str = "") -> Tuple[bool, Any]:
+        """
+        기다리지 않고 확인: (결정됨 여부, 값)
+        • 끝났으면 결과 (실패면 fallback), 예산이 지났으면 fallback (stale 기록), 아직이면 (False, None)
+        """
+        if fut.done():
+            return True, fallback if self._failed(stage, fut, key) else fut.result()
+        if self.expired(stage):
+            self.mark(stage, key)
+            return True, fallback
+        return False, None
+
+    def result(self, stage: str, fut: futures.Future, fallback: Any, key: str = "") -> Any:
+        """
+        예산까지 기다린 결과, 넘기거나 실패하면 fallback (stale 기록)
+        • fallback 이 None (직전 값 없음) 이면 예산과 무관하게 끝날 때까지 대기 (실패는 예외 그대로)
+        """
+        if fallback is None or not self.enabled:
+            return fut.result()
+        try:
+            fut.result(timeout=self.remaining(stage))
+        except futures.TimeoutError:
+            self.mark(stage, key)
+            return fallback
+        except Exception:
+            pass
+        return fallback if self._failed(stage, fut, key) else fut.result()
+
+    def next_due(self, stages: Iterable[str]) -> Optional[float]:
+        """아직 지나지 않은 단계 예산 중 가장 가까운 것까지 남은 초 (futures.wait timeout 용)"""
+        left = [self.remaining(s) for s in stages]
+        left = [x for x in left if x is not None and x > 0]
+        return min(left) if left else None
+
+    def format(self) -> str:
+        """'sentiment(AAPL,MSFT) · account' 형식"""
+        return " · ".join(f"{s}({','.join(k for k in keys if k)})" if any(keys) else s
+                          for s, keys in self.degraded.items())
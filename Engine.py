@@ -0,0 +1,169 @@
+from __future__ import annotations
+import threading
+from concurrent import futures
+from typing import Dict, List, Optional
+
+import Clock
+import Metrics
+from AutoTrader import (
+    DEFAULT_BAR_STORE, DEFAULT_NEWS_RATE_PER_SEC, DEFAULT_PIPELINE_WORKERS, DEFAULT_SYMBOLS,
+    AutoTrader, load_config, profiler_from_config,
+)
+from DataPlane import DataPlane
+
+# ───── 전략별로 재정의할 수 없는 키 (틱 스케줄·공유 데이터·프로세스 설정은 최상위 config 에서만) ──
+SHARED_KEYS = (
+    "INTERVAL_SEC", "TICK_OFFSET_SEC", "IDLE_INTERVAL_SEC", "EXTRA_HOLIDAYS", "EARLY_CLOSES",
+    "NEWS_REFRESH_SEC", "NEWS_RATE_PER_SEC", "PIPELINE_WORKERS", "BAR_STORE", "METRICS_PORT",
+    "PROFILE_TICKS", "PROFILE_CONTINUOUS", "PROFILE_DUMP_EVERY", "STRATEGIES", "SHARD_WORKERS",
+)
+
+
+def strategy_configs(cfg: Dict) -> List[Dict]:
+    """
+    STRATEGIES 항목별 설정 = 최상위 config + 항목 재정의
+    • NAME 필수·중복 불가, LOG_DIR 기본 logs/<NAME> (전략끼리 겹치면 ValueError)
+    • 계정(APP_KEY)을 바꾸고 TOKEN_FILE 을 지정하지 않으면 token.<NAME>.json (계정별 토큰 파일)
+    """
+    base = {k: v for k, v in cfg.items() if k != "STRATEGIES"}
+    out: List[Dict] = []
+    for entry in cfg.get("STRATEGIES") or []:
+        if not isinstance(entry, dict):
+            raise ValueError(f"STRATEGIES 항목은 설정 재정의 dict 여야 합니다: {entry!r}")
+        name = str(entry.get("NAME") or "").strip()
+        if not name or any(c["NAME"] == name for c in out):
+            raise ValueError(f"STRATEGIES 항목마다 서로 다른 NAME 이 필요합니다: {entry!r}")
+        shared = sorted(set(entry) & set(SHARED_KEYS))
+        if shared:
+            raise ValueError(f"{name}: {', '.join(shared)} 는 전략별로 바꿀 수 없습니다 (최상위 config 에서 설정)")
+
+        merged = {**base, **entry, "NAME": name, "LOG_DIR": entry.get("LOG_DIR", f"logs/{name}")}
+        if merged.get("APP_KEY") != base.get("APP_KEY") and "TOKEN_FILE" not in entry:
+            merged["TOKEN_FILE"] = f"token.{name}.json"
+        if any(c["LOG_DIR"] == merged["LOG_DIR"] for c in out):
+            raise ValueError(f"{name}: LOG_DIR {merged['LOG_DIR']} 를 다른 전략이 이미 사용합니다")
+        out.append(merged)
+    return out
+
+
+class StrategyEngine:
+    """
+    STRATEGIES 의 전략별 AutoTrader 를 DataPlane 하나 위에서 같은 틱 스케줄로 동시에 실행
+    • 뉴스 크롤링·감정 모델·분봉·환율은 틱마다 종목별 한 번 (첫 전략 계좌로 조회)
+      → 전략을 더해도 늘어나는 조회는 그 계좌의 잔고·보유 종목·주문뿐
+    • 전략마다 설정 재정의·TradingBot(계좌)·TradeLogger(LOG_DIR)·지표·이벤트·universe 상태가 따로
+    • 같은 계정(URL_BASE·APP_KEY)을 쓰는 전략끼리는 요청 제한기도 공유 (계정 한도 1배)
+    • Supervisor 에서 AutoTrader 와 같은 방식으로 감시·재시작·설정 반영
+    """
+
+    def __init__(
+        self,
+        *,
+        stop_event: threading.Event,
+        config_path: str = "config.yaml",
+        warm: Optional["StrategyEngine"] = None,
+    ) -> None:
+        """warm: 이전 StrategyEngine → 공유 캐시 + 같은 NAME 전략의 TradingBot·TradeLogger·상태 인계"""
+        self.stop_event  = stop_event
+        self.config_path = config_path
+        cfg = self.cfg   = load_config(config_path)
+        configs = strategy_configs(cfg)
+        if not configs:
+            raise ValueError("STRATEGIES 가 비어 있습니다")
+        if cfg.get("SHARD_WORKERS"):
+            raise ValueError("SHARD_WORKERS 는 STRATEGIES 와 함께 쓸 수 없습니다")
+
+        symbols = {s for c in configs for s in c.get("SYMBOLS", DEFAULT_SYMBOLS)}
+        self.plane = DataPlane(
+            None,
+            workers=cfg.get("PIPELINE_WORKERS", DEFAULT_PIPELINE_WORKERS) or min(32, len(symbols) * 2 + 2),
+            store_dir=cfg.get("BAR_STORE", DEFAULT_BAR_STORE),
+        )
+        if warm is not None:
+            self.plane.adopt(warm.plane)
+
+        prev = {t.name: t for t in warm.traders} if warm is not None else {}
+        self.traders: List[AutoTrader] = [
+            AutoTrader(
+                stop_event=stop_event,
+                config_path=config_path,
+                config=c,
+                plane=self.plane,
+                name=c["NAME"],
+                warm=prev.get(c["NAME"]),
+            )
+            for c in configs
+        ]
+        self.plane.bot = self.lead.bot
+        self._configure()
+
+        self.profiler = profiler_from_config(cfg, self.bot.send_message)
+        self.profiler.install_signal()
+
+    @property
+    def lead(self) -> AutoTrader:
+        """첫 전략 (데이터 조회 계좌, 틱 스케줄 기준)"""
+        return self.traders[0]
+
+    @property
+    def bot(self):
+        return self.lead.bot
+
+    def _configure(self) -> None:
+        """공유 데이터 설정 (뉴스 재수집은 가장 짧은 전략 기준) + 같은 계정 요청 제한기 공유"""
+        self.plane.configure(
+            min(t.news_refresh_sec for t in self.traders),
+            self.cfg.get("NEWS_RATE_PER_SEC", DEFAULT_NEWS_RATE_PER_SEC),
+            headline_keys=any(t.events is not None for t in self.traders),
+        )
+        first: Dict[tuple, AutoTrader] = {}
+        for t in self.traders:
+            owner = first.setdefault((t.cfg.get("URL_BASE"), t.cfg.get("APP_KEY")), t)
+            if owner is not t:
+                t.bot.limiter, t.bot.order_limiter = owner.bot.limiter, owner.bot.order_limiter
+
+    # ─── 설정 반영 (Supervisor) ─────────────────────────
+    def cold_changes(self, cfg: Dict) -> List[str]:
+        """전략 목록이 바뀌었거나 어느 전략이든 워커 재생성이 필요한 키가 바뀌었으면 그 목록"""
+        try:
+            configs = strategy_configs(cfg)
+        except ValueError:
+            return ["STRATEGIES"]                       # 재생성 시 오류로 알림 → 백오프 후 재시도
+        if [c["NAME"] for c in configs] != [t.name for t in self.traders]:
+            return ["STRATEGIES"]
+        return sorted({k for t, c in zip(self.traders, configs) for k in t.cold_changes(c)})
+
+    def reload_config(self, cfg: Dict) -> List[str]:
+        """전략별 HOT_RELOAD_KEYS 변경분을 실행 중에 반영하고 바뀐 키 목록 반환 (잘못된 값이면 아무것도 바꾸지 않고 예외)"""
+        configs = strategy_configs(cfg)
+        for t, c in zip(self.traders, configs):
+            t.validate_config(c)                        # 전부 확인한 뒤 반영 → 일부 전략만 바뀌지 않도록
+        changed = set()
+        for t, c in zip(self.traders, configs):
+            changed.update(t.reload_config(c))
+        if changed:
+            self.cfg = cfg
+            self._configure()
+        return sorted(changed)
+
+    # ─── 메인 루프 ─────────────────────────────────────
+    def run(self) -> None:
+        modes = ", ".join(f"{t.name}({'테스트' if t.test_mode else '실거래'})" for t in self.traders)
+        self.bot.send_message(f"🚀 StrategyEngine 루프 시작: {modes}")
+        fired = Clock.time()
+        with futures.ThreadPoolExecutor(max_workers=len(self.traders), thread_name_prefix="strategy") as pool:
+            while not self.stop_event.is_set():
+                with self.profiler.tick():
+                    self.plane.begin_tick()
+                    list(pool.map(AutoTrader.step, self.traders))
+                for t in self.traders:
+                    t.render_charts()
+                # 장외 틱은 TEST_MODE 전략이 하나라도 있으면 계속 (실거래 전략은 loop_once 에서 대기 알림만)
+                fired = self.lead.wait_next(fired, always=any(t.test_mode for t in self.traders))
+
+        self.profiler.close()
+        for t in self.traders:
+            t.close()
+        self.plane.close()
+        print(Metrics.REGISTRY.format_table())
+        self.bot.send_message("🛑 StrategyEngine 종료 완료")
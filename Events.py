@@ -0,0 +1,95 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from Bars import MinuteBars
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+TRIGGERS                = ("bar", "news", "price", "fill")
+DEFAULT_PRICE_MOVE_PCT  = 0.5          # 직전 평가 가격 대비 변동률(%) 이 이 값 이상이면 재평가
+DEFAULT_MAX_QUIET_TICKS = 0            # >0 이면 변화가 없어도 N틱마다 한 번은 재평가
+
+
+@dataclass
+class SymbolState:
+    """종목별 직전 평가 시점 입력값"""
+    bar_ts:   int   = 0
+    price:    float = 0.0
+    news_key: str   = ""
+    qty:      int   = 0
+    quiet:    int   = 0                # 마지막 평가 이후 건너뛴 틱 수
+
+
+class ChangeDetector:
+    """
+    이벤트 모드 재평가 판정
+    • 직전 평가 때 본 입력과 비교해 바뀐 항목(trigger)만 돌려줌, 빈 목록이면 이번 틱 건너뜀
+      - bar:   새로 완성된 분봉 (최신 봉 시각 증가)
+      - news:  헤드라인 목록 변경
+      - price: 직전 평가 가격 대비 price_move_pct % 이상 변동
+      - fill:  보유 수량 변경 (체결)
+    • 한 번도 평가하지 않은 종목은 항상 'first'
+    """
+
+    def __init__(
+        self,
+        triggers: Iterable[str] = TRIGGERS,
+        price_move_pct: float = DEFAULT_PRICE_MOVE_PCT,
+        max_quiet_ticks: int = DEFAULT_MAX_QUIET_TICKS,
+    ) -> None:
+        self.configure(triggers, price_move_pct, max_quiet_ticks)
+        self.state: Dict[str, SymbolState] = {}
+
+    def configure(
+        self,
+        triggers: Iterable[str] = TRIGGERS,
+        price_move_pct: float = DEFAULT_PRICE_MOVE_PCT,
+        max_quiet_ticks: int = DEFAULT_MAX_QUIET_TICKS,
+    ) -> None:
+        """판정 기준 변경 (기준값 state 는 유지)"""
+        unknown = set(triggers) - set(TRIGGERS)
+        if unknown:
+            raise ValueError(f"알 수 없는 EVENT_TRIGGERS: {sorted(unknown)} (가능: {TRIGGERS})")
+        self.triggers        = set(triggers)
+        self.price_move_pct  = price_move_pct
+        self.max_quiet_ticks = max_quiet_ticks
+
+    def changes(self, sym: str, bars: MinuteBars, news_key: str, qty: int) -> List[str]:
+        st = self.state.get(sym)
+        if st is None:
+            return ["first"]
+
+        out: List[str] = []
+        if "bar" in self.triggers and bars and int(bars.ts[0]) > st.bar_ts:
+            out.append("bar")
+        if "news" in self.triggers and news_key != st.news_key:
+            out.append("news")
+        if "price" in self.triggers and bars and st.price > 0:
+            if abs(bars.latest_price / st.price - 1) * 100 >= self.price_move_pct:
+                out.append("price")
+        if "fill" in self.triggers and qty != st.qty:
+            out.append("fill")
+        if not out and self.max_quiet_ticks and st.quiet + 1 >= self.max_quiet_ticks:
+            out.append("quiet")
+        return out
+
+    def skip(self, sym: str) -> None:
+        st = self.state.get(sym)
+        if st is not None:
+            st.quiet += 1
+
+    def commit(self, sym: str, bars: MinuteBars, news_key: str, qty: int) -> None:
+        """재평가 완료 → 이번 입력을 기준값으로 저장"""
+        self.state[sym] = SymbolState(
+            bar_ts=int(bars.ts[0]) if bars else 0,
+            price=bars.latest_price if bars else 0.0,
+            news_key=news_key,
+            qty=qty,
+        )
+
+    def forget(self, sym: Optional[str] = None) -> None:
+        """기준값 삭제 → 다음 틱에 강제 재평가 (sym=None 이면 전체)"""
+        if sym is None:
+            self.state.clear()
+        else:
+            self.state.pop(sym, None)
@@ -0,0 +1,211 @@
+from __future__ import annotations
+import statistics
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from Bars import MinuteBars
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+SCORE_WEIGHTS: Dict[str, float] = {"S": 0.2, "M": 1.2, "R": 0.6}
+RSI_LOW       = 30
+RSI_HIGH      = 70
+RSI_EPS       = 1e-9
+RSI_MODES     = ("simple", "wilder")
+
+# 모멘텀 평균 비교 시 부동소수 오차 허용 폭 (이 범위 안이면 statistics.mean 으로 정확 비교)
+_MEAN_TOL = 64 * np.finfo(np.float64).eps
+
+
+def closes_matrix(bars: Sequence[Optional[MinuteBars]], width: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    종목별 MinuteBars → (종목 × width) 종가 행렬 (최신 봉이 열 0, 부족분 NaN) + 종목별 봉 개수
+    """
+    mat     = np.full((len(bars), width), np.nan, dtype=np.float64)
+    lengths = np.zeros(len(bars), dtype=np.int64)
+    for i, b in enumerate(bars):
+        if not b:
+            continue
+        n = min(len(b), width)
+        mat[i, :n] = b.last[:n]
+        lengths[i] = n
+    return mat, lengths
+
+
+# ─────────────────────────────────────────────────────────────
+# Momentum
+# ─────────────────────────────────────────────────────────────
+def momentum_signal(closes: np.ndarray, lengths: np.ndarray, momentum_bars: int) -> np.ndarray:
+    """
+    최근 momentum_bars 봉 평균 vs 직전 momentum_bars 봉 평균 → +1 / 0 / -1
+    • statistics.mean 과 결과가 같도록, 두 평균 차이가 오차 범위 안인 행만 정확 계산으로 재판정
+    """
+    k   = closes.shape[0]
+    out = np.zeros(k, dtype=np.int64)
+    mb  = momentum_bars
+    ok  = lengths >= mb * 2
+    if mb <= 0 or not ok.any():
+        return out
+
+    rows = np.flatnonzero(ok)
+    last = closes[rows, :mb].mean(axis=1)
+    prev = closes[rows, mb : mb * 2].mean(axis=1)
+    out[rows] = np.sign(last - prev).astype(np.int64)
+
+    scale     = np.maximum(np.abs(last), np.abs(prev))
+    ambiguous = np.abs(last - prev) <= _MEAN_TOL * mb * scale
+    for r in rows[ambiguous]:
+        a = statistics.mean(closes[r, :mb].tolist())
+        b = statistics.mean(closes[r, mb : mb * 2].tolist())
+        out[r] = 1 if a > b else (-1 if a < b else 0)
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# RSI
+# ─────────────────────────────────────────────────────────────
+def rsi_simple(closes: np.ndarray, lengths: np.ndarray, period: int) -> np.ndarray:
+    """
+    최근 period+1 봉의 단순 평균 상승/하락폭 RSI (AutoTrader 기존 계산과 동일 연산 순서)
+    • 최신 봉이 앞인 배열에 np.diff 를 적용하므로 변화량 = 직전 봉 − 최신 봉
+      (표준 RSI 기준으로는 100 − RSI 에 해당, 기존 점수와의 호환을 위해 유지)
+    • 봉이 부족한 종목은 NaN
+    """
+    k   = closes.shape[0]
+    out = np.full(k, np.nan, dtype=np.float64)
+    ok  = lengths >= period + 1
+    if period <= 0 or not ok.any():
+        return out
+
+    window   = np.ascontiguousarray(closes[ok, : period + 1])
+    deltas   = np.diff(window, axis=1)
+    gains    = np.where(deltas > 0, deltas, 0.0)
+    losses   = np.where(deltas < 0, -deltas, 0.0)
+    avg_gain = gains[:, -period:].mean(axis=1)
+    avg_loss = losses[:, -period:].mean(axis=1)
+    out[ok]  = 100 - 100 / (1 + (avg_gain / (avg_loss + RSI_EPS)))
+    return out
+
+
+def rsi_wilder(closes: np.ndarray, lengths: np.ndarray, period: int) -> np.ndarray:
+    """
+    Wilder 평활 RSI: 시간순 첫 period 개 변화량의 단순 평균으로 시작 후
+    avg = (avg × (period-1) + x) / period 로 갱신 — 종목 축은 벡터 연산, 시간 축만 반복
+    • rsi_simple 과 같은 변화량 부호(직전 봉 − 최신 봉)를 써서 RSI_MODE 를 바꿔도 신호 방향 유지
+    """
+    k   = closes.shape[0]
+    out = np.full(k, np.nan, dtype=np.float64)
+    if period <= 0 or closes.shape[1] < 2:
+        return out
+
+    chron  = closes[:, ::-1]                       # 오래된 봉 → 최신 봉
+    deltas = -np.diff(chron, axis=1)
+    valid  = ~np.isnan(deltas)
+    gains  = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+
+    cnt      = np.zeros(k, dtype=np.int64)
+    avg_gain = np.zeros(k, dtype=np.float64)
+    avg_loss = np.zeros(k, dtype=np.float64)
+    for j in range(deltas.shape[1]):
+        v = valid[:, j]
+        if not v.any():
+            continue
+        cnt += v
+        seed   = v & (cnt <= period)
+        smooth = v & (cnt > period)
+        avg_gain[seed] += gains[seed, j]
+        avg_loss[seed] += losses[seed, j]
+        done = seed & (cnt == period)
+        avg_gain[done] /= period
+        avg_loss[done] /= period
+        avg_gain[smooth] = (avg_gain[smooth] * (period - 1) + gains[smooth, j]) / period
+        avg_loss[smooth] = (avg_loss[smooth] * (period - 1) + losses[smooth, j]) / period
+
+    ok = cnt >= period
+    out[ok] = 100 - 100 / (1 + (avg_gain[ok] / (avg_loss[ok] + RSI_EPS)))
+    return out
+
+
+def rsi_signal(rsi: np.ndarray) -> np.ndarray:
+    """RSI < 30 → +1 (과매도), RSI > 70 → -1 (과매수), 그 외·NaN → 0"""
+    out = np.zeros(rsi.shape, dtype=np.int64)
+    out[rsi < RSI_LOW]  = +1
+    out[rsi > RSI_HIGH] = -1
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# 종합 점수
+# ─────────────────────────────────────────────────────────────
+def score_matrix(
+    closes: np.ndarray,
+    lengths: np.ndarray,
+    sentiments: np.ndarray,
+    *,
+    momentum_bars: int,
+    rsi_period: int,
+    rsi_mode: str = "simple",
+    weights: Mapping[str, float] = SCORE_WEIGHTS,
+) -> Dict[str, np.ndarray]:
+    """
+    (종목 × 봉) 종가 행렬 전체에 대해 S/M/R 점수와 가중 합계를 한 번에 계산
+    • total = S × wS + M × wM + R × wR (AutoTrader 기존 계산과 같은 연산 순서)
+    """
+    if rsi_mode not in RSI_MODES:
+        raise ValueError(f"rsi_mode 는 {RSI_MODES} 중 하나여야 합니다: {rsi_mode}")
+
+    s   = np.asarray(sentiments, dtype=np.int64)
+    m   = momentum_signal(closes, lengths, momentum_bars)
+    rsi = (rsi_simple if rsi_mode == "simple" else rsi_wilder)(closes, lengths, rsi_period)
+    r   = rsi_signal(rsi)
+
+    total = s * weights["S"] + m * weights["M"] + r * weights["R"]
+    return {"S": s, "M": m, "R": r, "rsi": rsi, "total": total}
+
+
+def score_symbols(
+    bars_map: Mapping[str, Optional[MinuteBars]],
+    sentiments: Mapping[str, int],
+    symbols: List[str],
+    *,
+    momentum_bars: int,
+    rsi_period: int,
+    rsi_mode: str = "simple",
+    weights: Mapping[str, float] = SCORE_WEIGHTS,
+) -> Dict[str, Dict[str, float]]:
+    """종목별 {"S", "M", "R", "total"} 딕셔너리 (AutoTrader.compute_scores 반환 형식)"""
+    width = max(momentum_bars * 2, rsi_period + 1)
+    if rsi_mode == "wilder":
+        width = max([width] + [len(b) for b in bars_map.values() if b])
+    closes, lengths = closes_matrix([bars_map.get(s) for s in symbols], width)
+    res = score_matrix(
+        closes, lengths, [sentiments.get(s, 0) for s in symbols],
+        momentum_bars=momentum_bars, rsi_period=rsi_period, rsi_mode=rsi_mode, weights=weights,
+    )
+    return {
+        sym: {
+            "S":     int(res["S"][i]),
+            "M":     int(res["M"][i]),
+            "R":     int(res["R"][i]),
+            "total": float(res["total"][i]),
+        }
+        for i, sym in enumerate(symbols)
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    # 대규모 종목 벤치마크: 종목 × 120봉 랜덤워크
+    rng = np.random.default_rng(0)
+    for k in (10, 100, 1000, 10000):
+        closes  = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, (k, 120)), axis=1))
+        lengths = np.full(k, 120)
+        sent    = rng.integers(-1, 2, k)
+        t0 = time.perf_counter()
+        score_matrix(closes, lengths, sent, momentum_bars=3, rsi_period=14)
+        t1 = time.perf_counter()
+        score_matrix(closes, lengths, sent, momentum_bars=3, rsi_period=14, rsi_mode="wilder")
+        t2 = time.perf_counter()
+        print(f"{k:>6}종목  simple {1e3 * (t1 - t0):8.2f} ms   wilder {1e3 * (t2 - t1):8.2f} ms")
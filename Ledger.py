@@ -0,0 +1,120 @@
+from __future__ import annotations
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_CHECKPOINT_NAME  = "ledger.json"
+DEFAULT_CHECKPOINT_EVERY = 20           # 체결 N건마다 체크포인트 (종료 시에도 한 번)
+CHECKPOINT_VERSION       = 1
+
+
+@dataclass
+class Position:
+    qty:  float = 0.0
+    cost: float = 0.0                   # 보유 수량의 원가 합계 (평균 원가 × 수량)
+
+    @property
+    def avg_cost(self) -> float:
+        return self.cost / self.qty if self.qty else 0.0
+
+
+class Ledger:
+    """
+    현금 · 종목별 보유 수량 · 평균 원가 · 실현손익 (체결 1건당 O(1) 갱신)
+    • 실현손익은 평균 원가 기준: 매도 시 (체결가 - 평균 원가) × 수량
+    • 보유보다 많이 파는 수량 (기록 이전 매수분) 은 원가를 모르므로 손익 0 으로 처리
+    • seq: 지금까지 반영한 체결 수
+    """
+
+    def __init__(self, starting_cash: float = 0.0) -> None:
+        self.starting_cash = float(starting_cash)
+        self.cash          = float(starting_cash)
+        self.realized_pnl  = 0.0
+        self.positions: Dict[str, Position] = {}
+        self.seq = 0
+
+    def apply(self, symbol: str, side: str, qty: float, price: float) -> float:
+        """체결 반영, 이번 체결의 실현손익 반환"""
+        pos = self.positions.setdefault(symbol, Position())
+        self.seq += 1
+        if side == "buy":
+            self.cash -= qty * price
+            pos.qty   += qty
+            pos.cost  += qty * price
+            return 0.0
+
+        self.cash += qty * price
+        matched = min(qty, pos.qty)
+        pnl = 0.0
+        if matched > 0:
+            unit = pos.avg_cost
+            pnl  = matched * (price - unit)
+            pos.qty  -= matched
+            pos.cost  = pos.qty * unit if pos.qty > 1e-12 else 0.0
+            if pos.qty <= 1e-12:
+                pos.qty = 0.0
+        self.realized_pnl += pnl
+        return pnl
+
+    def replay(self, trades: Iterable[Tuple[str, str, float, float]]) -> int:
+        """(symbol, side, qty, price) 순서대로 반영, 반영 건수 반환"""
+        n = 0
+        for symbol, side, qty, price in trades:
+            self.apply(symbol, side, float(qty), float(price))
+            n += 1
+        return n
+
+    # ─── 조회 ─────────────────────────────────────────
+    def holdings(self) -> Dict[str, Position]:
+        return {s: p for s, p in self.positions.items() if p.qty > 0}
+
+    def stock_cost(self) -> float:
+        return sum(p.cost for p in self.positions.values())
+
+    # ─── 체크포인트 ───────────────────────────────────
+    def to_dict(self) -> Dict:
+        """체크포인트 내용 (거래 로그 위치 log_position 은 기록 쪽에서 추가)"""
+        return {
+            "version":       CHECKPOINT_VERSION,
+            "saved":         time.time(),
+            "seq":           self.seq,
+            "starting_cash": self.starting_cash,
+            "cash":          self.cash,
+            "realized_pnl":  self.realized_pnl,
+            "positions":     {s: [p.qty, p.cost] for s, p in self.positions.items() if p.qty or p.cost},
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict) -> "Ledger":
+        led = cls(d["starting_cash"])
+        led.cash         = float(d["cash"])
+        led.realized_pnl = float(d["realized_pnl"])
+        led.seq          = int(d["seq"])
+        led.positions    = {s: Position(float(q), float(c)) for s, (q, c) in d["positions"].items()}
+        return led
+
+
+def save_checkpoint(path: str | Path, state: Dict) -> None:
+    """임시 파일에 쓰고 fsync 후 교체 → 중간에 죽어도 이전 체크포인트 또는 새 체크포인트 중 하나"""
+    path = Path(path)
+    tmp  = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str | Path) -> Optional[Dict]:
+    """체크포인트 dict, 없거나 손상·버전 불일치면 None"""
+    try:
+        d = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(d, dict) or d.get("version") != CHECKPOINT_VERSION:
+        return None
+    return d
@@ -0,0 +1,127 @@
+from __future__ import annotations
+import os
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+import Metrics
+from MockServer import MockServer, load_profile
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_TICKS   = 10
+DEFAULT_SYMBOLS = ["AAPL", "MSFT", "AMZN", "GOOGL", "NVDA"]
+
+
+def _percentile(xs: List[float], q: float) -> float:
+    s = sorted(xs)
+    if not s:
+        return 0.0
+    k = (len(s) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(s) - 1)
+    return s[lo] + (s[hi] - s[lo]) * (k - lo)
+
+
+def write_mock_config(path: Path, server_url: str, symbols: List[str], overrides: Optional[Dict] = None) -> None:
+    """MockServer 를 가리키는 config.yaml 생성 (실계좌 token.json 을 건드리지 않도록 별도 토큰 파일 사용)"""
+    cfg = {
+        "SYMBOLS":             symbols,
+        "BUY_UNIT_USD":        200,
+        "MOMENTUM_BARS":       3,
+        "RSI_PERIOD":          14,
+        "TEST_MODE":           False,
+        "INTERVAL_SEC":        0,
+        "IDLE_INTERVAL_SEC":   1800,
+        "APP_KEY":             "mock_key",
+        "APP_SECRET":          "mock_secret",
+        "CANO":                "00000000",
+        "ACNT_PRDT_CD":        "01",
+        "URL_BASE":            server_url,
+        "DISCORD_WEBHOOK_URL": f"{server_url}/webhook",
+        "TOKEN_FILE":          str(path.parent / "token.json"),
+    }
+    cfg.update(overrides or {})
+    path.write_text(yaml.safe_dump(cfg, allow_unicode=True), encoding="utf-8")
+
+
+def run_load(
+    ticks: int = DEFAULT_TICKS,
+    symbols: Optional[List[str]] = None,
+    profile_path: Optional[str] = None,
+    workdir: Optional[str] = None,
+) -> Dict[str, float]:
+    """
+    MockServer 를 띄우고 AutoTrader.loop_once 를 ticks 회 실행해 틱별 소요 시간 보고
+    • 뉴스·감정분석·로그 파일은 workdir(기본 임시 폴더) 아래에 생성
+    • 장외 시간에도 주문 경로까지 실행되도록 장중 판정을 항상 참으로 고정
+    """
+    symbols = symbols or DEFAULT_SYMBOLS
+
+    # 모델 경로는 SentimentAnalyzer 파일 기준이라 chdir 과 무관 (모델은 첫 추론 때 로드)
+    import AutoTrader as at
+    import NewsCrawler as nc
+
+    workdir = workdir or tempfile.mkdtemp(prefix="autotrader_load_")
+    cwd     = os.getcwd()
+    urls    = (nc.YAHOO_SEARCH_URL, nc.FINVIZ_QUOTE_URL)
+
+    with MockServer(load_profile(profile_path)) as srv:
+        nc.YAHOO_SEARCH_URL = f"{srv.url}/v1/finance/search"
+        nc.FINVIZ_QUOTE_URL = f"{srv.url}/quote.ashx"
+
+        os.chdir(workdir)
+        try:
+            cfg_path = Path(workdir) / "config.yaml"
+            write_mock_config(cfg_path, srv.url, symbols)
+
+            stop   = threading.Event()
+            trader = at.AutoTrader(stop_event=stop, config_path=str(cfg_path))
+            trader.is_market_open = lambda now: True
+            trader.bot.send_message(f"🧪 부하 테스트 시작: {len(symbols)}종목 × {ticks}틱")
+
+            walls: List[float] = []
+            try:
+                for i in range(ticks):
+                    t0 = time.perf_counter()
+                    trader.loop_once()
+                    walls.append(time.perf_counter() - t0)
+                    print(f"[tick {i + 1:>3}/{ticks}] {walls[-1]:.3f}s")
+            finally:
+                trader.close()                          # 스레드 풀·프로파일러 정리, 기록 flush 는 workdir 에 있을 때
+                if trader.bot.logger:
+                    trader.bot.logger.close()           # 기록 스레드 종료 (atexit 까지 남지 않도록)
+        finally:
+            os.chdir(cwd)
+            nc.YAHOO_SEARCH_URL, nc.FINVIZ_QUOTE_URL = urls     # 같은 프로세스의 이후 크롤링은 실제 주소로
+
+        report = {
+            "ticks":  float(len(walls)),
+            "mean":   statistics.fmean(walls) if walls else 0.0,
+            "p50":    _percentile(walls, 0.50),
+            "p95":    _percentile(walls, 0.95),
+            "max":    max(walls) if walls else 0.0,
+        }
+        print("\n📊 틱당 소요 시간 (s): " + ", ".join(f"{k}={v:.3f}" for k, v in report.items() if k != "ticks"))
+        print("📡 엔드포인트별 요청 통계:")
+        for name, s in sorted(srv.stats.items()):
+            print(f"  {name:<30} req={s['requests']:>5}  err={s['errors']:>4}  throttled={s['throttled']:>4}")
+        print("⏱️ 단계별 지연 (클라이언트 측):")
+        print(Metrics.REGISTRY.format_table())
+        return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="MockServer 대상 AutoTrader 부하 테스트")
+    ap.add_argument("--ticks", type=int, default=DEFAULT_TICKS)
+    ap.add_argument("--symbols", nargs="*", default=None)
+    ap.add_argument("--profile", help="부하 프로파일 YAML (MockServer.DEFAULT_PROFILE 덮어쓰기)")
+    ap.add_argument("--workdir", help="뉴스·로그 출력 폴더 (기본: 임시 폴더)")
+    args = ap.parse_args()
+
+    run_load(args.ticks, args.symbols, args.profile, args.workdir)
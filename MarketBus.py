@@ -0,0 +1,116 @@
+from __future__ import annotations
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from Bars import BAR_DTYPE, MinuteBars
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_BAR_CAPACITY = 120             # 종목별 게시 1회 최대 봉 수 (get_chart_bars count)
+BUS_SLOTS            = 4               # 종목별 분봉 링 칸 수 (게시한 칸은 BUS_SLOTS-1 번 더 게시될 때까지 유지)
+
+# 종목별 헤더 (64 bytes): 게시 횟수, 마지막 게시 틱, 감정 점수·틱, 칸별 봉 수
+HEADER_DTYPE = np.dtype([
+    ("seq",            "<i8"),
+    ("tick",           "<i8"),
+    ("sentiment",      "<i8"),
+    ("sentiment_tick", "<i8"),
+    ("lens",           "<i8", (BUS_SLOTS,)),
+])
+
+
+class MarketBus:
+    """
+    프로세스 사이 분봉·감정 점수 공유 버스 (multiprocessing.shared_memory 블록 하나)
+    • 레이아웃: [종목별 헤더 × N][종목별 분봉 링 N × BUS_SLOTS × capacity] — 종목 순서는 만들 때 준 목록
+    • 분봉 게시: 다음 칸에 쓰고 봉 수 → 틱 → seq 순서로 기록, 읽는 쪽은 seq 로 최신 칸을 골라 복사 없는 MinuteBars view
+    • 방금 읽은 칸은 BUS_SLOTS-1 번 더 게시될 때까지 덮어쓰지 않음 → 틱당 1회 게시면 그 틱 안에서는 view 그대로 사용
+    • 필드마다 쓰는 프로세스는 하나 (분봉: 코디네이터, 감정: 종목 담당 워커), 읽기는 여러 프로세스
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, symbols: List[str], capacity: int, owner: bool) -> None:
+        n = len(symbols)
+        self.shm      = shm
+        self.symbols  = list(symbols)
+        self.index    = {s: i for i, s in enumerate(self.symbols)}
+        self.capacity = capacity
+        self.owner    = owner
+        self.header   = np.ndarray((n,), dtype=HEADER_DTYPE, buffer=shm.buf)
+        self.bars     = np.ndarray(
+            (n, BUS_SLOTS, capacity), dtype=BAR_DTYPE, buffer=shm.buf, offset=n * HEADER_DTYPE.itemsize
+        )
+
+    @staticmethod
+    def size(n_symbols: int, capacity: int = DEFAULT_BAR_CAPACITY) -> int:
+        return n_symbols * (HEADER_DTYPE.itemsize + BUS_SLOTS * capacity * BAR_DTYPE.itemsize)
+
+    @classmethod
+    def create(cls, symbols: List[str], capacity: int = DEFAULT_BAR_CAPACITY) -> "MarketBus":
+        """새 공유 메모리 블록 (만든 프로세스가 unlink 책임)"""
+        shm = shared_memory.SharedMemory(create=True, size=max(1, cls.size(len(symbols), capacity)))
+        bus = cls(shm, symbols, capacity, owner=True)
+        bus.header[:] = 0
+        return bus
+
+    @classmethod
+    def attach(cls, name: str, symbols: List[str], capacity: int = DEFAULT_BAR_CAPACITY) -> "MarketBus":
+        """다른 프로세스가 만든 블록에 연결 (symbols·capacity 는 만들 때와 같아야 함)"""
+        return cls(shared_memory.SharedMemory(name=name), symbols, capacity, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def close(self) -> None:
+        """연결 해제 (만든 프로세스는 블록 삭제까지)"""
+        self.header = self.bars = None
+        try:
+            self.shm.close()
+        except BufferError:                     # 아직 남은 MinuteBars view → 프로세스 종료 시 해제
+            pass
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    # ─── 분봉 ─────────────────────────────────────────
+    def publish_bars(self, sym: str, bars: MinuteBars, tick: int) -> None:
+        """최근 capacity 봉을 다음 칸에 게시 (최신 봉이 index 0, get_chart_bars 와 같은 방향)"""
+        i    = self.index[sym]
+        h    = self.header[i]
+        slot = int(h["seq"]) % BUS_SLOTS
+        data = bars.data[: self.capacity]
+        self.bars[i, slot, : len(data)] = data
+        h["lens"][slot] = len(data)
+        h["tick"]       = tick
+        h["seq"]       += 1                     # 마지막에 올려야 읽는 쪽이 다 쓴 칸만 봄
+
+    def read_bars(self, sym: str) -> Tuple[int, Optional[MinuteBars]]:
+        """(seq, 최신 분봉 view), 게시된 적 없으면 (0, None)"""
+        i   = self.index[sym]
+        seq = int(self.header[i]["seq"])
+        if seq == 0:
+            return 0, None
+        slot = (seq - 1) % BUS_SLOTS
+        n    = int(self.header[i]["lens"][slot])
+        return seq, MinuteBars(self.bars[i, slot, :n])
+
+    def bars_tick(self, sym: str) -> int:
+        return int(self.header[self.index[sym]]["tick"])
+
+    def fresh(self, sym: str, seq: int) -> bool:
+        """read_bars 로 받은 view 가 아직 덮어써지지 않았는지"""
+        return int(self.header[self.index[sym]]["seq"]) - seq < BUS_SLOTS - 1
+
+    # ─── 감정 점수 ─────────────────────────────────────
+    def publish_sentiment(self, sym: str, score: int, tick: int) -> None:
+        h = self.header[self.index[sym]]
+        h["sentiment"]      = score
+        h["sentiment_tick"] = tick
+
+    def sentiment(self, sym: str) -> Tuple[int, int]:
+        """(감정 점수, 게시한 틱), 게시된 적 없으면 (0, 0)"""
+        h = self.header[self.index[sym]]
+        return int(h["sentiment"]), int(h["sentiment_tick"])
@@ -0,0 +1,182 @@
+from __future__ import annotations
+import datetime as dt
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+from zoneinfo import ZoneInfo
+
+ET = ZoneInfo("US/Eastern")
+
+# ───── NYSE 정규장 시간 ─────────────────────────────────────────
+REGULAR_OPEN  = dt.time(9, 30)
+REGULAR_CLOSE = dt.time(16, 0)
+EARLY_CLOSE   = dt.time(13, 0)            # 독립기념일 전날 · 추수감사절 다음 날 · 크리스마스이브
+
+# 임시 휴장 (국장 등, 규칙으로 계산 불가) — 추가분은 config EXTRA_HOLIDAYS
+SPECIAL_CLOSURES: Dict[dt.date, str] = {
+    dt.date(2018, 12, 5): "National Day of Mourning (G. H. W. Bush)",
+    dt.date(2025, 1, 9):  "National Day of Mourning (J. Carter)",
+}
+
+# ───── 스케줄러 기본값 ──────────────────────────────────────────
+DEFAULT_TICK_OFFSET_SEC = 2               # 분봉 마감 후 대기 시간 (KIS 분봉 확정 지연)
+
+
+def _easter(year: int) -> dt.date:
+    """그레고리력 부활절 (Anonymous Gregorian algorithm)"""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return dt.date(year, month, day + 1)
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> dt.date:
+    """month 의 n번째 weekday (n=-1 이면 마지막)"""
+    if n > 0:
+        first = dt.date(year, month, 1)
+        return first + dt.timedelta(days=(weekday - first.weekday()) % 7 + 7 * (n - 1))
+    last = dt.date(year + month // 12, month % 12 + 1, 1) - dt.timedelta(days=1)
+    return last - dt.timedelta(days=(last.weekday() - weekday) % 7)
+
+
+def _observed(d: dt.date) -> dt.date:
+    """토요일 → 금요일, 일요일 → 월요일"""
+    if d.weekday() == 5:
+        return d - dt.timedelta(days=1)
+    if d.weekday() == 6:
+        return d + dt.timedelta(days=1)
+    return d
+
+
+def nyse_holidays(year: int) -> Dict[dt.date, str]:
+    """NYSE 정규 휴장일 (Rule 7.2)"""
+    out: Dict[dt.date, str] = {}
+    new_year = dt.date(year, 1, 1)
+    if new_year.weekday() != 5:           # 토요일이면 전년도 12/31 대체 휴장 없음
+        out[_observed(new_year)] = "New Year's Day"
+    out[_nth_weekday(year, 1, 0, 3)]  = "Martin Luther King Jr. Day"
+    out[_nth_weekday(year, 2, 0, 3)]  = "Washington's Birthday"
+    out[_easter(year) - dt.timedelta(days=2)] = "Good Friday"
+    out[_nth_weekday(year, 5, 0, -1)] = "Memorial Day"
+    if year >= 2022:
+        out[_observed(dt.date(year, 6, 19))] = "Juneteenth"
+    out[_observed(dt.date(year, 7, 4))] = "Independence Day"
+    out[_nth_weekday(year, 9, 0, 1)]  = "Labor Day"
+    out[_nth_weekday(year, 11, 3, 4)] = "Thanksgiving Day"
+    out[_observed(dt.date(year, 12, 25))] = "Christmas Day"
+    out.update({d: name for d, name in SPECIAL_CLOSURES.items() if d.year == year})
+    return out
+
+
+def nyse_early_closes(year: int) -> Dict[dt.date, str]:
+    """13:00 조기 폐장일 (월~목에 해당할 때만, 금요일이면 대체 휴장과 겹침)"""
+    out: Dict[dt.date, str] = {}
+    jul3 = dt.date(year, 7, 3)
+    if jul3.weekday() <= 3:
+        out[jul3] = "Independence Day Eve"
+    out[_nth_weekday(year, 11, 3, 4) + dt.timedelta(days=1)] = "Day after Thanksgiving"
+    dec24 = dt.date(year, 12, 24)
+    if dec24.weekday() <= 3:
+        out[dec24] = "Christmas Eve"
+    return out
+
+
+class MarketCalendar:
+    """
+    NYSE 거래일·정규장 시간 (연도별로 한 번 계산 후 캐시)
+    • 주말 · 정규 휴장일 · 임시 휴장 · 13:00 조기 폐장 반영
+    • extra_holidays / extra_early_closes: 'YYYY-MM-DD' 목록으로 추가 지정
+    """
+
+    def __init__(
+        self,
+        extra_holidays: Iterable[str] = (),
+        extra_early_closes: Iterable[str] = (),
+    ) -> None:
+        self.extra_holidays     = {dt.date.fromisoformat(str(d)) for d in extra_holidays}
+        self.extra_early_closes = {dt.date.fromisoformat(str(d)) for d in extra_early_closes}
+        self._years: Dict[int, Tuple[Dict[dt.date, str], Dict[dt.date, str]]] = {}
+
+    def _year(self, year: int) -> Tuple[Dict[dt.date, str], Dict[dt.date, str]]:
+        if year not in self._years:
+            holidays = nyse_holidays(year)
+            holidays.update({d: "config EXTRA_HOLIDAYS" for d in self.extra_holidays if d.year == year})
+            early = nyse_early_closes(year)
+            early.update({d: "config EARLY_CLOSES" for d in self.extra_early_closes if d.year == year})
+            self._years[year] = (holidays, early)
+        return self._years[year]
+
+    # ─── 조회 ─────────────────────────────────────────
+    def closed_reason(self, day: dt.date) -> Optional[str]:
+        """휴장이면 사유, 거래일이면 None"""
+        if day.weekday() >= 5:
+            return "주말"
+        return self._year(day.year)[0].get(day)
+
+    def session(self, day: dt.date) -> Optional[Tuple[dt.datetime, dt.datetime]]:
+        """해당 일 정규장 (개장, 폐장) ET 시각, 휴장이면 None"""
+        if self.closed_reason(day):
+            return None
+        close = EARLY_CLOSE if day in self._year(day.year)[1] else REGULAR_CLOSE
+        return (
+            dt.datetime.combine(day, REGULAR_OPEN, tzinfo=ET),
+            dt.datetime.combine(day, close, tzinfo=ET),
+        )
+
+    def is_open(self, now: dt.datetime) -> bool:
+        now = now.astimezone(ET)
+        s = self.session(now.date())
+        return s is not None and s[0] <= now < s[1]
+
+    def next_session(self, now: dt.datetime) -> Tuple[dt.datetime, dt.datetime]:
+        """진행 중인 정규장, 없으면 다음 정규장 (개장, 폐장)"""
+        now = now.astimezone(ET)
+        day = now.date()
+        for _ in range(366):
+            s = self.session(day)
+            if s is not None and now < s[1]:
+                return s
+            day += dt.timedelta(days=1)
+        raise RuntimeError(f"{now:%Y-%m-%d} 이후 1년 안에 거래일 없음")
+
+
+class BarScheduler:
+    """
+    분봉 마감 시각에 맞춘 틱 스케줄
+    • 장중: 개장 + k × bar_sec + offset_sec (봉이 막 확정된 직후), 폐장 이후 봉은 건너뜀
+    • 장외: 다음 개장 + offset_sec 까지 한 번에 대기 (휴장일·조기 폐장 반영)
+    • always=True (TEST_MODE): 달력과 무관하게 매 bar_sec 경계 + offset_sec
+    • bar_sec ≤ 0 이면 대기 없이 바로 다음 틱
+    """
+
+    def __init__(self, calendar: MarketCalendar, bar_sec: float = 60, offset_sec: float = DEFAULT_TICK_OFFSET_SEC) -> None:
+        self.calendar   = calendar
+        self.bar_sec    = float(bar_sec)
+        self.offset_sec = float(offset_sec)
+
+    def next_tick(self, after: float, always: bool = False) -> float:
+        """after(epoch 초) 보다 뒤의 첫 틱 시각"""
+        if self.bar_sec <= 0:
+            return after
+        bar, off = self.bar_sec, self.offset_sec
+        if always:
+            return (math.floor((after - off) / bar) + 1) * bar + off
+
+        now = dt.datetime.fromtimestamp(after, ET)
+        while True:
+            o, c = (x.timestamp() for x in self.calendar.next_session(now))
+            if after < o + off:
+                return o + off
+            t = o + (math.floor((after - o - off) / bar) + 1) * bar + off
+            if t < c:
+                return t
+            now = dt.datetime.fromtimestamp(c, ET)        # 마지막 봉 이후 → 다음 거래일
+
+    def in_session(self, t: float) -> bool:
+        return self.calendar.is_open(dt.datetime.fromtimestamp(t, ET))
@@ -0,0 +1,268 @@
+from __future__ import annotations
+import atexit
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+METRIC_PREFIX = "autotrader"
+# 1ms ~ 약 130s 로그 간격 버킷 (×1.5) → 분위수 추정 오차 ±25% 이내
+BUCKETS: List[float] = [round(0.001 * 1.5 ** k, 6) for k in range(30)]
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class Histogram:
+    """Prometheus 방식 누적 버킷 히스토그램 (합계·개수·최대값 포함)"""
+
+    def __init__(self, buckets: List[float] = BUCKETS) -> None:
+        self.bounds = buckets
+        self.counts = [0] * (len(buckets) + 1)     # 마지막 칸 = +Inf
+        self.count  = 0
+        self.sum    = 0.0
+        self.max    = 0.0
+
+    def observe(self, v: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, v)] += 1
+        self.count += 1
+        self.sum   += v
+        self.max    = max(self.max, v)
+
+    def quantile(self, q: float) -> float:
+        """버킷 안 선형 보간 분위수 (histogram_quantile 과 같은 방식)"""
+        if self.count == 0:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for i, c in enumerate(self.counts):
+            if seen + c >= rank and c:
+                lo = self.bounds[i - 1] if i > 0 else 0.0
+                hi = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(self.max, lo + (hi - lo) * (rank - seen) / c)
+            seen += c
+        return self.max
+
+
+class Registry:
+    """
+    단계별 지연 히스토그램 + 호출·오류 카운터 (스레드 안전)
+    • stage 이름은 'crawl.yahoo', 'api.order', 'inference' 처럼 점으로 구분
+    """
+
+    def __init__(self) -> None:
+        self._lock   = threading.Lock()
+        self._hist:   Dict[str, Histogram] = {}
+        self._errors: Dict[str, int] = {}
+        self._counters: Dict[str, float] = {}
+        self.started = time.time()
+
+    def observe(self, stage: str, sec: float, error: bool = False) -> None:
+        with self._lock:
+            h = self._hist.get(stage)
+            if h is None:
+                h = self._hist[stage] = Histogram()
+            h.observe(sec)
+            if error:
+                self._errors[stage] = self._errors.get(stage, 0) + 1
+
+    def inc(self, name: str, n: float = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    @contextmanager
+    def timer(self, stage: str) -> Iterator[None]:
+        """with 블록 소요 시간 기록, 예외 발생 시 오류로 집계 후 그대로 전달"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.observe(stage, time.perf_counter() - t0, error=True)
+            raise
+        self.observe(stage, time.perf_counter() - t0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hist.clear()
+            self._errors.clear()
+            self._counters.clear()
+            self.started = time.time()
+
+    # ─── 조회 ─────────────────────────────────────────
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            out = {}
+            for stage, h in sorted(self._hist.items()):
+                errors = self._errors.get(stage, 0)
+                row = {
+                    "count":      h.count,
+                    "errors":     errors,
+                    "error_rate": errors / h.count if h.count else 0.0,
+                    "mean":       h.sum / h.count if h.count else 0.0,
+                    "max":        h.max,
+                }
+                for q in QUANTILES:
+                    row[f"p{int(q * 100)}"] = h.quantile(q)
+                out[stage] = row
+            return out
+
+    def snapshot(self) -> Dict[str, tuple]:
+        """단계별 (호출 수, 누적 시간) — delta() 와 짝으로 구간 측정에 사용"""
+        with self._lock:
+            return {stage: (h.count, h.sum) for stage, h in self._hist.items()}
+
+    def delta(self, before: Dict[str, tuple]) -> Dict[str, tuple]:
+        """snapshot() 이후 늘어난 (호출 수, 누적 시간)"""
+        out = {}
+        for stage, (cnt, sec) in self.snapshot().items():
+            c0, s0 = before.get(stage, (0, 0.0))
+            if cnt > c0:
+                out[stage] = (cnt - c0, sec - s0)
+        return out
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        p = METRIC_PREFIX
+        lines = [
+            f"# TYPE {p}_stage_seconds histogram",
+        ]
+        with self._lock:
+            for stage, h in sorted(self._hist.items()):
+                cum = 0
+                for bound, c in zip(h.bounds + [float("inf")], h.counts):
+                    cum += c
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f'{p}_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cum}')
+                lines.append(f'{p}_stage_seconds_sum{{stage="{stage}"}} {h.sum:.6f}')
+                lines.append(f'{p}_stage_seconds_count{{stage="{stage}"}} {h.count}')
+            lines.append(f"# TYPE {p}_stage_errors_total counter")
+            for stage in sorted(self._hist):
+                lines.append(f'{p}_stage_errors_total{{stage="{stage}"}} {self._errors.get(stage, 0)}')
+            for name, v in sorted(self._counters.items()):
+                lines.append(f"# TYPE {p}_{name} counter")
+                lines.append(f"{p}_{name} {v:g}")
+            lines.append(f"# TYPE {p}_uptime_seconds gauge")
+            lines.append(f"{p}_uptime_seconds {time.time() - self.started:.1f}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            counters = dict(self._counters)
+        payload = {
+            "started":  self.started,
+            "dumped":   time.time(),
+            "stages":   self.summary(),
+            "counters": counters,
+        }
+        path.write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
+
+    def format_table(self) -> str:
+        rows = [f"{'stage':<34}{'count':>7}{'err%':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+        for stage, r in self.summary().items():
+            rows.append(
+                f"{stage:<34}{r['count']:>7}{100 * r['error_rate']:>6.1f}%"
+                f"{1e3 * r['p50']:>7.1f}ms{1e3 * r['p95']:>7.1f}ms{1e3 * r['p99']:>7.1f}ms{1e3 * r['max']:>7.1f}ms"
+            )
+        return "\n".join(rows)
+
+
+# ───── 프로세스 전역 레지스트리 ─────────────────────────────────
+REGISTRY = Registry()
+
+
+def timer(stage: str):
+    return REGISTRY.timer(stage)
+
+
+def observe(stage: str, sec: float, error: bool = False) -> None:
+    REGISTRY.observe(stage, sec, error)
+
+
+def inc(name: str, n: float = 1) -> None:
+    REGISTRY.inc(name, n)
+
+
+# ─────────────────────────────────────────────────────────────
+# HTTP 노출 (/metrics: Prometheus 텍스트, /metrics.json: 분위수 요약)
+# ─────────────────────────────────────────────────────────────
+class MetricsServer:
+    def __init__(self, registry: Registry = REGISTRY, host: str = "127.0.0.1", port: int = 9108) -> None:
+        self.registry = registry
+        reg = registry
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.startswith("/metrics.json"):
+                    body, ctype = json.dumps(reg.summary()).encode(), "application/json"
+                elif self.path.startswith("/metrics"):
+                    body, ctype = reg.render().encode(), "text/plain; version=0.0.4"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), _Handler)
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self) -> "MetricsServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# ───── 프로세스당 한 번만 실행 (AutoTrader 재시작 시 중복 방지) ──────
+_SERVER: Optional[MetricsServer] = None
+_EXIT_DUMP: Optional[Path] = None
+
+
+def serve(port: int, host: str = "127.0.0.1") -> Optional[MetricsServer]:
+    """port > 0 이면 메트릭 HTTP 서버 시작 (이미 실행 중이면 기존 서버 반환)"""
+    global _SERVER
+    if _SERVER is None and port:
+        _SERVER = MetricsServer(REGISTRY, host, port).start()
+    return _SERVER
+
+
+def dump_at_exit(log_dir: str = "logs") -> Path:
+    """프로세스 종료 시 log_dir/metrics_YYYYmmdd_HHMMSS.json 으로 요약 저장"""
+    global _EXIT_DUMP
+    if _EXIT_DUMP is None:
+        _EXIT_DUMP = Path(log_dir).resolve() / f"metrics_{time.strftime('%Y%m%d_%H%M%S')}.json"
+        atexit.register(REGISTRY.dump, _EXIT_DUMP)
+    return _EXIT_DUMP
+
+
+if __name__ == "__main__":
+    import sys
+
+    # 저장된 덤프 파일을 표로 출력
+    for p in sys.argv[1:]:
+        data = json.loads(Path(p).read_text(encoding="utf-8"))
+        print(f"📄 {p}")
+        for stage, r in data["stages"].items():
+            print(
+                f"  {stage:<34}{r['count']:>7}  err {100 * r['error_rate']:5.1f}%  "
+                f"p50 {1e3 * r['p50']:7.1f}ms  p95 {1e3 * r['p95']:7.1f}ms  p99 {1e3 * r['p99']:7.1f}ms"
+            )
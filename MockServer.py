@@ -0,0 +1,449 @@
+from __future__ import annotations
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+import datetime as dt
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import yaml
+from zoneinfo import ZoneInfo
+
+ET = ZoneInfo("US/Eastern")
+
+# ───── 경로 → 엔드포인트 이름 ──────────────────────────────────
+ROUTES: Dict[str, str] = {
+    "/oauth2/tokenP":                                                    "tokenP",
+    "/uapi/hashkey":                                                     "hashkey",
+    "/uapi/overseas-price/v1/quotations/price":                          "price",
+    "/uapi/overseas-price/v1/quotations/inquire-time-itemchartprice":    "inquire-time-itemchartprice",
+    "/uapi/overseas-price/v1/quotations/inquire-ccnl":                   "inquire-ccnl",
+    "/uapi/overseas-stock/v1/trading/inquire-balance":                   "inquire-balance",
+    "/uapi/overseas-stock/v1/trading/inquire-present-balance":           "inquire-present-balance",
+    "/uapi/domestic-stock/v1/trading/inquire-psbl-order":                "inquire-psbl-order",
+    "/uapi/overseas-stock/v1/trading/order":                             "order",
+    "/v1/finance/search":                                                "yahoo-search",
+    "/quote.ashx":                                                       "finviz-quote",
+    "/webhook":                                                          "discord-webhook",
+}
+
+# ───── 기본 부하 프로파일 (YAML 로 재정의 가능) ─────────────────
+# latency.dist : const(ms) | uniform(min_ms, max_ms) | normal(mean_ms, std_ms) | lognormal(median_ms, sigma)
+# error_rate   : 0~1, 해당 비율로 HTTP 500 응답
+# rate_limit   : 초당 허용 요청 수 (burst 로 순간 허용량 지정, None 이면 무제한)
+DEFAULT_PROFILE: Dict[str, Any] = {
+    "seed": 42,
+    "global_rate_limit": {"rate": 20, "burst": 20},   # KIS 계정당 초당 20건
+    "default": {
+        "latency":    {"dist": "lognormal", "median_ms": 60, "sigma": 0.4},
+        "error_rate": 0.0,
+        "rate_limit": None,
+    },
+    "endpoints": {
+        "tokenP":          {"latency": {"dist": "const", "ms": 300}, "rate_limit": {"rate": 1 / 60, "burst": 1}},
+        "order":           {"latency": {"dist": "lognormal", "median_ms": 120, "sigma": 0.5}},
+        "yahoo-search":    {"latency": {"dist": "lognormal", "median_ms": 250, "sigma": 0.6}},
+        "finviz-quote":    {"latency": {"dist": "lognormal", "median_ms": 400, "sigma": 0.7}},
+        "discord-webhook": {"latency": {"dist": "uniform", "min_ms": 20, "max_ms": 80}},
+    },
+    "market": {
+        "start_price":  {"AAPL": 200.0, "MSFT": 450.0, "AMZN": 200.0, "GOOGL": 170.0, "NVDA": 130.0},
+        "volatility":   0.0015,      # 1분봉 수익률 표준편차
+        "usdkrw":       1380.0,
+        "cash_usd":     430.0,
+        "cash_krw":     1_000_000,
+        "news_count":   30,
+        "history_days": 30,          # KEYB 연속 조회로 제공하는 과거 분봉 기간 (정규장 시간만)
+    },
+}
+
+_HEADLINES = [
+    "{sym} shares rise after strong quarterly results",
+    "{sym} faces regulatory probe over business practices",
+    "Analysts upgrade {sym} on robust demand outlook",
+    "{sym} stock slips as investors weigh valuation",
+    "{sym} announces new product lineup",
+    "{sym} cuts guidance amid supply chain concerns",
+    "{sym} trading flat ahead of Fed decision",
+]
+
+
+def _merge(base: Dict[str, Any], over: Dict[str, Any]) -> Dict[str, Any]:
+    out = dict(base)
+    for k, v in (over or {}).items():
+        out[k] = _merge(out[k], v) if isinstance(v, dict) and isinstance(out.get(k), dict) else v
+    return out
+
+
+def load_profile(path: Optional[str] = None) -> Dict[str, Any]:
+    """DEFAULT_PROFILE 에 YAML 프로파일을 덮어써서 반환"""
+    if not path:
+        return _merge(DEFAULT_PROFILE, {})
+    with open(path, encoding="utf-8") as f:
+        return _merge(DEFAULT_PROFILE, yaml.safe_load(f) or {})
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate   = float(rate)
+        self.burst  = float(burst)
+        self.tokens = float(burst)
+        self.ts     = time.monotonic()
+        self.lock   = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now         = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.ts) * self.rate)
+            self.ts     = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+def _bucket(spec: Any) -> Optional[_TokenBucket]:
+    if not spec:
+        return None
+    if isinstance(spec, (int, float)):
+        return _TokenBucket(spec, max(1.0, spec))
+    return _TokenBucket(spec["rate"], spec.get("burst", max(1.0, spec["rate"])))
+
+
+class MockMarket:
+    """종목별 랜덤워크 분봉 + 모의 계좌 (주문 반영)"""
+
+    def __init__(self, cfg: Dict[str, Any], rng: random.Random) -> None:
+        self.cfg      = cfg
+        self.rng      = rng
+        self.lock     = threading.Lock()
+        self.bars:    Dict[str, List[Dict[str, Any]]] = {}   # 최신 봉이 앞
+        self.holdings: Dict[str, int] = {}
+        self.cash_usd = float(cfg["cash_usd"])
+
+    def _price0(self, sym: str) -> float:
+        return float(self.cfg["start_price"].get(sym, 100.0))
+
+    def chart(self, sym: str, count: int) -> List[Dict[str, Any]]:
+        """현재 분까지 봉을 생성해 최신순으로 반환"""
+        now = dt.datetime.now(ET).replace(second=0, microsecond=0)
+        with self.lock:
+            bars = self.bars.setdefault(sym, [])
+            if not bars:
+                t, last = now - dt.timedelta(minutes=max(count, 120)), self._price0(sym)
+            else:
+                t, last = bars[0]["_t"], float(bars[0]["last"])
+            while t < now:
+                t   += dt.timedelta(minutes=1)
+                open_ = last
+                last  = max(0.01, open_ * math.exp(self.rng.gauss(0.0, self.cfg["volatility"])))
+                hi    = max(open_, last) * (1 + abs(self.rng.gauss(0, self.cfg["volatility"] / 2)))
+                lo    = min(open_, last) * (1 - abs(self.rng.gauss(0, self.cfg["volatility"] / 2)))
+                bars.insert(0, {
+                    "_t":   t,
+                    "tymd": t.strftime("%Y%m%d"), "xymd": t.strftime("%Y%m%d"),
+                    "xhms": t.strftime("%H%M%S"),
+                    "open": f"{open_:.4f}", "high": f"{hi:.4f}", "low": f"{lo:.4f}",
+                    "last": f"{last:.4f}", "evol": str(self.rng.randint(1_000, 50_000)),
+                })
+            del bars[2000:]
+            return [{k: v for k, v in b.items() if k != "_t"} for b in bars[:count]]
+
+    def history(self, sym: str, keyb: str, count: int) -> List[Dict[str, Any]]:
+        """
+        KEYB(ET 'YYYYMMDDHHMMSS') 이전 정규장 분봉을 최신순으로 최대 count 개
+        • 같은 종목·시각이면 항상 같은 값 (중단 후 다시 조회해도 일치) · history_days 이전은 빈 목록
+        """
+        t = dt.datetime.strptime(keyb[:12], "%Y%m%d%H%M").replace(tzinfo=ET)
+        t0 = dt.datetime.now(ET) - dt.timedelta(days=self.cfg.get("history_days", 30))
+        p0, vol = self._price0(sym), self.cfg["volatility"]
+        out: List[Dict[str, Any]] = []
+        while len(out) < count:
+            t -= dt.timedelta(minutes=1)
+            if t < t0:
+                break
+            if t.weekday() >= 5 or not (dt.time(9, 30) <= t.time() < dt.time(16, 0)):
+                # 장외 → 같은 날(장 마감 후) 또는 전날 16:00 으로 건너뛰고 다음 반복에서 15:59
+                after_close = t.weekday() < 5 and t.time() >= dt.time(16, 0)
+                t = t.replace(hour=16, minute=0) - dt.timedelta(days=0 if after_close else 1)
+                continue
+            m    = t.timestamp() / 60.0
+            r    = random.Random(f"{sym}{int(m)}")
+            last = p0 * math.exp(40 * vol * math.sin(m / 3001.0) + 8 * vol * math.sin(m / 97.0) + r.gauss(0.0, vol))
+            open_ = last * math.exp(r.gauss(0.0, vol))
+            hi   = max(open_, last) * (1 + abs(r.gauss(0, vol / 2)))
+            lo   = min(open_, last) * (1 - abs(r.gauss(0, vol / 2)))
+            out.append({
+                "tymd": t.strftime("%Y%m%d"), "xymd": t.strftime("%Y%m%d"), "xhms": t.strftime("%H%M%S"),
+                "open": f"{open_:.4f}", "high": f"{hi:.4f}", "low": f"{lo:.4f}",
+                "last": f"{last:.4f}", "evol": str(r.randint(1_000, 50_000)),
+            })
+        return out
+
+    def last(self, sym: str) -> float:
+        return float(self.chart(sym, 1)[0]["last"])
+
+    def order(self, sym: str, qty: int, price: float, side: str) -> Tuple[bool, str]:
+        with self.lock:
+            held = self.holdings.get(sym, 0)
+            if side == "buy":
+                if qty * price > self.cash_usd:
+                    return False, "주문가능금액을 초과 하였습니다"
+                self.cash_usd       -= qty * price
+                self.holdings[sym]   = held + qty
+            else:
+                if qty > held:
+                    return False, "주문가능수량을 초과 하였습니다"
+                self.cash_usd       += qty * price
+                self.holdings[sym]   = held - qty
+            return True, "주문 전송 완료 되었습니다."
+
+
+class MockServer:
+    """
+    TradingBot / NewsCrawler / Discord 알림을 대체하는 로컬 HTTP 서버
+    • 엔드포인트별 지연 분포, 오류율, 초당 요청 제한 주입
+    • GET /__stats 로 엔드포인트별 요청·오류·제한 건수 조회
+    """
+
+    def __init__(self, profile: Optional[Dict[str, Any]] = None, host: str = "127.0.0.1", port: int = 0) -> None:
+        self.profile = profile or load_profile()
+        self.rng     = random.Random(self.profile.get("seed"))
+        self.rng_lock = threading.Lock()
+        self.market  = MockMarket(self.profile["market"], random.Random(self.profile.get("seed")))
+
+        self.global_bucket = _bucket(self.profile.get("global_rate_limit"))
+        self.buckets: Dict[str, Optional[_TokenBucket]] = {
+            name: _bucket(self._spec(name).get("rate_limit")) for name in set(ROUTES.values())
+        }
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.stats_lock = threading.Lock()
+        self.webhook_messages: List[str] = []
+        self._token_seq = 0
+
+        self.httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    # ─────────────────────────────────────────────────────────
+    # 수명 관리
+    # ─────────────────────────────────────────────────────────
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="MockServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ─────────────────────────────────────────────────────────
+    # 장애 주입
+    # ─────────────────────────────────────────────────────────
+    def _spec(self, name: str) -> Dict[str, Any]:
+        return _merge(self.profile["default"], self.profile["endpoints"].get(name, {}))
+
+    def _latency_sec(self, spec: Dict[str, Any]) -> float:
+        lat  = spec.get("latency") or {}
+        kind = lat.get("dist", "const")
+        with self.rng_lock:
+            if kind == "uniform":
+                ms = self.rng.uniform(lat["min_ms"], lat["max_ms"])
+            elif kind == "normal":
+                ms = self.rng.gauss(lat["mean_ms"], lat["std_ms"])
+            elif kind == "lognormal":
+                ms = lat["median_ms"] * math.exp(self.rng.gauss(0.0, lat.get("sigma", 0.5)))
+            else:
+                ms = lat.get("ms", 0)
+        return max(0.0, ms) / 1000.0
+
+    def _roll_error(self, spec: Dict[str, Any]) -> bool:
+        rate = spec.get("error_rate") or 0.0
+        with self.rng_lock:
+            return self.rng.random() < rate
+
+    def _count(self, name: str, key: str) -> None:
+        with self.stats_lock:
+            s = self.stats.setdefault(name, {"requests": 0, "errors": 0, "throttled": 0})
+            s[key] += 1
+
+    # ─────────────────────────────────────────────────────────
+    # 응답 생성
+    # ─────────────────────────────────────────────────────────
+    def respond(self, name: str, query: Dict[str, str], body: Dict[str, Any], raw_body: bytes) -> Tuple[int, str, bytes]:
+        self._count(name, "requests")
+        spec = self._spec(name)
+
+        bucket = self.buckets.get(name)
+        is_kis = name not in ("yahoo-search", "finviz-quote", "discord-webhook")
+        if (bucket and not bucket.take()) or (is_kis and self.global_bucket and not self.global_bucket.take()):
+            self._count(name, "throttled")
+            err = {"rt_cd": "1", "msg_cd": "EGW00201", "msg1": "초당 거래건수를 초과하였습니다."}
+            return 500, "application/json", json.dumps(err).encode()
+
+        time.sleep(self._latency_sec(spec))
+
+        if self._roll_error(spec):
+            self._count(name, "errors")
+            err = {"rt_cd": "1", "msg_cd": "EGW00500", "msg1": "모의 서버 오류"}
+            return 500, "application/json", json.dumps(err).encode()
+
+        handler = getattr(self, "_r_" + name.replace("-", "_"))
+        return handler(query, body, raw_body)
+
+    def _json(self, obj: Any) -> Tuple[int, str, bytes]:
+        return 200, "application/json", json.dumps(obj).encode()
+
+    def _r_tokenP(self, q, body, raw):
+        self._token_seq += 1
+        return self._json({"access_token": f"mock-token-{self._token_seq}", "token_type": "Bearer", "expires_in": 86400})
+
+    def _r_hashkey(self, q, body, raw):
+        return self._json({"HASH": hashlib.sha256(raw).hexdigest()})
+
+    def _r_price(self, q, body, raw):
+        return self._json({"rt_cd": "0", "output": {"last": f"{self.market.last(q.get('SYMB', 'AAPL')):.4f}"}})
+
+    def _r_inquire_time_itemchartprice(self, q, body, raw):
+        sym, count = q.get("SYMB", "AAPL"), int(q.get("CNT", "120") or 120)
+        if q.get("NEXT") == "1" and q.get("KEYB"):
+            return self._json({"rt_cd": "0", "output1": {}, "output2": self.market.history(sym, q["KEYB"], count)})
+        bars = self.market.chart(sym, count)
+        return self._json({"rt_cd": "0", "output1": {}, "output2": bars})
+
+    def _r_inquire_ccnl(self, q, body, raw):
+        with self.rng_lock:
+            rows = [{"time": f"{9 + i // 60:02d}{i % 60:02d}00", "vpow": f"{self.rng.uniform(80, 120):.2f}"}
+                    for i in range(30, 90)]
+        return self._json({"rt_cd": "0", "output1": rows})
+
+    def _r_inquire_balance(self, q, body, raw):
+        rows = []
+        for sym, qty in list(self.market.holdings.items()):
+            if qty <= 0:
+                continue
+            last = self.market.last(sym)
+            rows.append({
+                "ovrs_pdno": sym, "ovrs_cblc_qty": str(qty), "last": f"{last:.4f}",
+                "ovrs_stck_evlu_amt": f"{last * qty:.4f}", "frcr_evlu_pfls_amt": "0",
+            })
+        summary = {"frcr_dncl_amt_2": f"{self.market.cash_usd:.2f}"}
+        return self._json({"rt_cd": "0", "output1": rows, "output2": summary})
+
+    def _r_inquire_present_balance(self, q, body, raw):
+        return self._json({"rt_cd": "0", "output1": [], "output2": [{"frst_bltn_exrt": str(self.profile["market"]["usdkrw"])}]})
+
+    def _r_inquire_psbl_order(self, q, body, raw):
+        return self._json({"rt_cd": "0", "output": {"ord_psbl_cash": str(self.profile["market"]["cash_krw"])}})
+
+    def _r_order(self, q, body, raw):
+        side = "buy" if body.get("_tr_id", "").endswith("1002U") else "sell"
+        ok, msg = self.market.order(body.get("PDNO", ""), int(body.get("ORD_QTY", 0)),
+                                    float(body.get("OVRS_ORD_UNPR", 0)), side)
+        return self._json({"rt_cd": "0" if ok else "1", "msg1": msg, "message": msg})
+
+    def _r_yahoo_search(self, q, body, raw):
+        sym, n = q.get("q", "AAPL"), int(q.get("newsCount", 30) or 30)
+        now    = int(time.time())
+        with self.rng_lock:
+            news = [{"title": self.rng.choice(_HEADLINES).format(sym=sym),
+                     "providerPublishTime": now - self.rng.randint(60, 86_400)} for _ in range(n)]
+        return self._json({"news": news})
+
+    def _r_finviz_quote(self, q, body, raw):
+        sym, now = q.get("t", "AAPL"), dt.datetime.now(ET)
+        rows = []
+        with self.rng_lock:
+            for i in range(self.profile["market"]["news_count"]):
+                t     = now - dt.timedelta(minutes=37 * i)
+                stamp = t.strftime("%b-%d-%y %I:%M%p") if i == 0 or t.date() != (t + dt.timedelta(minutes=37)).date() \
+                        else t.strftime("%I:%M%p")
+                title = self.rng.choice(_HEADLINES).format(sym=sym)
+                rows.append(f'<tr><td>{stamp}</td><td><a href="#">{title}</a></td></tr>')
+        html = f'<html><body><table id="news-table">{"".join(rows)}</table></body></html>'
+        return 200, "text/html", html.encode()
+
+    def _r_discord_webhook(self, q, body, raw):
+        self.webhook_messages.append(body.get("content", ""))
+        del self.webhook_messages[:-1000]
+        return 204, "text/plain", b""
+
+    # ─────────────────────────────────────────────────────────
+    # HTTP 핸들러
+    # ─────────────────────────────────────────────────────────
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args) -> None:      # 표준 접근 로그 끄기
+                pass
+
+            def _dispatch(self) -> None:
+                parsed = urlparse(self.path)
+                query  = {k: v[0] for k, v in parse_qs(parsed.query, keep_blank_values=True).items()}
+                length = int(self.headers.get("Content-Length") or 0)
+                raw    = self.rfile.read(length) if length else b""
+
+                if parsed.path == "/__stats":
+                    with server.stats_lock:
+                        code, ctype, payload = server._json(server.stats)
+                else:
+                    name = ROUTES.get(parsed.path)
+                    if name is None:
+                        code, ctype, payload = 404, "application/json", b'{"rt_cd":"1","msg1":"not found"}'
+                    else:
+                        body = self._parse_body(raw)
+                        body["_tr_id"] = self.headers.get("tr_id", "")
+                        code, ctype, payload = server.respond(name, query, body, raw)
+
+                self.send_response(code)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _parse_body(self, raw: bytes) -> Dict[str, Any]:
+                if not raw:
+                    return {}
+                try:
+                    return json.loads(raw)
+                except ValueError:
+                    return {k: v[0] for k, v in parse_qs(raw.decode("utf-8", "replace")).items()}
+
+            do_GET  = _dispatch
+            do_POST = _dispatch
+
+        return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="KIS·뉴스 모의 서버")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--profile", help="부하 프로파일 YAML")
+    args = ap.parse_args()
+
+    srv = MockServer(load_profile(args.profile), port=args.port)
+    print(f"🧪 MockServer 실행 중: {srv.url}  (통계: {srv.url}/__stats)")
+    try:
+        srv.httpd.serve_forever()
+    except KeyboardInterrupt:
+        srv.stop()
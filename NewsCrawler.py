@@ -1,43 +1,58 @@
+from __future__ import annotations
 import os
+import hashlib
 import yaml
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
 from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
 from zoneinfo import ZoneInfo
 
+import Clock
+import Metrics
+
+if TYPE_CHECKING:                 # pandas·bs4 는 크롤링할 때 함수 안에서 import (모듈 import 는 가볍게)
+    import pandas as pd
+
 ET = ZoneInfo("US/Eastern")
 DEFAULT_SYMBOLS = ["AAPL", "MSFT", "NVDA", "AMZN", "GOOGL"]
 
+# 뉴스 소스 주소 (MockServer 등으로 교체 가능)
+YAHOO_SEARCH_URL = 'https://query1.finance.yahoo.com/v1/finance/search'
+FINVIZ_QUOTE_URL = 'https://finviz.com/quote.ashx'
+
 
 def fetch_yahoo_news(symbol: str, count: int = 30) -> pd.DataFrame:
     """
     Yahoo Finance v1 Search API를 호출해
     site, title, time(ET 기준) 컬럼만 가진 DataFrame 반환
     """
-    url = 'https://query1.finance.yahoo.com/v1/finance/search'
+    url = YAHOO_SEARCH_URL
     params = {
         'q': symbol,
         'newsCount': count,
         'enableFuzzyQuery': 'false',
         'quotesCount': 0,
     }
-    headers = {'User-Agent': 'Mozilla/5.0'}
-    resp = requests.get(url, headers=headers, params=params, timeout=10)
-    resp.raise_for_status()
-    data = resp.json()
+    import pandas as pd
 
-    rows = []
-    for it in data.get('news', [])[:count]:
-        ts     = it.get('providerPublishTime', 0)
-        dt_et  = datetime.fromtimestamp(ts, tz=ET)
-        time_str = dt_et.strftime('%Y-%m-%d %H:%M:%S %Z')
-        rows.append({
-            'site':  'Yahoo Finance',
-            'title': it.get('title', '').strip(),
-            'time':  time_str,
-        })
-    return pd.DataFrame(rows)
+    headers = {'User-Agent': 'Mozilla/5.0'}
+    with Metrics.timer('crawl.yahoo'):
+        resp = requests.get(url, headers=headers, params=params, timeout=10)
+        resp.raise_for_status()
+
+    with Metrics.timer('parse.yahoo'):
+        data = resp.json()
+        rows = []
+        for it in data.get('news', [])[:count]:
+            ts     = it.get('providerPublishTime', 0)
+            dt_et  = datetime.fromtimestamp(ts, tz=ET)
+            time_str = dt_et.strftime('%Y-%m-%d %H:%M:%S %Z')
+            rows.append({
+                'site':  'Yahoo Finance',
+                'title': it.get('title', '').strip(),
+                'time':  time_str,
+            })
+        return pd.DataFrame(rows)
 
 
 def fetch_finviz_news(symbol: str, count: int = None) -> pd.DataFrame:
@@ -45,11 +60,21 @@ def fetch_finviz_news(symbol: str, count: int = None) -> pd.DataFrame:
     Finviz 뉴스 테이블을 크롤링하여
     site, title, time(ET 기준) 컬럼만 가진 DataFrame 반환
     """
-    url     = f'https://finviz.com/quote.ashx?t={symbol}&p=d'
+    url     = f'{FINVIZ_QUOTE_URL}?t={symbol}&p=d'
     headers = {'User-Agent': 'Mozilla/5.0'}
-    resp    = requests.get(url, headers=headers, timeout=5)
-    resp.raise_for_status()
-    soup    = BeautifulSoup(resp.content, 'html.parser')
+    with Metrics.timer('crawl.finviz'):
+        resp = requests.get(url, headers=headers, timeout=5)
+        resp.raise_for_status()
+
+    with Metrics.timer('parse.finviz'):
+        return _parse_finviz(resp.content, count)
+
+
+def _parse_finviz(content: bytes, count: int = None) -> pd.DataFrame:
+    import pandas as pd
+    from bs4 import BeautifulSoup
+
+    soup  = BeautifulSoup(content, 'html.parser')
 
     table = soup.find('table', id='news-table')
     rows = []
@@ -68,19 +93,19 @@ def fetch_finviz_news(symbol: str, count: int = None) -> pd.DataFrame:
             current_date = dt_obj.date()
         # 2) Today / Yesterday 처리
         elif raw_time.startswith('Today '):
-            date_part = datetime.now(ET).date()
+            date_part = Clock.now(ET).date()
             t_part    = raw_time.split(' ', 1)[1]
             t_obj     = datetime.strptime(t_part, '%I:%M%p').time()
             dt_obj    = datetime.combine(date_part, t_obj, tzinfo=ET)
         elif raw_time.startswith('Yesterday '):
-            date_part = (datetime.now(ET) - timedelta(days=1)).date()
+            date_part = (Clock.now(ET) - timedelta(days=1)).date()
             t_part    = raw_time.split(' ', 1)[1]
             t_obj     = datetime.strptime(t_part, '%I:%M%p').time()
             dt_obj    = datetime.combine(date_part, t_obj, tzinfo=ET)
         # 3) 시간만 있는 경우
         else:
             if current_date is None:
-                current_date = datetime.now(ET).date()
+                current_date = Clock.now(ET).date()
             t_obj  = datetime.strptime(raw_time, '%I:%M%p').time()
             dt_obj = datetime.combine(current_date, t_obj, tzinfo=ET)
 
@@ -94,6 +119,43 @@ def fetch_finviz_news(symbol: str, count: int = None) -> pd.DataFrame:
     return pd.DataFrame(rows)
 
 
+def reset_news_dir(news_dir: str = 'news') -> None:
+    """news_dir 생성 후 이전 CSV 삭제"""
+    os.makedirs(news_dir, exist_ok=True)
+    for fname in os.listdir(news_dir):
+        if fname.lower().endswith('.csv'):
+            os.remove(os.path.join(news_dir, fname))
+
+
+def crawl_symbol(sym: str, news_dir: str = 'news') -> str:
+    """종목 하나의 Yahoo + Finviz 뉴스를 CSV로 저장하고 경로 반환"""
+    import pandas as pd
+
+    df_y = fetch_yahoo_news(sym, 30)
+    df_f = fetch_finviz_news(sym)
+    df   = pd.concat([df_y, df_f], ignore_index=True)
+
+    now_et   = Clock.now(ET).strftime('%Y%m%d_%H%M%S')
+    filename = f'{sym}_news_{now_et}_ET.csv'
+    filepath = os.path.join(news_dir, filename)
+
+    df.to_csv(
+        filepath,
+        index=False,
+        columns=['site', 'title', 'time'],
+        encoding='utf-8-sig'
+    )
+    return filepath
+
+
+def headline_key(csv_path: str) -> str:
+    """CSV 헤드라인 목록 지문 (순서 무관, 같은 헤드라인이면 같은 값)"""
+    import pandas as pd
+
+    titles = pd.read_csv(csv_path, usecols=['title'])['title'].dropna().astype(str)
+    return hashlib.sha1('\n'.join(sorted(set(titles))).encode('utf-8')).hexdigest()
+
+
 def NewsCrawler(
     symbols: list[str] | None = None,
     news_dir: str = 'news',
@@ -114,32 +176,10 @@ def NewsCrawler(
             symbols = DEFAULT_SYMBOLS
 
     # 2) news_dir 초기화
-    os.makedirs(news_dir, exist_ok=True)
-    for fname in os.listdir(news_dir):
-        if fname.lower().endswith('.csv'):
-            os.remove(os.path.join(news_dir, fname))
-
-    saved_paths: list[str] = []
+    reset_news_dir(news_dir)
 
     # 3) 종목별 크롤링 및 저장
-    for sym in symbols:
-        df_y = fetch_yahoo_news(sym, 30)
-        df_f = fetch_finviz_news(sym)
-        df   = pd.concat([df_y, df_f], ignore_index=True)
-
-        now_et   = datetime.now(ET).strftime('%Y%m%d_%H%M%S')
-        filename = f'{sym}_news_{now_et}_ET.csv'
-        filepath = os.path.join(news_dir, filename)
-
-        df.to_csv(
-            filepath,
-            index=False,
-            columns=['site', 'title', 'time'],
-            encoding='utf-8-sig'
-        )
-        saved_paths.append(filepath)
-
-    return saved_paths
+    return [crawl_symbol(sym, news_dir) for sym in symbols]
 
 
 # ─── NewsCrawler.py 단독 실행 테스트 ─────────────────────────────────────
@@ -0,0 +1,275 @@
+from __future__ import annotations
+import os
+import re
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from zoneinfo import ZoneInfo
+
+import Clock
+import Metrics
+
+ET = ZoneInfo("US/Eastern")
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_LOG_DIR        = "logs/profile"
+DEFAULT_CONTROL_FILE   = "logs/profile.on"   # 파일 생성 시 다음 N틱 프로파일 (내용: N, 비우면 기본값)
+DEFAULT_BURST_TICKS    = 5
+DEFAULT_INTERVAL_MS    = 5                   # 요청 시(burst) 샘플 간격
+DEFAULT_CONTINUOUS_MS  = 50                  # 상시 샘플 간격 (오버헤드 최소화)
+DEFAULT_DUMP_EVERY     = 60                  # 상시 모드 저장 주기 (틱)
+TOP_N                  = 30
+MAX_DEPTH              = 128
+
+_POOL_SUFFIX = re.compile(r"_\d+$")          # ThreadPoolExecutor 스레드 이름 'tick_3' → 'tick'
+_IDLE_LEAVES = {("_worker", "thread.py")}   # 작업 대기 중인 풀 스레드 (큐 get 에서 블록)
+
+
+def _label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    모든 스레드의 호출 스택을 주기적으로 샘플링 (sys._current_frames)
+    • 결과: (스레드 이름, 바깥 프레임 → 안쪽 프레임) 튜플별 샘플 수
+    • 작업 없이 대기 중인 풀 스레드는 제외
+    • 파이프라인 스레드 풀까지 한 번에 보이도록 cProfile 대신 사용
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL_MS / 1000) -> None:
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self.n_samples = 0
+        self._stop   = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        return self.samples
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        while not self._stop.is_set():
+            names  = {t.ident: _POOL_SUFFIX.sub("", t.name) for t in threading.enumerate()}
+            frames = sys._current_frames()
+            for tid, frame in frames.items():
+                code = frame.f_code
+                if tid == me or (code.co_name, os.path.basename(code.co_filename)) in _IDLE_LEAVES:
+                    continue
+                stack: List[str] = []
+                while frame is not None and len(stack) < MAX_DEPTH:
+                    stack.append(_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(tid, f"thread-{tid}"))
+                self.samples[tuple(reversed(stack))] += 1
+            del frames
+            self.n_samples += 1
+            self._stop.wait(self.interval)
+
+
+def folded(samples: Counter) -> str:
+    """flamegraph.pl / speedscope 호환 'a;b;c count' 형식"""
+    return "".join(f"{';'.join(stack)} {n}\n" for stack, n in samples.most_common())
+
+
+def top_functions(samples: Counter, n: int = TOP_N) -> Tuple[List[Tuple[str, int]], List[Tuple[str, int]]]:
+    """(자체 시간 상위, 포함 시간 상위) — 스택 맨 앞 스레드 이름은 제외"""
+    own, total = Counter(), Counter()
+    for stack, c in samples.items():
+        frames = stack[1:]
+        if not frames:
+            continue
+        own[frames[-1]] += c
+        for f in set(frames):
+            total[f] += c
+    return own.most_common(n), total.most_common(n)
+
+
+class TickProfiler:
+    """
+    실행 중인 AutoTrader 의 loop_once 프로파일 제어
+    • 켜는 방법: SIGUSR1 / DEFAULT_CONTROL_FILE 생성 / config PROFILE_TICKS (시작 후 N틱)
+    • PROFILE_CONTINUOUS: 낮은 빈도로 상시 샘플링, DUMP_EVERY 틱마다 저장
+    • 결과: log_dir/<시각>_<모드>_<N>ticks.folded (flame graph) + .txt (틱 시각·단계별 시간·상위 함수)
+    """
+
+    def __init__(
+        self,
+        *,
+        log_dir: str = DEFAULT_LOG_DIR,
+        control_file: str = DEFAULT_CONTROL_FILE,
+        start_ticks: int = 0,
+        continuous: bool = False,
+        interval_ms: float = DEFAULT_INTERVAL_MS,
+        continuous_ms: float = DEFAULT_CONTINUOUS_MS,
+        dump_every: int = DEFAULT_DUMP_EVERY,
+        notify=None,
+    ) -> None:
+        self.log_dir       = Path(log_dir)
+        self.control_file  = Path(control_file)
+        self.continuous    = continuous
+        self.interval      = interval_ms / 1000
+        self.continuous_iv = continuous_ms / 1000
+        self.dump_every    = dump_every
+        self.notify        = notify
+        self._pending      = start_ticks
+        self._mode: Optional[str] = None            # burst | continuous
+        self._remaining    = 0
+        self._sampler: Optional[SamplingProfiler] = None
+        self._ticks: List[Dict] = []
+        self.last_output: Optional[Path] = None
+
+    # ─── 켜기 ─────────────────────────────────────────
+    def request(self, ticks: int = DEFAULT_BURST_TICKS) -> None:
+        """다음 ticks 회 loop_once 프로파일 (시그널 핸들러에서도 호출 가능)"""
+        self._pending = max(1, int(ticks))
+
+    def install_signal(self) -> bool:
+        """SIGUSR1 → request() (POSIX 메인 스레드에서만 가능)"""
+        sig = getattr(signal, "SIGUSR1", None)
+        if sig is None:
+            return False
+        try:
+            signal.signal(sig, lambda s, f: self.request())
+        except ValueError:
+            return False
+        return True
+
+    def _check_control_file(self) -> None:
+        if not self.control_file.exists():
+            return
+        try:
+            text = self.control_file.read_text(encoding="utf-8").strip()
+            self.control_file.unlink()
+        except OSError:
+            return
+        self.request(int(text) if text.isdigit() else DEFAULT_BURST_TICKS)
+
+    # ─── 틱 단위 계측 ──────────────────────────────────
+    @contextmanager
+    def tick(self) -> Iterator[None]:
+        self._check_control_file()
+        if self._pending:
+            if self._mode is not None:
+                self._finish()
+            self._begin("burst", self.interval)
+            self._remaining, self._pending = self._pending, 0
+        elif self._mode is None and self.continuous:
+            self._begin("continuous", self.continuous_iv)
+
+        if self._mode is None:
+            yield
+            return
+
+        before = Metrics.REGISTRY.snapshot()
+        start  = Clock.now(ET)
+        t0     = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._ticks.append({
+                "start":  start,
+                "wall":   time.perf_counter() - t0,
+                "stages": Metrics.REGISTRY.delta(before),
+            })
+            if self._mode == "burst":
+                self._remaining -= 1
+                if self._remaining <= 0:
+                    self._finish()
+            elif len(self._ticks) >= self.dump_every:
+                self._finish()
+
+    def _begin(self, mode: str, interval: float) -> None:
+        self._mode    = mode
+        self._ticks   = []
+        self._sampler = SamplingProfiler(interval)
+        self._sampler.start()
+
+    def _finish(self) -> None:
+        samples = self._sampler.stop() if self._sampler else Counter()
+        mode, ticks = self._mode, self._ticks
+        self._mode, self._sampler, self._ticks = None, None, []
+        if ticks:
+            self.last_output = self._write(mode, ticks, samples)
+            if self.notify:
+                self.notify(f"🔬 프로파일 저장: {self.last_output.name} ({len(ticks)}틱)")
+
+    # ─── 저장 ─────────────────────────────────────────
+    def _write(self, mode: str, ticks: List[Dict], samples: Counter) -> Path:
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.log_dir / f"{ticks[0]['start']:%Y%m%d_%H%M%S}_{mode}_{len(ticks)}ticks"
+        stem.with_suffix(".folded").write_text(folded(samples), encoding="utf-8")
+
+        lines = [
+            f"# mode={mode} ticks={len(ticks)} samples={sum(samples.values())}",
+            "",
+            "## ticks (ET)",
+        ]
+        stages: Dict[str, List[float]] = {}
+        for t in ticks:
+            lines.append(f"{t['start']:%Y-%m-%d %H:%M:%S}  wall {t['wall']:8.3f}s")
+            for name, (cnt, sec) in t["stages"].items():
+                acc = stages.setdefault(name, [0, 0.0])
+                acc[0] += cnt
+                acc[1] += sec
+
+        lines += ["", "## stage timings (합계, 프로파일 구간)", f"{'stage':<34}{'count':>7}{'total':>11}{'mean':>11}"]
+        for name, (cnt, sec) in sorted(stages.items(), key=lambda kv: -kv[1][1]):
+            lines.append(f"{name:<34}{cnt:>7}{1e3 * sec:>9.1f}ms{1e3 * sec / cnt:>9.1f}ms")
+
+        own, total = top_functions(samples)
+        n = sum(samples.values()) or 1
+        lines += ["", "## top functions (self)"]
+        lines += [f"{100 * c / n:6.2f}%  {f}" for f, c in own]
+        lines += ["", "## top functions (inclusive)"]
+        lines += [f"{100 * c / n:6.2f}%  {f}" for f, c in total]
+
+        out = stem.with_suffix(".txt")
+        out.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return out
+
+    def close(self) -> None:
+        if self._mode is not None:
+            self._finish()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="실행 중인 AutoTrader 프로파일 요청 / .folded 요약")
+    ap.add_argument("ticks", nargs="?", type=int, default=DEFAULT_BURST_TICKS, help="프로파일할 틱 수")
+    ap.add_argument("--control", default=DEFAULT_CONTROL_FILE, help="AutoTrader 작업 폴더 기준 제어 파일")
+    ap.add_argument("--top", metavar="FOLDED", help="저장된 .folded 파일의 상위 함수 출력")
+    args = ap.parse_args()
+
+    if args.top:
+        samples: Counter = Counter()
+        for line in Path(args.top).read_text(encoding="utf-8").splitlines():
+            stack, _, n = line.rpartition(" ")
+            samples[tuple(stack.split(";"))] += int(n)
+        own, total = top_functions(samples)
+        n = sum(samples.values()) or 1
+        print("## self")
+        for f, c in own:
+            print(f"{100 * c / n:6.2f}%  {f}")
+        print("## inclusive")
+        for f, c in total:
+            print(f"{100 * c / n:6.2f}%  {f}")
+    else:
+        Path(args.control).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.control).write_text(str(args.ticks), encoding="utf-8")
+        print(f"🔬 다음 {args.ticks}틱 프로파일 요청: {args.control}")
@@ -0,0 +1,36 @@
+from __future__ import annotations
+import threading
+from typing import Optional
+
+import Clock
+
+
+class RateLimiter:
+    """
+    토큰 버킷 요청 제한기 (스레드 안전)
+    • 초당 rate 회, 최대 burst 회까지 연속 허용
+    • 토큰이 모자라면 음수로 예약해 두고 그만큼만 대기 → 동시에 기다리는 스레드가 순서대로 분산
+    • rate ≤ 0 이면 제한 없음
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate    = float(rate)
+        self.burst   = float(burst) if burst else max(1.0, self.rate)
+        self._tokens = self.burst
+        self._last: Optional[float] = None
+        self._lock   = threading.Lock()
+
+    def acquire(self) -> float:
+        """요청 1회 허가, 실제로 기다린 시간(초) 반환"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = Clock.time()
+            if self._last is not None:
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last    = now
+            self._tokens -= 1.0
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            Clock.sleep(delay)
+        return delay
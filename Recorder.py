@@ -0,0 +1,317 @@
+from __future__ import annotations
+import base64
+import gzip
+import hashlib
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+import yaml
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+import Clock
+
+# 기록 파일 형식: gzip 압축 JSON Lines
+#   1행  : {"v": 1, "start": 시작 epoch, "token": token.json 내용}
+#   이후 : {"t": 가상시각 오프셋, "k": 요청 키, "lat": 응답 지연, "s": status, "ct": content-type,
+#           "b": 본문(text) | "b64": 본문(base64) | "e": 예외 클래스명, "msg": 예외 메시지}
+FORMAT_VERSION = 1
+
+_ORIG_SEND = HTTPAdapter.send
+
+
+def request_key(request: requests.PreparedRequest) -> str:
+    """
+    요청 식별 키: METHOD + URL(쿼리 정렬) + JSON 본문 해시
+    • 헤더(토큰·hashkey)와 폼 본문(Discord 메시지의 타임스탬프)은 제외
+    """
+    parts = urlsplit(request.url or "")
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key   = f"{request.method} {urlunsplit((parts.scheme, parts.netloc, parts.path, query, ''))}"
+
+    body = request.body
+    if body:
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        try:
+            canon = json.dumps(json.loads(body), sort_keys=True).encode("utf-8")
+            key  += " #" + hashlib.sha1(canon).hexdigest()[:12]
+        except ValueError:
+            pass
+    return key
+
+
+def _read_token_blob(token_file: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(token_file.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+
+
+# ─────────────────────────────────────────────────────────────
+# 기록
+# ─────────────────────────────────────────────────────────────
+class Recorder:
+    """HTTPAdapter.send 를 가로채 모든 요청·응답을 기록 파일에 추가"""
+
+    def __init__(self, path: str | Path, token_file: str | Path = "token.json") -> None:
+        self.path  = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.start = Clock.time()
+        self._fh   = gzip.open(self.path, "wt", encoding="utf-8")
+        self._lock = threading.Lock()
+        self._write({"v": FORMAT_VERSION, "start": self.start, "token": _read_token_blob(Path(token_file))})
+
+    def _write(self, rec: Dict[str, Any]) -> None:
+        line = json.dumps(rec, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._fh:
+                self._fh.write(line + "\n")
+
+    def send(self, adapter: HTTPAdapter, request: requests.PreparedRequest, **kw) -> requests.Response:
+        t   = Clock.time() - self.start
+        t0  = time.perf_counter()
+        rec: Dict[str, Any] = {"t": round(t, 3), "k": request_key(request)}
+        try:
+            resp = _ORIG_SEND(adapter, request, **kw)
+        except requests.RequestException as e:
+            rec.update(lat=round(time.perf_counter() - t0, 4), e=type(e).__name__, msg=str(e))
+            self._write(rec)
+            raise
+        content = resp.content          # 스트림 응답도 여기서 모두 읽음
+        rec.update(lat=round(time.perf_counter() - t0, 4), s=resp.status_code,
+                   ct=resp.headers.get("Content-Type", ""))
+        try:
+            rec["b"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            rec["b64"] = base64.b64encode(content).decode("ascii")
+        self._write(rec)
+        return resp
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fh:
+                self._fh.close()
+                self._fh = None
+
+
+# ─────────────────────────────────────────────────────────────
+# 재생
+# ─────────────────────────────────────────────────────────────
+class Replayer:
+    """
+    기록 파일의 응답을 요청 키별 FIFO 순서로 반환 (네트워크 접근 없음)
+    • 같은 키의 기록이 소진되면 마지막 응답을 반복 사용
+    • 기록에 없는 요청은 ConnectionError
+    • 마지막 기록 시각을 지나면 on_exhausted 콜백 호출
+    """
+
+    def __init__(self, path: str | Path, *, simulate_latency: bool = False) -> None:
+        self.path = Path(path)
+        self.simulate_latency = simulate_latency
+        self.queues: Dict[str, Deque[Dict[str, Any]]] = {}
+        self.last:   Dict[str, Dict[str, Any]] = {}
+        self.misses: Dict[str, int] = {}
+        self.served = 0
+        self.end_t  = 0.0
+        self.on_exhausted = None
+        self._lock  = threading.Lock()
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline())
+            if header.get("v") != FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 기록 형식: {header.get('v')}")
+            self.start = float(header["start"])
+            self.token = header.get("token")
+            for line in f:
+                rec = json.loads(line)
+                self.queues.setdefault(rec["k"], deque()).append(rec)
+                self.end_t = max(self.end_t, rec["t"])
+        self.total = sum(len(q) for q in self.queues.values())
+
+    def send(self, adapter: HTTPAdapter, request: requests.PreparedRequest, **kw) -> requests.Response:
+        key = request_key(request)
+        with self._lock:
+            q = self.queues.get(key)
+            if q:
+                rec = q.popleft()
+                self.last[key] = rec
+                self.served += 1
+            else:
+                rec = self.last.get(key)
+                if rec is None:
+                    self.misses[key] = self.misses.get(key, 0) + 1
+            exhausted = Clock.time() - self.start > self.end_t
+
+        if exhausted and self.on_exhausted:
+            self.on_exhausted()
+        if rec is None:
+            raise requests.ConnectionError(f"[replay] 기록되지 않은 요청: {key}")
+        if self.simulate_latency:
+            Clock.sleep(rec.get("lat", 0.0))
+        if "e" in rec:
+            exc = getattr(requests.exceptions, rec["e"], requests.RequestException)
+            raise exc(f"[replay] {rec.get('msg', '')}")
+
+        resp = requests.Response()
+        resp.status_code = rec["s"]
+        resp.headers     = CaseInsensitiveDict({"Content-Type": rec.get("ct", "")})
+        resp._content    = rec["b"].encode("utf-8") if "b" in rec else base64.b64decode(rec.get("b64", ""))
+        resp.encoding    = "utf-8" if "b" in rec else None
+        resp.url         = request.url
+        resp.request     = request
+        resp.reason      = "REPLAY"
+        return resp
+
+
+# ─────────────────────────────────────────────────────────────
+# 설치 / 해제
+# ─────────────────────────────────────────────────────────────
+def install(handler) -> None:
+    """requests 전역 전송 계층을 handler(Recorder/Replayer) 로 교체"""
+    def _send(adapter, request, **kw):
+        return handler.send(adapter, request, **kw)
+    HTTPAdapter.send = _send
+
+
+def uninstall() -> None:
+    HTTPAdapter.send = _ORIG_SEND
+
+
+# ─────────────────────────────────────────────────────────────
+# 실행 진입점
+# ─────────────────────────────────────────────────────────────
+def record(out: str, config_path: str = "config.yaml") -> None:
+    """실거래/테스트 루프를 그대로 실행하면서 모든 외부 I/O 를 기록 (Ctrl+C 로 종료)"""
+    import signal
+    from AutoTrader import AutoTrader
+
+    with open(config_path, encoding="utf-8") as f:
+        token_file = (yaml.safe_load(f) or {}).get("TOKEN_FILE", "token.json")
+
+    rec = Recorder(out, token_file=token_file)
+    install(rec)
+    stop = threading.Event()
+    signal.signal(signal.SIGINT, lambda s, f: stop.set())
+    try:
+        AutoTrader(stop_event=stop, config_path=config_path).run()
+    finally:
+        uninstall()
+        rec.close()
+        print(f"💾 기록 저장: {out} ({os.path.getsize(out):,} bytes)")
+
+
+def replay(
+    path: str,
+    *,
+    speed: float = 60.0,
+    config_path: str = "config.yaml",
+    simulate_latency: bool = False,
+    workdir: Optional[str] = None,
+    report_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    기록 파일을 가상 시계(speed 배속)로 AutoTrader.run 에 재생하고 틱별 소요 시간 보고
+    • 뉴스·감정분석·로그 파일과 token.json 은 workdir(기본 임시 폴더)에 생성 → 실운영 파일 보호
+    """
+    # 모델 경로는 SentimentAnalyzer 파일 기준이라 chdir 과 무관 (모델은 첫 추론 때 로드)
+    import AutoTrader as at
+
+    rp = Replayer(path, simulate_latency=simulate_latency)
+    workdir = workdir or tempfile.mkdtemp(prefix="autotrader_replay_")
+    cwd     = os.getcwd()
+
+    with open(config_path, encoding="utf-8") as f:
+        cfg = yaml.safe_load(f) or {}
+    cfg["TOKEN_FILE"] = str(Path(workdir) / "token.json")
+    Path(workdir).mkdir(parents=True, exist_ok=True)
+    if rp.token:
+        Path(cfg["TOKEN_FILE"]).write_text(json.dumps(rp.token), encoding="utf-8")
+    replay_cfg = Path(workdir) / "config.yaml"
+    replay_cfg.write_text(yaml.safe_dump(cfg, allow_unicode=True), encoding="utf-8")
+
+    Clock.set_clock(Clock.VirtualClock(rp.start, speed))
+    install(rp)
+    stop = threading.Event()
+    rp.on_exhausted = stop.set
+
+    def _watch_end() -> None:
+        # 요청이 없는 구간(장외 대기 등)에서도 기록 끝을 지나면 종료
+        while not stop.wait(timeout=0.2):
+            if Clock.time() - rp.start > rp.end_t:
+                stop.set()
+
+    threading.Thread(target=_watch_end, name="ReplayWatch", daemon=True).start()
+
+    walls: List[float] = []
+    os.chdir(workdir)
+    try:
+        trader    = at.AutoTrader(stop_event=stop, config_path=str(replay_cfg))
+        loop_once = trader.loop_once
+
+        def _timed_loop_once() -> None:
+            t0 = time.perf_counter()
+            try:
+                loop_once()
+            finally:
+                walls.append(time.perf_counter() - t0)
+
+        trader.loop_once = _timed_loop_once
+        trader.run()
+    finally:
+        os.chdir(cwd)
+        uninstall()
+        Clock.set_clock(Clock.SystemClock())
+
+    report = {
+        "record":   str(path),
+        "speed":    speed,
+        "ticks":    len(walls),
+        "served":   rp.served,
+        "total":    rp.total,
+        "misses":   sum(rp.misses.values()),
+        "mean":     statistics.fmean(walls) if walls else 0.0,
+        "median":   statistics.median(walls) if walls else 0.0,
+        "max":      max(walls) if walls else 0.0,
+        "walls":    walls,
+    }
+    print(f"⏱️ 재생 완료: {report['ticks']}틱, 응답 {rp.served}/{rp.total}건 사용, 누락 {report['misses']}건")
+    print(f"   틱당 소요 시간 mean={report['mean']:.3f}s median={report['median']:.3f}s max={report['max']:.3f}s")
+    if report_path:
+        Path(report_path).write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap  = argparse.ArgumentParser(description="외부 I/O 기록·재생")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    r = sub.add_parser("record", help="AutoTrader 실행 + 모든 HTTP 요청·응답 기록")
+    r.add_argument("--out", default="logs/session.rec.gz")
+    r.add_argument("--config", default="config.yaml")
+
+    p = sub.add_parser("replay", help="기록 파일을 가상 시계로 재생")
+    p.add_argument("path")
+    p.add_argument("--speed", type=float, default=60.0, help="가상 시계 배속 (기본 60배)")
+    p.add_argument("--config", default="config.yaml")
+    p.add_argument("--latency", action="store_true", help="기록된 응답 지연을 배속 비율로 재현")
+    p.add_argument("--workdir", help="재생 중 생성 파일 폴더 (기본: 임시 폴더)")
+    p.add_argument("--report", help="틱별 소요 시간 JSON 저장 경로 (버전 간 비교용)")
+
+    args = ap.parse_args()
+    if args.cmd == "record":
+        record(args.out, args.config)
+    else:
+        replay(args.path, speed=args.speed, config_path=args.config,
+               simulate_latency=args.latency, workdir=args.workdir, report_path=args.report)
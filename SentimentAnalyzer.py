@@ -1,44 +1,68 @@
 import os
 import glob
+import threading
 from pathlib import Path
 from typing import List
 
-import pandas as pd
-import torch
 from zoneinfo import ZoneInfo
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+import Metrics
+from Strategy import sentiment_from_predictions
 
 # ─────────────── 설정 ────────────────
-MODEL_PATH = "./learning_parameters"
+MODEL_PATH = str(Path(__file__).resolve().parent / "learning_parameters")   # 작업 폴더와 무관
 DATA_DIR   = "news"
 OUT_DIR    = "sentiment"
 BATCH_SIZE = 64
 MAX_LENGTH = 128
 ET         = ZoneInfo("US/Eastern")
 
-# 디바이스 설정 (GPU 없으면 CPU)
-DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
 # 레이블 매핑
 label_map = {0: "negative", 1: "neutral", 2: "positive"}
 
-# ─────────── 모델·토크나이저 로드 ───────────
-tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH, use_fast=True)
-model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
-model.to(DEVICE).eval()
-if DEVICE.type == "cuda":
-    model.half()  # FP16 모드
+# ─────────── 모델·토크나이저 로드 (처음 추론할 때 한 번) ───────────
+# torch·transformers 는 import 만 수 초 · 수백 MB → 이 모듈을 불러오는 것만으로는 로드하지 않음
+_MODEL = None                 # (tokenizer, model, device)
+_LOAD_LOCK = threading.Lock()
+
+# 여러 스레드가 동시에 추론하지 않도록 직렬화 (모델 내부 연산은 이미 병렬)
+_INFER_LOCK = threading.Lock()
+
+def load_model():
+    """(tokenizer, model, device) — 처음 호출 시 torch·transformers import 후 MODEL_PATH 로드 (GPU 없으면 CPU)"""
+    global _MODEL
+    if _MODEL is not None:
+        return _MODEL
+    with _LOAD_LOCK:
+        if _MODEL is None:
+            with Metrics.timer("model.load"):
+                import torch
+                from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+                device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+                tokenizer = AutoTokenizer.from_pretrained(MODEL_PATH, use_fast=True)
+                model = AutoModelForSequenceClassification.from_pretrained(MODEL_PATH)
+                model.to(device).eval()
+                if device.type == "cuda":
+                    model.half()  # FP16 모드
+                _MODEL = (tokenizer, model, device)
+    return _MODEL
 
-@torch.no_grad()
 def _predict_batch(texts: List[str]) -> List[int]:
-    enc = tokenizer(
-        texts,
-        return_tensors="pt",
-        padding=True,
-        truncation=True,
-        max_length=MAX_LENGTH
-    ).to(DEVICE)
-    logits = model(**enc).logits
+    import torch
+
+    tokenizer, model, device = load_model()
+    with Metrics.timer("tokenize"):
+        enc = tokenizer(
+            texts,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=MAX_LENGTH
+        ).to(device)
+    with _INFER_LOCK, Metrics.timer("inference"), torch.no_grad():
+        logits = model(**enc).logits
+    Metrics.inc("inference_titles_total", len(texts))
     return logits.argmax(dim=-1).cpu().tolist()
 
 def get_sentiment_analysis(
@@ -52,11 +76,7 @@ def get_sentiment_analysis(
     if not os.path.isdir(data_dir):
         raise FileNotFoundError(f"Data directory not found: {data_dir}")
 
-    Path(out_dir).mkdir(exist_ok=True)
-    # 이전 결과 파일 삭제
-    for f in os.listdir(out_dir):
-        if f.lower().endswith(".csv"):
-            os.remove(os.path.join(out_dir, f))
+    reset_out_dir(out_dir)
 
     csv_paths = glob.glob(os.path.join(data_dir, "*.csv"))
     if not csv_paths:
@@ -64,25 +84,45 @@ def get_sentiment_analysis(
         return
 
     for csv_path in csv_paths:
-        df = pd.read_csv(csv_path)
-        if "title" not in df.columns:
-            print(f"⚠️ 'title' column not found in {csv_path}, skipping.")
-            continue
+        analyze_file(csv_path, out_dir, batch_size)
+
+def reset_out_dir(out_dir: str = OUT_DIR) -> None:
+    """out_dir 생성 후 이전 결과 파일 삭제"""
+    Path(out_dir).mkdir(exist_ok=True)
+    for f in os.listdir(out_dir):
+        if f.lower().endswith(".csv"):
+            os.remove(os.path.join(out_dir, f))
+
+def analyze_file(
+    csv_path: str,
+    out_dir: str = OUT_DIR,
+    batch_size: int = BATCH_SIZE
+) -> List[int]:
+    """
+    뉴스 CSV 하나 → out_dir/*_sentiment.csv 저장 후 예측 클래스 리스트 반환
+    """
+    import pandas as pd
+
+    df = pd.read_csv(csv_path)
+    if "title" not in df.columns:
+        print(f"⚠️ 'title' column not found in {csv_path}, skipping.")
+        return []
 
-        titles = df["title"].fillna("").tolist()
-        preds: List[int] = []
-        for i in range(0, len(titles), batch_size):
-            batch = titles[i : i + batch_size]
-            preds.extend(_predict_batch(batch))
+    titles = df["title"].fillna("").tolist()
+    preds: List[int] = []
+    for i in range(0, len(titles), batch_size):
+        batch = titles[i : i + batch_size]
+        preds.extend(_predict_batch(batch))
 
-        df["predicted_class"] = preds
-        df["label_name"]      = df["predicted_class"].map(label_map)
+    df["predicted_class"] = preds
+    df["label_name"]      = df["predicted_class"].map(label_map)
 
-        out_file = Path(out_dir) / f"{Path(csv_path).stem}_sentiment.csv"
-        cols = [c for c in ["site", "title", "time", "predicted_class", "label_name"] if c in df.columns]
-        df.to_csv(out_file, index=False, columns=cols, encoding="utf-8-sig")
+    out_file = Path(out_dir) / f"{Path(csv_path).stem}_sentiment.csv"
+    cols = [c for c in ["site", "title", "time", "predicted_class", "label_name"] if c in df.columns]
+    df.to_csv(out_file, index=False, columns=cols, encoding="utf-8-sig")
 
-        print(f"✅ Processed {Path(csv_path).name} → {out_file.name} ({len(df)} rows)")
+    print(f"✅ Processed {Path(csv_path).name} → {out_file.name} ({len(df)} rows)")
+    return preds
 
 def SentimentAnalyzer(csv_path: str) -> int:
     """
@@ -92,6 +132,8 @@ def SentimentAnalyzer(csv_path: str) -> int:
     if not os.path.isfile(csv_path):
         raise FileNotFoundError(f"CSV file not found: {csv_path}")
 
+    import pandas as pd
+
     df = pd.read_csv(csv_path)
     if "title" not in df.columns or df.empty:
         return 0
@@ -102,19 +144,7 @@ def SentimentAnalyzer(csv_path: str) -> int:
         batch = titles[i : i + BATCH_SIZE]
         preds.extend(_predict_batch(batch))
 
-    filtered = [p for p in preds if p != 1]
-    if not filtered:
-        return 0
-
-    total = len(filtered)
-    pos = sum(1 for p in filtered if p == 2)
-    neg = sum(1 for p in filtered if p == 0)
-
-    if pos >= (2/3) * total:
-        return 1
-    if neg >= (2/3) * total:
-        return -1
-    return 0
+    return sentiment_from_predictions(preds)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,329 @@
+from __future__ import annotations
+import multiprocessing as mp
+import queue
+import threading
+import time
+from concurrent import futures
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+import Clock
+import Metrics
+from AutoTrader import (
+    DEFAULT_BAR_STORE, DEFAULT_NEWS_RATE_PER_SEC, DEFAULT_NEWS_REFRESH_SEC, ET, AutoTrader, load_config,
+)
+from Bars import MinuteBars
+from DataPlane import DataPlane
+from Deadline import TickDeadline
+from MarketBus import MarketBus
+
+# ───── 기본 설정값 (config.yaml에서 재정의 가능) ───────
+DEFAULT_SHARD_WORKERS = 0              # >0 이면 종목을 N개 프로세스로 나눠 감정 추론·점수·판단 (0: 한 프로세스)
+DEFAULT_MAX_POSITIONS = 0              # 샤드 모드 전체 보유 종목 수 상한 (0: 제한 없음)
+SHARD_POLL_SEC        = 1.0            # 워커 결과 대기 중 생존 확인 주기
+SHARD_STOP_SEC        = 5.0            # 종료 시 워커가 스스로 끝나길 기다리는 시간 (넘기면 terminate)
+SHARD_REPLY_SEC       = 0.2            # 감정 마감 전에 남겨 두는 점수 계산·결과 전달 시간
+
+
+def shard_symbols(symbols: List[str], n: int) -> List[List[str]]:
+    """종목을 n 개 샤드로 고르게 (순서대로 번갈아 배정, 빈 샤드 없음)"""
+    n = max(1, min(n, len(symbols)))
+    return [symbols[i::n] for i in range(n)]
+
+
+def _shard_main(
+    wid: int,
+    shard: List[str],
+    symbols: List[str],
+    bus_name: str,
+    cfg: Dict,
+    n_shards: int,
+    inbox,
+    outbox,
+) -> None:
+    """
+    샤드 워커 프로세스
+    • ("tick", t)                → 담당 종목 뉴스 크롤링·감정 추론 시작 (DataPlane, 캐시·진행 중 조회 재사용)
+    • ("bars", t, 보유, 마감)   → 감정 결과(마감 초과 시 직전 값) + 버스 분봉 view 로 점수·판단 → ("result", …)
+      마감은 벽시계 시각 (메시지가 늦게 도착해도 코디네이터 틱 마감에 맞춤)
+    • ("config", cfg)            → 매매 설정 다시 적용 / ("stop",) → 종료
+    """
+    import signal
+    from Backtester import strategy_from_config
+
+    signal.signal(signal.SIGINT, signal.SIG_IGN)        # Ctrl+C 는 코디네이터가 받아 stop 메시지로 정리
+    bus   = MarketBus.attach(bus_name, symbols)
+    plane = DataPlane(None, workers=min(32, len(shard) + 1))
+
+    def configure(c: Dict):
+        plane.configure(
+            c.get("NEWS_REFRESH_SEC", DEFAULT_NEWS_REFRESH_SEC),
+            c.get("NEWS_RATE_PER_SEC", DEFAULT_NEWS_RATE_PER_SEC) / n_shards,   # 워커 합계 = 설정값
+            headline_keys=False,
+        )
+        return strategy_from_config(c)
+
+    strategy = configure(cfg)
+    f_sent: Dict[str, futures.Future] = {}
+    try:
+        while True:
+            msg = inbox.get()
+            if msg[0] == "stop":
+                break
+            if msg[0] == "config":
+                strategy = configure(msg[1])
+            elif msg[0] == "tick":
+                plane.begin_tick(reset_files=False)
+                f_sent = {sym: plane.sentiment(sym) for sym in shard}
+            elif msg[0] == "bars":
+                _, tick, holdings, due = msg
+                rows, degraded, error = [], [], ""
+                try:
+                    sentiments: Dict[str, int] = {}
+                    for sym in holdings:
+                        try:
+                            left = None if due is None else max(0.0, due - time.time())
+                            sentiments[sym] = f_sent[sym].result(timeout=left)
+                        except futures.TimeoutError:
+                            sentiments[sym] = plane.cached_sentiment(sym)
+                            degraded.append(sym)
+                        bus.publish_sentiment(sym, sentiments[sym], tick)
+
+                    bars_map = {sym: bus.read_bars(sym)[1] for sym in holdings}
+                    scores   = strategy.compute_scores_all(
+                        sentiments=sentiments, bars_map=bars_map, symbols=list(bars_map)
+                    )
+                    rows = [
+                        (sym, dict(scores[sym]),
+                         strategy.decide_trade(scores[sym]["total"], holdings[sym]))
+                        for sym in bars_map
+                    ]
+                    del bars_map                            # 버스 view 는 이 틱 안에서만
+                except Exception as e:
+                    error = f"{type(e).__name__}: {e}"
+                outbox.put(("result", wid, tick, rows, degraded, error))
+    finally:
+        plane.close()
+        bus.close()
+
+
+class ShardedTrader(AutoTrader):
+    """
+    SHARD_WORKERS 개 프로세스에 종목을 나눠 감정 추론·점수·판단을 돌리는 AutoTrader (GIL 밖에서 코어 여러 개 사용)
+    • 코디네이터(이 프로세스): KIS API 전부 (분봉·환율·잔고·보유 종목·주문) → 요청 제한기 하나로 계정 한도 유지
+      - 분봉은 종목별로 한 번 받아 MarketBus(공유 메모리)에 게시
+      - 워커 판단을 받아 이번 틱 남은 현금·보유 종목 수(MAX_POSITIONS) 안에서만 매수, 기록·알림·차트도 여기서만
+    • 워커: 담당 종목 뉴스 크롤링·파싱·감정 추론 → 버스 분봉을 복사 없이 읽어 점수·판단 → 결과만 코디네이터로
+    • 워커가 죽으면 다음 틱 전에 다시 띄움 (그 틱의 담당 종목은 판단 생략)
+    • UNIVERSE_MODE · EVENT_MODE · STREAMING_INDICATORS 와 함께 쓸 수 없음 (틱마다 전 종목 일괄 계산)
+    """
+
+    def __init__(
+        self,
+        *,
+        stop_event: threading.Event,
+        config_path: str = "config.yaml",
+        warm: Optional[AutoTrader] = None,
+    ) -> None:
+        cfg = load_config(config_path)
+        mixed = [k for k in ("UNIVERSE_MODE", "EVENT_MODE", "STREAMING_INDICATORS", "STRATEGIES") if cfg.get(k)]
+        if mixed:
+            raise ValueError(f"SHARD_WORKERS 는 {', '.join(mixed)} 와 함께 쓸 수 없습니다")
+
+        super().__init__(stop_event=stop_event, config_path=config_path, warm=warm, config=cfg)
+        self.shards  = shard_symbols(self.symbols, cfg.get("SHARD_WORKERS", DEFAULT_SHARD_WORKERS))
+        self._ctx    = mp.get_context("spawn")          # 부모의 스레드·잠금 상태를 물려받지 않도록
+        self._inboxes: List = [None] * len(self.shards)
+        self._procs:   List = [None] * len(self.shards)
+        self._outbox = None
+        self._tick   = 0
+        self._spent  = 0.0
+        self._bought: Set[str] = set()
+        self._released = False
+        self._closed   = False
+        self.bus = MarketBus.create(self.symbols)
+        try:
+            self._outbox = self._ctx.Queue()
+            for i in range(len(self.shards)):
+                self._spawn(i)
+        except BaseException:                           # 생성 실패 → 띄운 워커·공유 메모리 정리 후 그대로 예외
+            self._release_processes()
+            raise
+
+    def _make_plane(self, cfg: Dict) -> DataPlane:
+        """분봉·환율 조회만 (감정 추론은 워커) → 모델 미리 로드 없음"""
+        return DataPlane(
+            self.bot,
+            workers=self.pipeline_workers or min(32, len(self.symbols) + 2),
+            store_dir=cfg.get("BAR_STORE", DEFAULT_BAR_STORE),
+            preload_model=False,
+        )
+
+    def _apply_settings(self, cfg: Dict) -> None:
+        super()._apply_settings(cfg)
+        self.max_positions = cfg.get("MAX_POSITIONS", DEFAULT_MAX_POSITIONS)
+        for inbox in getattr(self, "_inboxes", ()):
+            if inbox is not None:
+                inbox.put(("config", cfg))
+
+    # ─── 워커 ─────────────────────────────────────────
+    def _release_processes(self) -> None:
+        """워커 종료 (stop → 대기 → terminate) · 대기열 닫기 · 공유 메모리 삭제 (여러 번 불러도 한 번만)"""
+        if self._released:
+            return
+        self._released = True
+        for inbox in self._inboxes:
+            if inbox is not None:
+                inbox.put(("stop",))
+        for p in self._procs:
+            if p is not None:
+                p.join(SHARD_STOP_SEC)
+                if p.is_alive():
+                    p.terminate()
+        for q in (*self._inboxes, self._outbox):
+            if q is not None:
+                q.close()
+        self.bus.close()
+
+    def _spawn(self, i: int) -> None:
+        if self._inboxes[i] is not None:
+            self._inboxes[i].close()                    # 죽은 워커의 대기열
+        self._inboxes[i] = self._ctx.Queue()
+        self._procs[i]   = self._ctx.Process(
+            target=_shard_main,
+            args=(i, self.shards[i], self.symbols, self.bus.name, self.cfg, len(self.shards),
+                  self._inboxes[i], self._outbox),
+            name=f"shard-{i}",
+            daemon=True,
+        )
+        self._procs[i].start()
+
+    def _ensure_workers(self) -> None:
+        for i, p in enumerate(self._procs):
+            if not p.is_alive():
+                Metrics.inc("shard_restarts_total")
+                print(f"⚠️ 샤드 {i} 워커 종료 (exit {p.exitcode}) → 다시 시작")
+                self._spawn(i)
+
+    def _collect(self) -> Iterator[Tuple[str, Dict[str, int], str]]:
+        """이번 틱 워커 결과 (sym, 점수, 판단) — 틱 마감 또는 워커 종료 시 남은 샤드는 생략"""
+        dl      = self.deadline
+        waiting = set(range(len(self.shards)))
+        while waiting:
+            left = dl.remaining()
+            try:
+                msg = self._outbox.get(timeout=SHARD_POLL_SEC if left is None else min(SHARD_POLL_SEC, left))
+            except queue.Empty:
+                dead = {i for i in waiting if not self._procs[i].is_alive()}
+                if dl.expired():
+                    dead = set(waiting)
+                for i in dead:
+                    waiting.discard(i)
+                    Metrics.inc("shard_failures_total")
+                    for sym in self.shards[i]:
+                        dl.mark("sentiment", sym)
+                continue
+            _, wid, tick, rows, degraded, error = msg
+            if tick != self._tick:
+                continue                                # 예산을 넘겨 늦게 온 이전 틱 결과
+            waiting.discard(wid)
+            if error:
+                Metrics.inc("shard_failures_total")
+                print(f"⚠️ 샤드 {wid} 판단 실패: {error}")
+            for sym in degraded:
+                dl.mark("sentiment", sym)
+            yield from rows
+
+    # ─── 루프 한 번 ────────────────────────────────────
+    def loop_once(self) -> None:
+        if self._idle(Clock.now(ET)):
+            return
+
+        # 1) 워커는 바로 뉴스·감정, 코디네이터는 계좌·보유 종목·분봉 조회
+        tick_start = Clock.time()
+        dl = self.deadline = TickDeadline(tick_start, self.tick_deadline_sec, self.stage_budgets)
+        self._tick_cash, self._spent, self._bought = None, 0.0, set()
+        self._notify(f"🤖 NewsCrawler / SentimentAnalyzer 작동하는 중... (샤드 {len(self.shards)}개)")
+        # 직전 틱에 감정 마감을 넘긴 종목이 있으면 워커 조회가 아직 진행 중일 수 있음 → 뉴스·감정 폴더 초기화 미룸
+        self.plane.begin_tick(reset_files=not self.last_degraded.get("sentiment"))
+        self._ensure_workers()
+        self._tick += 1
+        for inbox in self._inboxes:
+            inbox.put(("tick", self._tick))
+
+        f_fx   = self.plane.fx()
+        f_cash = self._submit("account", self._fetch_cash_usd, f_fx)
+        f_hold = self._submit("holdings", self._fetch_holdings)
+        f_bars = {sym: self.plane.bars(sym) for sym in self.symbols}
+
+        # 2) 분봉을 받는 대로 버스에 게시 (예산 초과 시 직전 분봉, 그것도 없으면 그 종목 판단 생략)
+        bars_map: Dict[str, MinuteBars] = {}
+        pending = set(self.symbols)
+        while pending:
+            for sym in list(pending):
+                ok, bars = dl.settle("bars", f_bars[sym], self.plane.last_bars(sym), sym)
+                if not ok:
+                    continue
+                pending.discard(sym)
+                if bars is not None:
+                    bars_map[sym] = bars or MinuteBars.empty()
+                    self.bus.publish_bars(sym, bars_map[sym], self._tick)
+            if pending:
+                futures.wait(
+                    [f_bars[s] for s in pending],
+                    timeout=dl.next_due(("bars",)),
+                    return_when=futures.FIRST_COMPLETED,
+                )
+
+        # 3) 워커에 보유 수량·감정 마감 전달 → 판단을 받는 대로 한도 확인 후 주문
+        holdings = dl.result("holdings", f_hold, self._last_holdings)
+        left     = dl.remaining("sentiment")
+        due      = None if left is None else time.time() + max(0.0, left - SHARD_REPLY_SEC)
+        for shard, inbox in zip(self.shards, self._inboxes):
+            inbox.put(("bars", self._tick, {s: holdings.get(s, 0) for s in shard if s in bars_map}, due))
+
+        spent = 0.0
+        for sym, score_data, action in self._collect():
+            spent += self._execute(sym, score_data, action, bars_map[sym], holdings, f_cash)
+
+        if not dl.behind:
+            self.plane.store_bars(bars_map)
+        self._finish_tick(bars_map, holdings, f_cash, spent)
+
+    def _execute(
+        self,
+        sym: str,
+        score_data: Dict[str, int],
+        action: str,
+        bars: MinuteBars,
+        holdings: Dict[str, int],
+        f_cash: futures.Future,
+        trigger: str = "",
+    ) -> float:
+        """전체 한도 확인: 신규 매수는 보유 종목 수 MAX_POSITIONS 미만 · 이번 틱 남은 현금 안에서만"""
+        if action == "buy" and holdings.get(sym, 0) == 0:
+            price = bars.latest_price
+            need  = self.strategy.buy_qty(price) * price
+            held  = sum(1 for q in holdings.values() if q > 0) + len(self._bought)
+            if self.max_positions and held >= self.max_positions:
+                Metrics.inc("shard_limit_skips_total")
+                self._notify(f"🚫 {sym} 매수 생략 : 보유 종목 수 한도 {self.max_positions}")
+                return 0.0
+            cash = self._cash(f_cash) - self._spent
+            if need > cash:
+                Metrics.inc("shard_limit_skips_total")
+                self._notify(f"🚫 {sym} 매수 생략 : 남은 현금 {cash:.2f} USD < {need:.2f} USD")
+                return 0.0
+
+        spent = super()._execute(sym, score_data, action, bars, holdings, f_cash, trigger)
+        if spent:
+            self._spent += spent
+            self._bought.add(sym)
+        return spent
+
+    def close(self) -> None:
+        """워커·공유 메모리 정리 후 기본 정리 (여러 번 불러도 한 번만)"""
+        if self._closed:
+            return
+        self._closed = True
+        self._release_processes()
+        super().close()
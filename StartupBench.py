@@ -0,0 +1,118 @@
+from __future__ import annotations
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+ENTRY_POINTS = ("main", "AutoTrader", "NewsCrawler", "TradeLogger")
+# 시작할 때 불러오면 안 되는 무거운 패키지 (해당 기능을 처음 쓸 때 함수 안에서 import)
+HEAVY_MODULES = ("torch", "transformers", "matplotlib", "pandas", "bs4")
+# 진입점별 예산: (import 시간 초, 최대 RSS MB) — 인터프리터 자체 시작 시간·메모리 포함
+DEFAULT_BUDGETS: Dict[str, Tuple[float, float]] = {
+    "main":        (0.6, 60.0),
+    "AutoTrader":  (0.6, 60.0),
+    "NewsCrawler": (0.3, 45.0),
+    "TradeLogger": (0.3, 45.0),
+}
+DEFAULT_REPEAT = 3                      # 진입점마다 새 프로세스로 N번 측정, 가장 빠른 값 사용
+
+# 새 인터프리터에서 진입점 모듈 하나를 import 하고 시간·RSS·불러온 무거운 패키지를 JSON 으로 출력
+# (main 은 __main__ 에서만 BOT 을 만들므로 TradingBot 생성은 측정 밖, 측정 직후 os._exit 로 백그라운드 스레드 무시)
+_PROBE = """
+import time
+t0 = time.perf_counter()
+import importlib, json, os, sys
+err = ""
+try:
+    importlib.import_module({entry!r})
+except BaseException as e:
+    err = f"{{type(e).__name__}}: {{e}}"
+sec = time.perf_counter() - t0
+try:
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+except ImportError:
+    rss = None
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"sec": sec, "rss_mb": rss, "heavy": heavy, "error": err}}))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+
+def measure(entry: str, cwd: str | Path = ".", repeat: int = DEFAULT_REPEAT) -> Dict:
+    """진입점 import 를 새 프로세스에서 repeat 번 측정 → 가장 빠른 시간 · 최대 RSS · 불러온 무거운 패키지"""
+    runs: List[Dict] = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(entry=entry, heavy=HEAVY_MODULES)],
+            cwd=cwd, capture_output=True, text=True, env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        )
+        line = out.stdout.strip().splitlines()[-1] if out.stdout.strip() else ""
+        try:
+            runs.append(json.loads(line))
+        except ValueError:
+            runs.append({"sec": 0.0, "rss_mb": None, "heavy": [], "error": out.stderr.strip()[-300:] or "출력 없음"})
+    rss = [r["rss_mb"] for r in runs if r["rss_mb"] is not None]
+    return {
+        "entry":  entry,
+        "sec":    min(r["sec"] for r in runs),
+        "rss_mb": max(rss) if rss else None,
+        "heavy":  sorted({m for r in runs for m in r["heavy"]}),
+        "error":  next((r["error"] for r in runs if r["error"]), ""),
+    }
+
+
+def check(result: Dict, budget: Optional[Tuple[float, float]]) -> List[str]:
+    """예산·무거운 패키지·import 오류 위반 목록 (빈 목록이면 통과)"""
+    problems = []
+    if result["error"]:
+        problems.append(f"import 실패 ({result['error']})")
+    if result["heavy"]:
+        problems.append(f"시작 시 불러옴: {', '.join(result['heavy'])}")
+    if budget is not None:
+        sec, rss = budget
+        if result["sec"] > sec:
+            problems.append(f"import {result['sec']:.2f}s > {sec:.2f}s")
+        if result["rss_mb"] is not None and result["rss_mb"] > rss:
+            problems.append(f"RSS {result['rss_mb']:.0f}MB > {rss:.0f}MB")
+    return problems
+
+
+def format_table(results: List[Dict], problems: Dict[str, List[str]]) -> str:
+    lines = [f"{'entry':12s} {'import':>8s} {'RSS':>8s}  결과"]
+    for r in results:
+        rss = f"{r['rss_mb']:.0f}MB" if r["rss_mb"] is not None else "-"
+        bad = problems[r["entry"]]
+        lines.append(f"{r['entry']:12s} {r['sec']:7.3f}s {rss:>8s}  {'❌ ' + ' · '.join(bad) if bad else '✅'}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="진입점별 import 시간·RSS 측정, 예산 초과 시 종료 코드 1")
+    ap.add_argument("entries", nargs="*", default=list(ENTRY_POINTS))
+    ap.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    ap.add_argument("--budget", action="append", default=[], metavar="ENTRY=SEC,MB",
+                    help="예산 재정의 (예: --budget main=1.5,120)")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    budgets = dict(DEFAULT_BUDGETS)
+    for spec in args.budget:
+        name, vals = spec.split("=", 1)
+        sec, mb = vals.split(",")
+        budgets[name] = (float(sec), float(mb))
+
+    here     = Path(__file__).resolve().parent
+    results  = [measure(e, here, args.repeat) for e in args.entries]
+    problems = {r["entry"]: check(r, budgets.get(r["entry"])) for r in results}
+    if args.json:
+        print(json.dumps({"results": results, "problems": problems}, indent=2, ensure_ascii=False))
+    else:
+        print(format_table(results, problems))
+    sys.exit(1 if any(problems.values()) else 0)
@@ -0,0 +1,102 @@
+from __future__ import annotations
+from typing import Dict, List, Mapping, Optional, Sequence, Union
+
+from Bars import MinuteBars
+from Indicators import SCORE_WEIGHTS, score_symbols
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+BUY_THRESHOLD  = 1.0
+SELL_THRESHOLD = -1.0
+
+
+def sentiment_from_predictions(preds: Sequence[int]) -> int:
+    """
+    뉴스 예측 클래스(0: negative, 1: neutral, 2: positive) → 종목 감정 점수
+    neutral 제외 후 2/3 이상 positive면 +1, 2/3 이상 negative면 -1, 그 외 0
+    """
+    filtered = [p for p in preds if p != 1]
+    if not filtered:
+        return 0
+
+    total = len(filtered)
+    pos = sum(1 for p in filtered if p == 2)
+    neg = sum(1 for p in filtered if p == 0)
+
+    if pos >= (2/3) * total:
+        return 1
+    if neg >= (2/3) * total:
+        return -1
+    return 0
+
+
+class Strategy:
+    """
+    S/M/R 점수 계산 + 매수·매도 판단 (네트워크·모델 의존성 없음)
+    • AutoTrader 실거래 루프와 Backtester 가 같은 코드를 사용
+    """
+
+    def __init__(
+        self,
+        *,
+        buy_unit_usd: float,
+        momentum_bars: int,
+        rsi_period: int,
+        rsi_mode: str = "simple",
+        weights: Optional[Mapping[str, float]] = None,
+        buy_threshold: float = BUY_THRESHOLD,
+        sell_threshold: float = SELL_THRESHOLD,
+    ) -> None:
+        self.buy_unit_usd   = buy_unit_usd
+        self.momentum_bars  = momentum_bars
+        self.rsi_period     = rsi_period
+        self.rsi_mode       = rsi_mode
+        self.weights        = {**SCORE_WEIGHTS, **(weights or {})}
+        self.buy_threshold  = buy_threshold
+        self.sell_threshold = sell_threshold
+
+    # ─── 4-Factor 스코어 계산 ───────────────────────────
+    def compute_scores(
+        self,
+        *,
+        sym: str,
+        sentiment: int,
+        price_bars: Union[MinuteBars, List[Dict]],
+    ) -> Dict[str, int]:
+        if not isinstance(price_bars, MinuteBars):
+            price_bars = MinuteBars.from_dicts(price_bars)
+        return self.compute_scores_all(
+            sentiments={sym: sentiment},
+            bars_map={sym: price_bars},
+            symbols=[sym],
+        )[sym]
+
+    def compute_scores_all(
+        self,
+        *,
+        sentiments: Mapping[str, int],
+        bars_map: Mapping[str, MinuteBars],
+        symbols: List[str],
+    ) -> Dict[str, Dict[str, int]]:
+        return score_symbols(
+            bars_map,
+            sentiments,
+            symbols,
+            momentum_bars=self.momentum_bars,
+            rsi_period=self.rsi_period,
+            rsi_mode=self.rsi_mode,
+            weights=self.weights,
+        )
+
+    # ─── 매매 결정 ─────────────────────────────────────
+    def decide_trade(self, total: float, holdings: int) -> str:
+        if total >= self.buy_threshold:
+            return "buy"
+        if total <= self.sell_threshold and holdings > 0:
+            return "sell"
+        return "hold"
+
+    def buy_qty(self, price: float) -> int:
+        """1회 매수 한도(buy_unit_usd) 안에서 살 수 있는 정수 주식 수"""
+        if price <= 0:
+            return 0
+        return int(self.buy_unit_usd / price)
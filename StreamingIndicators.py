@@ -0,0 +1,246 @@
+from __future__ import annotations
+import statistics
+from collections import deque
+from typing import Deque, Dict, List, Mapping, Optional
+
+from Bars import MinuteBars
+from Indicators import RSI_EPS, RSI_HIGH, RSI_LOW, RSI_MODES, SCORE_WEIGHTS
+
+# 누적 합의 부동소수 오차가 쌓이지 않도록 N회 갱신마다 윈도우에서 합을 다시 계산
+RESUM_EVERY = 1024
+_SUM_TOL    = 64 * 2.220446049250313e-16
+
+
+class RollingSum:
+    """고정 길이 윈도우의 O(1) 누적 합 (마지막 값 수정 지원)"""
+
+    def __init__(self, window: int) -> None:
+        self.window  = window
+        self.values: Deque[float] = deque(maxlen=window)
+        self.total   = 0.0
+        self._ops    = 0
+
+    def append(self, x: float) -> None:
+        if len(self.values) == self.window:
+            self.total -= self.values[0]
+        self.values.append(x)
+        self.total += x
+        self._tick()
+
+    def revise_last(self, x: float) -> None:
+        if not self.values:
+            self.append(x)
+            return
+        self.total += x - self.values[-1]
+        self.values[-1] = x
+        self._tick()
+
+    def _tick(self) -> None:
+        self._ops += 1
+        if self._ops >= RESUM_EVERY:
+            self.total = sum(self.values)
+            self._ops  = 0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.window
+
+
+class MomentumStream:
+    """최근 n봉 평균 vs 직전 n봉 평균 (+1 / 0 / -1), 봉 추가·수정 O(1)"""
+
+    def __init__(self, bars: int) -> None:
+        self.n      = bars
+        self.closes: Deque[float] = deque(maxlen=bars * 2)
+        self.recent = RollingSum(bars)
+        self.prev   = RollingSum(bars)
+
+    def append(self, close: float) -> None:
+        if self.recent.full:
+            self.prev.append(self.recent.values[0])
+        self.closes.append(close)
+        self.recent.append(close)
+
+    def revise_last(self, close: float) -> None:
+        if self.closes:
+            self.closes[-1] = close
+        self.recent.revise_last(close)
+
+    def signal(self) -> int:
+        if self.n <= 0 or len(self.closes) < self.n * 2:
+            return 0
+        a, b  = self.recent.total, self.prev.total
+        scale = max(abs(a), abs(b))
+        if abs(a - b) <= _SUM_TOL * self.n * scale:
+            # 거의 같은 경우만 정확한 평균으로 재판정 (Indicators.momentum_signal 과 동일 규칙)
+            c = list(self.closes)
+            a = statistics.mean(c[self.n :])
+            b = statistics.mean(c[: self.n])
+        return 1 if a > b else (-1 if a < b else 0)
+
+
+class RSIStream:
+    """
+    RSI 스트리밍 계산
+    • simple: 최근 period 개 변화량의 상승/하락 누적 합
+    • wilder: avg = (avg × (period-1) + x) / period, 마지막 봉 수정 시 직전 상태에서 재계산
+    • 변화량 부호는 Indicators.rsi_simple 과 같은 규칙 (직전 봉 − 최신 봉)
+    """
+
+    def __init__(self, period: int, mode: str = "simple") -> None:
+        if mode not in RSI_MODES:
+            raise ValueError(f"mode 는 {RSI_MODES} 중 하나여야 합니다: {mode}")
+        self.period = period
+        self.mode   = mode
+        self.prev_close: Optional[float] = None      # 마지막 봉 직전 종가
+        self.last_close: Optional[float] = None
+        self.count  = 0                              # 누적 변화량 개수
+        # simple
+        self.gains  = RollingSum(period)
+        self.losses = RollingSum(period)
+        # wilder (마지막 변화량 반영 전 상태 보관)
+        self.avg_gain = self.avg_loss = 0.0
+        self._before: tuple = (0.0, 0.0, 0)
+
+    @staticmethod
+    def _split(delta: float) -> tuple:
+        return (delta, 0.0) if delta > 0 else (0.0, -delta if delta < 0 else 0.0)
+
+    def _apply_wilder(self, g: float, l: float) -> None:
+        ag, al, cnt = self._before
+        cnt += 1
+        if cnt <= self.period:
+            ag, al = ag + g, al + l
+            if cnt == self.period:
+                ag, al = ag / self.period, al / self.period
+        else:
+            ag = (ag * (self.period - 1) + g) / self.period
+            al = (al * (self.period - 1) + l) / self.period
+        self.avg_gain, self.avg_loss, self.count = ag, al, cnt
+
+    def append(self, close: float) -> None:
+        if self.last_close is not None:
+            g, l = self._split(self.last_close - close)
+            if self.mode == "simple":
+                self.gains.append(g)
+                self.losses.append(l)
+                self.count += 1
+            else:
+                self._before = (self.avg_gain, self.avg_loss, self.count)
+                self._apply_wilder(g, l)
+        self.prev_close, self.last_close = self.last_close, close
+
+    def revise_last(self, close: float) -> None:
+        if self.prev_close is None:
+            self.last_close = close
+            return
+        g, l = self._split(self.prev_close - close)
+        if self.mode == "simple":
+            self.gains.revise_last(g)
+            self.losses.revise_last(l)
+        else:
+            self._apply_wilder(g, l)
+        self.last_close = close
+
+    def value(self) -> Optional[float]:
+        if self.count < self.period or self.period <= 0:
+            return None
+        if self.mode == "simple":
+            ag, al = self.gains.total / self.period, self.losses.total / self.period
+        else:
+            ag, al = self.avg_gain, self.avg_loss
+        return 100 - 100 / (1 + (ag / (al + RSI_EPS)))
+
+    def signal(self) -> int:
+        rsi = self.value()
+        if rsi is None:
+            return 0
+        return +1 if rsi < RSI_LOW else (-1 if rsi > RSI_HIGH else 0)
+
+
+class EMAStream:
+    """지수이동평균, 마지막 봉 수정 시 직전 EMA 에서 재계산"""
+
+    def __init__(self, span: int) -> None:
+        self.alpha = 2.0 / (span + 1)
+        self.value: Optional[float] = None
+        self._before: Optional[float] = None
+
+    def append(self, x: float) -> None:
+        self._before = self.value
+        self.value   = x if self._before is None else self._before + self.alpha * (x - self._before)
+
+    def revise_last(self, x: float) -> None:
+        self.value = x if self._before is None else self._before + self.alpha * (x - self._before)
+
+
+class SymbolStream:
+    """종목 하나의 스트리밍 지표 묶음 (봉 시각 기준으로 추가/수정 판별)"""
+
+    def __init__(self, momentum_bars: int, rsi_period: int, rsi_mode: str = "simple", ema_span: int = 20) -> None:
+        self.momentum = MomentumStream(momentum_bars)
+        self.rsi      = RSIStream(rsi_period, rsi_mode)
+        self.ema      = EMAStream(ema_span)
+        self.last_ts: Optional[int] = None
+
+    def update(self, ts: int, close: float) -> None:
+        """새 봉이면 추가, 같은 시각(형성 중인 봉)이면 수정, 과거 봉은 무시"""
+        if self.last_ts is None or ts > self.last_ts:
+            self.momentum.append(close)
+            self.rsi.append(close)
+            self.ema.append(close)
+            self.last_ts = ts
+        elif ts == self.last_ts:
+            self.momentum.revise_last(close)
+            self.rsi.revise_last(close)
+            self.ema.revise_last(close)
+
+    def score(self, sentiment: int, weights: Mapping[str, float] = SCORE_WEIGHTS) -> Dict[str, float]:
+        s, m, r = sentiment, self.momentum.signal(), self.rsi.signal()
+        return {"S": s, "M": m, "R": r, "total": s * weights["S"] + m * weights["M"] + r * weights["R"]}
+
+
+class StreamingScorer:
+    """
+    전 종목 스트리밍 점수기
+    • ingest() 는 마지막으로 본 봉 이후(수정된 마지막 봉 포함)만 반영 → 틱당 O(새 봉 수)
+    """
+
+    def __init__(self, symbols: List[str], *, momentum_bars: int, rsi_period: int, rsi_mode: str = "simple",
+                 weights: Optional[Mapping[str, float]] = None) -> None:
+        self.momentum_bars = momentum_bars
+        self.rsi_period    = rsi_period
+        self.rsi_mode      = rsi_mode
+        self.weights       = {**SCORE_WEIGHTS, **(weights or {})}
+        self.streams: Dict[str, SymbolStream] = {s: self._new() for s in symbols}
+
+    def _new(self) -> SymbolStream:
+        return SymbolStream(self.momentum_bars, self.rsi_period, self.rsi_mode)
+
+    def stream(self, sym: str) -> SymbolStream:
+        st = self.streams.get(sym)
+        if st is None:
+            st = self.streams[sym] = self._new()
+        return st
+
+    def ingest(self, sym: str, bars: MinuteBars) -> None:
+        if not bars:
+            return
+        st  = self.stream(sym)
+        ts  = bars.ts
+        cl  = bars.last
+        # 최신 봉이 index 0 → 마지막으로 본 봉 이상인 구간만 오래된 순으로 반영
+        n = len(ts) if st.last_ts is None else int((ts >= st.last_ts).sum())
+        for i in range(n - 1, -1, -1):
+            st.update(int(ts[i]), float(cl[i]))
+
+    def score(self, sym: str, sentiment: int, weights: Optional[Mapping[str, float]] = None) -> Dict[str, float]:
+        return self.stream(sym).score(sentiment, weights or self.weights)
+
+    def score_all(self, bars_map: Mapping[str, MinuteBars], sentiments: Mapping[str, int],
+                  symbols: List[str]) -> Dict[str, Dict[str, float]]:
+        for sym in symbols:
+            b = bars_map.get(sym)
+            if b:
+                self.ingest(sym, b)
+        return {sym: self.score(sym, sentiments.get(sym, 0)) for sym in symbols}
@@ -0,0 +1,164 @@
+from __future__ import annotations
+import os
+import threading
+import traceback
+from typing import Callable, List, Optional, Union
+
+import Clock
+import Metrics
+from AutoTrader import AutoTrader, load_config
+from Engine import StrategyEngine
+from Sharding import ShardedTrader
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_BACKOFF_BASE_SEC = 1          # 첫 재시작 대기 (이후 실패마다 ×2)
+DEFAULT_BACKOFF_MAX_SEC  = 300
+DEFAULT_HEALTHY_SEC      = 600        # 이만큼 정상 실행되면 연속 실패 횟수 초기화
+DEFAULT_RELOAD_POLL_SEC  = 5          # config.yaml 변경 확인 주기
+
+
+class Supervisor:
+    """
+    AutoTrader 워커(run 스레드) 감시 · 재시작 · 설정 즉시 반영
+    • 무거운 상태(TradingBot·토큰·HTTP 세션, TradeLogger 잔고, 뉴스·지표·이벤트 캐시)는
+      AutoTrader(warm=이전 인스턴스) 로 새 워커에 그대로 넘김 (FinBERT 모델은 프로세스 전역)
+    • 워커가 예외로 죽으면 지수 백오프(1s, 2s, 4s … 최대 BACKOFF_MAX_SEC) 후 바로 재시작
+    • config.yaml 변경 시 HOT_RELOAD_KEYS 만 바뀌었으면 실행 중인 워커에 즉시 반영,
+      그 밖의 키(종목·지표·모드 등)가 바뀌었으면 워커만 교체 (캐시 유지)
+    • config STRATEGIES 가 있으면 워커는 StrategyEngine (전략 여럿 + 공유 DataPlane), 감시 방식은 같음
+    """
+
+    def __init__(
+        self,
+        stop_event: threading.Event,
+        config_path: str = "config.yaml",
+        *,
+        backoff_base: float = DEFAULT_BACKOFF_BASE_SEC,
+        backoff_max: float = DEFAULT_BACKOFF_MAX_SEC,
+        healthy_sec: float = DEFAULT_HEALTHY_SEC,
+        reload_poll_sec: float = DEFAULT_RELOAD_POLL_SEC,
+        notify: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.stop_event      = stop_event
+        self.config_path     = config_path
+        self.backoff_base    = backoff_base
+        self.backoff_max     = backoff_max
+        self.healthy_sec     = healthy_sec
+        self.reload_poll_sec = reload_poll_sec
+        self.notify          = notify
+        self.trader: Optional[Union[AutoTrader, StrategyEngine]] = None
+        self.failures   = 0
+        self.restarts   = 0
+        self.last_error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+        self._mtime     = self._config_mtime()
+
+    # ─── 워커 ─────────────────────────────────────────
+    def _build(self) -> Union[AutoTrader, StrategyEngine]:
+        """
+        새 워커 (STRATEGIES 가 있으면 StrategyEngine, SHARD_WORKERS > 0 이면 ShardedTrader, 아니면 AutoTrader)
+        같은 종류의 이전 인스턴스가 있으면 상태 인계
+        """
+        cfg = load_config(self.config_path)
+        cls = StrategyEngine if cfg.get("STRATEGIES") else ShardedTrader if cfg.get("SHARD_WORKERS") else AutoTrader
+        return cls(
+            stop_event=threading.Event(),
+            config_path=self.config_path,
+            warm=self.trader if isinstance(self.trader, cls) else None,
+        )
+
+    def _work(self, trader: Union[AutoTrader, StrategyEngine]) -> None:
+        try:
+            trader.run()
+        except BaseException as e:                       # 워커 스레드 밖으로 나가지 않게 기록만
+            self.last_error = e
+            traceback.print_exc()
+
+    def _spawn(self) -> None:
+        """워커 생성·시작 (생성 실패도 워커 종료와 똑같이 백오프 후 재시도)"""
+        self.last_error = None
+        self._started   = Clock.time()
+        try:
+            self.trader = self._build()
+        except Exception as e:
+            self.last_error, self._thread = e, None
+            traceback.print_exc()
+            return
+        self._thread = threading.Thread(target=self._work, args=(self.trader,), name="AutoTrader", daemon=True)
+        self._thread.start()
+
+    def _stop_worker(self) -> None:
+        if self.trader is not None:
+            self.trader.stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _send(self, msg: str) -> None:
+        send = self.notify or (self.trader.bot.send_message if self.trader else None)
+        if send:
+            send(msg)
+
+    # ─── 설정 변경 감시 ────────────────────────────────
+    def _config_mtime(self) -> float:
+        try:
+            return os.stat(self.config_path).st_mtime
+        except OSError:
+            return 0.0
+
+    def _check_config(self) -> None:
+        mtime = self._config_mtime()
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        try:
+            cfg = load_config(self.config_path)
+        except Exception as e:                           # 저장 도중이거나 YAML 오류 → 다음 확인 때 재시도
+            self._mtime = 0.0
+            self._send(f"⚠️ config.yaml 읽기 실패, 기존 설정 유지: {e}")
+            return
+
+        cold: List[str] = self.trader.cold_changes(cfg)
+        if not cold:
+            try:
+                hot = self.trader.reload_config(cfg)
+            except Exception as e:                       # 잘못된 값 → 워커는 기존 설정 그대로, 파일이 다시 바뀔 때 재시도
+                self._send(f"⚠️ config.yaml 설정 오류, 기존 설정 유지: {e}")
+                return
+            if hot:
+                Metrics.inc("config_reloads_total")
+                self._send(f"🔄 설정 즉시 반영: {', '.join(hot)}")
+            return
+
+        self._send(f"🔄 설정 변경 ({', '.join(cold)}) → 워커 교체 (캐시 유지)")
+        self._stop_worker()
+        self._spawn()
+        Metrics.inc("worker_rebuilds_total")
+
+    # ─── 메인 루프 ─────────────────────────────────────
+    def backoff(self) -> float:
+        return min(self.backoff_max, self.backoff_base * 2 ** max(0, self.failures - 1))
+
+    def run(self) -> None:
+        self._spawn()
+        while not self.stop_event.is_set():
+            if self._thread is not None and self._thread.is_alive():
+                self._thread.join(timeout=self.reload_poll_sec)
+                if self._thread.is_alive() and not self.stop_event.is_set():
+                    self._check_config()
+                continue
+
+            # 워커 종료 (예외 또는 예기치 않은 run 반환) → 백오프 후 상태 유지한 채 재시작
+            ran = Clock.time() - self._started
+            self.failures = 1 if ran >= self.healthy_sec else self.failures + 1
+            self.restarts += 1
+            delay = self.backoff()
+            Metrics.inc("worker_restarts_total")
+            self._send(
+                f"❌ AutoTrader 종료 ({type(self.last_error).__name__ if self.last_error else '정상 반환'}: "
+                f"{self.last_error or ''}) · {ran:.0f}s 실행 · {delay:.0f}초 후 재시작 (연속 {self.failures}회)"
+            )
+            if Clock.wait(self.stop_event, delay):
+                break
+            self._spawn()
+
+        self._stop_worker()
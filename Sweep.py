@@ -0,0 +1,269 @@
+from __future__ import annotations
+import itertools
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from Backtester import (
+    DEFAULT_BUY_UNIT_USD,
+    DEFAULT_INTERVAL_SEC,
+    DEFAULT_START_CASH_USD,
+    Backtester,
+    load_inputs,
+)
+from Bars import BAR_DTYPE
+from Indicators import SCORE_WEIGHTS
+from Strategy import BUY_THRESHOLD, SELL_THRESHOLD, Strategy
+
+# ───── 기본 탐색 공간 (config.yaml 키 이름, 가중치는 W_S/W_M/W_R) ──────
+DEFAULT_SPACE: Dict[str, list] = {
+    "MOMENTUM_BARS":  [2, 3, 5, 8],
+    "RSI_PERIOD":     [7, 14, 21],
+    "RSI_MODE":       ["simple"],
+    "W_S":            [SCORE_WEIGHTS["S"]],
+    "W_M":            [0.6, SCORE_WEIGHTS["M"]],
+    "W_R":            [0.3, SCORE_WEIGHTS["R"], 1.0],
+    "BUY_THRESHOLD":  [0.8, BUY_THRESHOLD, 1.2],
+    "SELL_THRESHOLD": [-1.2, SELL_THRESHOLD, -0.8],
+}
+# 지표 계산에 영향을 주는 키 → 같은 값끼리 묶어 S/M/R 행렬을 한 번만 계산
+INDICATOR_KEYS = ("MOMENTUM_BARS", "RSI_PERIOD", "RSI_MODE")
+DEFAULT_RESULTS = "logs/sweep_results.csv"
+
+
+# ─────────────────────────────────────────────────────────────
+# 탐색 공간
+# ─────────────────────────────────────────────────────────────
+def load_space(path: Optional[str]) -> Dict[str, object]:
+    """
+    YAML 탐색 공간 로드 (없는 키는 DEFAULT_SPACE 사용)
+    • 값 목록: [2, 3, 5]
+    • 범위:    {min: 0.5, max: 1.5, step: 0.25}  (step 생략 시 random 탐색 전용)
+    """
+    space = dict(DEFAULT_SPACE)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            space.update(yaml.safe_load(f) or {})
+    return space
+
+
+def _values(spec) -> list:
+    if isinstance(spec, dict):
+        if "step" not in spec:
+            raise ValueError(f"grid 탐색은 범위에 step 이 필요합니다: {spec}")
+        vals = np.arange(spec["min"], spec["max"] + spec["step"] / 2, spec["step"])
+        return [round(float(v), 10) for v in vals]
+    return list(spec) if isinstance(spec, (list, tuple)) else [spec]
+
+
+def grid_params(space: Dict[str, object]) -> List[Dict]:
+    keys = list(space)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(_values(space[k]) for k in keys))]
+
+
+def random_params(space: Dict[str, object], n: int, seed: int = 0) -> List[Dict]:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        p = {}
+        for k, spec in space.items():
+            if isinstance(spec, dict):
+                lo, hi = spec["min"], spec["max"]
+                p[k] = rng.randint(lo, hi) if isinstance(lo, int) and isinstance(hi, int) else rng.uniform(lo, hi)
+            else:
+                p[k] = rng.choice(_values(spec))
+        out.append(p)
+    return out
+
+
+def strategy_from_params(p: Dict, buy_unit_usd: float) -> Strategy:
+    return Strategy(
+        buy_unit_usd=buy_unit_usd,
+        momentum_bars=int(p["MOMENTUM_BARS"]),
+        rsi_period=int(p["RSI_PERIOD"]),
+        rsi_mode=p.get("RSI_MODE", "simple"),
+        weights={"S": p["W_S"], "M": p["W_M"], "R": p["W_R"]},
+        buy_threshold=p["BUY_THRESHOLD"],
+        sell_threshold=p["SELL_THRESHOLD"],
+    )
+
+
+# ─────────────────────────────────────────────────────────────
+# 공유 데이터 (memory-mapped .npy → 작업마다 pickle 하지 않음)
+# ─────────────────────────────────────────────────────────────
+def export_data(
+    bars: Dict[str, np.ndarray],
+    news: Dict[str, Tuple[np.ndarray, np.ndarray]],
+    workdir: str,
+) -> Dict:
+    """전 종목 분봉·뉴스를 연속 배열 하나씩으로 저장, 종목별 구간은 offset 으로 표시"""
+    symbols  = list(bars)
+    bar_off  = np.cumsum([0] + [len(bars[s]) for s in symbols]).tolist()
+    news_off = np.cumsum([0] + [len(news.get(s, ((), ()))[0]) for s in symbols]).tolist()
+    empty    = np.empty(0, dtype=np.int64)
+
+    np.save(os.path.join(workdir, "bars.npy"),
+            np.concatenate([bars[s] for s in symbols]) if symbols else np.empty(0, BAR_DTYPE))
+    np.save(os.path.join(workdir, "news_ts.npy"),
+            np.concatenate([news.get(s, (empty, empty))[0] for s in symbols] + [empty]).astype(np.int64))
+    np.save(os.path.join(workdir, "news_pred.npy"),
+            np.concatenate([news.get(s, (empty, empty))[1] for s in symbols] + [empty]).astype(np.int64))
+    return {"symbols": symbols, "bar_off": bar_off, "news_off": news_off}
+
+
+def attach_data(workdir: str, meta: Dict) -> Tuple[Dict[str, np.ndarray], Dict[str, Tuple[np.ndarray, np.ndarray]]]:
+    """export_data 결과를 읽기 전용 memmap view 로 연결 (복사 없음)"""
+    allb  = np.load(os.path.join(workdir, "bars.npy"), mmap_mode="r")
+    nts   = np.load(os.path.join(workdir, "news_ts.npy"), mmap_mode="r")
+    npred = np.load(os.path.join(workdir, "news_pred.npy"), mmap_mode="r")
+    bo, no = meta["bar_off"], meta["news_off"]
+    bars = {s: allb[bo[i] : bo[i + 1]] for i, s in enumerate(meta["symbols"])}
+    news = {s: (nts[no[i] : no[i + 1]], npred[no[i] : no[i + 1]]) for i, s in enumerate(meta["symbols"])}
+    return bars, news
+
+
+# ─────────────────────────────────────────────────────────────
+# 워커
+# ─────────────────────────────────────────────────────────────
+_WORKER: Dict = {}
+
+
+def _init_worker(workdir: str, meta: Dict, bt_kwargs: Dict) -> None:
+    _WORKER["bars"], _WORKER["news"] = attach_data(workdir, meta)
+    _WORKER["kwargs"] = bt_kwargs
+
+
+def _run_group(group: List[Dict]) -> List[Dict]:
+    """지표 설정이 같은 파라미터 묶음: S/M/R 행렬은 한 번, 가중치·임계값별로 매매만 재생"""
+    kw    = dict(_WORKER["kwargs"])
+    unit  = kw.pop("buy_unit_usd")
+    bt    = Backtester(strategy_from_params(group[0], unit), _WORKER["bars"], _WORKER["news"], log_dir=None, **kw)
+    pre   = bt.precompute_scores()
+    rows  = []
+    for p in group:
+        bt.strategy = strategy_from_params(p, unit)
+        w     = bt.strategy.weights
+        total = pre["S"] * w["S"] + pre["M"] * w["M"] + pre["R"] * w["R"]   # score_matrix 와 같은 연산 순서
+        res   = bt.run(fast=True, scores={**pre, "total": total})
+        rows.append({**p, **{k: v for k, v in res.items() if k != "elapsed_sec"}})
+    return rows
+
+
+def _tasks(params: List[Dict], workers: int) -> List[List[Dict]]:
+    """지표 키로 묶은 뒤, 워커당 4개 이상 작업이 되도록 분할 (부하 균형)"""
+    groups: Dict[tuple, List[Dict]] = {}
+    for p in params:
+        groups.setdefault(tuple(p[k] for k in INDICATOR_KEYS), []).append(p)
+    target = max(1, len(params) // (workers * 4))
+    out = []
+    for g in groups.values():
+        out.extend(g[i : i + target] for i in range(0, len(g), target))
+    return out
+
+
+# ─────────────────────────────────────────────────────────────
+# 스윕 실행
+# ─────────────────────────────────────────────────────────────
+def sweep(
+    bars: Dict[str, np.ndarray],
+    news: Dict[str, Tuple[np.ndarray, np.ndarray]],
+    params: List[Dict],
+    *,
+    workers: Optional[int] = None,
+    sort_by: str = "return_pct",
+    buy_unit_usd: float = DEFAULT_BUY_UNIT_USD,
+    interval_sec: int = DEFAULT_INTERVAL_SEC,
+    start_cash: float = DEFAULT_START_CASH_USD,
+    slippage_bps: float = 0.0,
+) -> pd.DataFrame:
+    """params 전체를 백테스트하고 sort_by 내림차순으로 정렬한 결과표 반환"""
+    workers = workers or os.cpu_count() or 1
+    kw = {
+        "buy_unit_usd": buy_unit_usd,
+        "interval_sec": interval_sec,
+        "start_cash":   start_cash,
+        "slippage_bps": slippage_bps,
+    }
+    workdir = tempfile.mkdtemp(prefix="sweep_")
+    rows: List[Dict] = []
+    try:
+        meta  = export_data(bars, news, workdir)
+        tasks = _tasks(params, workers)
+        if workers == 1:
+            _init_worker(workdir, meta, kw)
+            for t in tasks:
+                rows.extend(_run_group(t))
+            _WORKER.clear()
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(workdir, meta, kw)) as ex:
+                for r in ex.map(_run_group, tasks):
+                    rows.extend(r)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    df = pd.DataFrame(rows)
+    if not df.empty:
+        df = df.sort_values(sort_by, ascending=False, kind="stable").reset_index(drop=True)
+    return df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    ap = argparse.ArgumentParser(description="전략 파라미터 병렬 스윕 (Backtester 기반)")
+    ap.add_argument("--bars", default="bars")
+    ap.add_argument("--news", default="sentiment")
+    ap.add_argument("--config", default="config.yaml")
+    ap.add_argument("--space", help="탐색 공간 YAML (기본: DEFAULT_SPACE)")
+    ap.add_argument("--random", type=int, default=0, help="N>0 이면 grid 대신 무작위 N개 탐색")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=None, help="기본: CPU 코어 수")
+    ap.add_argument("--sort", default="return_pct")
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--out", default=DEFAULT_RESULTS)
+    ap.add_argument("--scaling", action="store_true", help="워커 1, 2, 4, … 개로 반복 실행해 속도 향상 비율 출력")
+    args = ap.parse_args()
+
+    cfg = {}
+    if os.path.exists(args.config):
+        with open(args.config, encoding="utf-8") as f:
+            cfg = yaml.safe_load(f) or {}
+    symbols = [s for s in cfg.get("SYMBOLS", []) if (Path(args.bars) / f"{s}.csv").exists()] or None
+    bars, news = load_inputs(args.bars, args.news, symbols)
+
+    space  = load_space(args.space)
+    params = random_params(space, args.random, args.seed) if args.random > 0 else grid_params(space)
+    common = dict(
+        sort_by=args.sort,
+        buy_unit_usd=cfg.get("BUY_UNIT_USD", DEFAULT_BUY_UNIT_USD),
+        interval_sec=cfg.get("INTERVAL_SEC", DEFAULT_INTERVAL_SEC),
+    )
+    print(f"🔎 {len(params)}개 조합 × {len(bars)}종목")
+
+    if args.scaling:
+        n, base = 1, None
+        while n <= (args.workers or os.cpu_count() or 1):
+            t0 = time.perf_counter()
+            sweep(bars, news, params, workers=n, **common)
+            sec  = time.perf_counter() - t0
+            base = base or sec
+            print(f"  workers={n:<3} {sec:8.2f}s  speedup ×{base / sec:5.2f}")
+            n *= 2
+
+    t0 = time.perf_counter()
+    df = sweep(bars, news, params, workers=args.workers, **common)
+    print(f"✅ 완료 {time.perf_counter() - t0:.2f}s")
+
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(args.out, index=False)
+    print(df.head(args.top).to_string())
+    print(f"📄 결과 저장: {args.out}")
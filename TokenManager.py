@@ -0,0 +1,256 @@
+from __future__ import annotations
+import json
+import os
+import tempfile
+import threading
+import datetime as dt
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+from zoneinfo import ZoneInfo
+
+import Clock
+
+# ───── 상수 ───────────────────────────────────────────────────
+ET                   = ZoneInfo("US/Eastern")
+TOKEN_LIFE           = 18 * 3600     # 토큰 유효 18 h (24 h 안전 마진)
+TOKEN_HARD_MARGIN    = 300           # 요청 경로에서 강제 재발급하는 잔여 수명 (5분)
+TOKEN_REFRESH_MARGIN = 30 * 60       # 백그라운드 선제 재발급 잔여 수명 (30분)
+TOKEN_RETRY_SEC      = 60            # 재발급 실패 시 재시도 간격
+
+
+class _FileLock:
+    """
+    프로세스 간 배타 잠금 (token.json.lock)
+    • POSIX: fcntl.flock / Windows: msvcrt.locking
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "_FileLock":
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:      # LK_LOCK 은 10초 후 실패 → 계속 대기
+                    continue
+        else:
+            import fcntl
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._fd is None:
+            return
+        try:
+            if os.name == "nt":
+                import msvcrt
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    """같은 디렉터리의 임시 파일에 쓴 뒤 os.replace 로 교체 (쓰기 도중 깨짐 방지)"""
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class TokenManager:
+    """
+    Access Token 공유 관리자
+    • 같은 (URL_BASE, APP_KEY, token 파일) 조합은 프로세스 내에서 인스턴스 1개만 사용
+    • 파일 잠금 + 원자적 쓰기로 여러 프로세스가 token.json 을 안전하게 공유
+    • 백그라운드 스레드가 만료 전에 선제 재발급 → 요청 경로에서는 캐시된 토큰만 반환
+    """
+
+    def __init__(
+        self,
+        *,
+        url_base: str,
+        app_key: str,
+        app_secret: str,
+        token_file: str | Path = "token.json",
+        refresh_margin: float = TOKEN_REFRESH_MARGIN,
+    ) -> None:
+        self.url_base       = url_base
+        self.app_key        = app_key
+        self.app_secret     = app_secret
+        self.token_file     = Path(token_file)
+        self.lock_file      = self.token_file.with_name(self.token_file.name + ".lock")
+        self.refresh_margin = refresh_margin
+
+        # 발급 알림 콜백 (TradingBot.send_message 등)
+        self.notify: Optional[Callable[[str], None]] = None
+
+        self.access_token: str                     = ""
+        self.token_issue_time: dt.datetime | None  = None
+        self._expires_at: float                    = 0.0   # 요청 경로 기준 만료 시각 (epoch)
+
+        self._lock    = threading.Lock()
+        self._stop    = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._load()
+
+    # ─────────────────────────────────────────────────────────
+    # 파일 입출력
+    # ─────────────────────────────────────────────────────────
+    def _load(self) -> None:
+        if not self.token_file.exists():
+            return
+        try:
+            blob = json.loads(self.token_file.read_text(encoding="utf-8"))
+        except Exception:
+            return
+        token = blob.get("access_token", "")
+        ts    = blob.get("token_issue_time")
+        if not token or not ts:
+            return
+        try:
+            t = dt.datetime.fromisoformat(ts)
+        except ValueError:
+            return
+        if t.tzinfo is None:
+            t = t.replace(tzinfo=ET)
+        self._set(token, t)
+
+    def _save(self) -> None:
+        blob = {
+            "access_token":     self.access_token,
+            "token_issue_time": self.token_issue_time.isoformat() if self.token_issue_time else None,
+        }
+        _atomic_write_text(self.token_file, json.dumps(blob))
+
+    def _set(self, token: str, issued: dt.datetime) -> None:
+        self.access_token     = token
+        self.token_issue_time = issued
+        self._expires_at      = issued.timestamp() + TOKEN_LIFE - TOKEN_HARD_MARGIN
+
+    def _remaining(self) -> float:
+        """요청 경로 기준 남은 수명 (초)"""
+        if not self.access_token:
+            return 0.0
+        return self._expires_at - Clock.time()
+
+    # ─────────────────────────────────────────────────────────
+    # 발급
+    # ─────────────────────────────────────────────────────────
+    def _request_new_token(self) -> None:
+        body    = {"grant_type": "client_credentials", "appkey": self.app_key, "appsecret": self.app_secret}
+        headers = {"Content-Type": "application/json"}
+        url     = f"{self.url_base}/oauth2/tokenP"
+        res     = requests.post(url, headers=headers, json=body, timeout=3)
+        res.raise_for_status()
+        self._set(res.json()["access_token"], Clock.now(ET))
+        self._save()
+        if self.notify:
+            self.notify("🔑 새 Access Token 발급 완료")
+
+    def ensure_valid(self, min_remaining: float = 0.0, *, force: bool = False) -> str:
+        """
+        남은 수명이 min_remaining 초 미만이면 재발급
+        • 파일 잠금 획득 후 token.json 을 다시 읽어 다른 프로세스의 발급 결과를 우선 사용
+        """
+        with self._lock:
+            if not force and self._remaining() > min_remaining:
+                return self.access_token
+            self.lock_file.parent.mkdir(parents=True, exist_ok=True)
+            with _FileLock(self.lock_file):
+                issued_before = self.token_issue_time
+                self._load()
+                refreshed_elsewhere = self.token_issue_time != issued_before
+                if self._remaining() > min_remaining and not (force and not refreshed_elsewhere):
+                    return self.access_token
+                self._request_new_token()
+            return self.access_token
+
+    def get(self) -> str:
+        """요청 경로용: 유효한 캐시 토큰을 즉시 반환 (만료 임박 시에만 동기 재발급)"""
+        if self.access_token and Clock.time() < self._expires_at:
+            return self.access_token
+        return self.ensure_valid()
+
+    # ─────────────────────────────────────────────────────────
+    # 백그라운드 선제 재발급
+    # ─────────────────────────────────────────────────────────
+    def start(self) -> None:
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._refresh_loop, name="TokenRefresher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            wait = self._remaining() - self.refresh_margin
+            if wait > 0:
+                # 다른 프로세스가 먼저 재발급했을 수 있으므로 최대 1시간마다 재확인
+                if Clock.wait(self._stop, min(wait, 3600)):
+                    return
+                with self._lock:
+                    self._load()
+                continue
+            try:
+                self.ensure_valid(self.refresh_margin)
+            except Exception as e:
+                if self.notify:
+                    self.notify(f"⚠️ Access Token 선제 재발급 실패: {e}")
+                Clock.wait(self._stop, TOKEN_RETRY_SEC)
+
+
+# ───── 프로세스 내 공유 인스턴스 ────────────────────────────────
+_MANAGERS: Dict[Tuple[str, str, str], TokenManager] = {}
+_MANAGERS_LOCK = threading.Lock()
+
+
+def get_token_manager(
+    *,
+    url_base: str,
+    app_key: str,
+    app_secret: str,
+    token_file: str | Path = "token.json",
+) -> TokenManager:
+    """같은 계정·토큰 파일이면 기존 TokenManager 를 재사용"""
+    key = (url_base, app_key, str(Path(token_file).resolve()))
+    with _MANAGERS_LOCK:
+        mgr = _MANAGERS.get(key)
+        if mgr is None:
+            mgr = TokenManager(
+                url_base=url_base,
+                app_key=app_key,
+                app_secret=app_secret,
+                token_file=token_file,
+            )
+            _MANAGERS[key] = mgr
+        return mgr
@@ -1,14 +1,203 @@
 from __future__ import annotations
+import atexit
 import csv
 import datetime as dt
+import os
+import queue
+import threading
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-import matplotlib.pyplot as plt
-import pandas as pd
+import Clock
+import Metrics
+from Charts import DEFAULT_FORMAT, DEFAULT_MAX_POINTS, FORMATS, ChartReport, equity_figures
+from Ledger import DEFAULT_CHECKPOINT_EVERY, DEFAULT_CHECKPOINT_NAME, Ledger, load_checkpoint, save_checkpoint
+from TradeStore import DEFAULT_DB_NAME, EQUITY_COLUMNS, TRADE_COLUMNS, SqliteStore, parse_times
+
+if TYPE_CHECKING:                 # pandas 는 조회할 때 함수 안에서 import (모듈 import 는 가볍게)
+    import pandas as pd
 
 KST = ZoneInfo("Asia/Seoul")
 
+# ───── 기록 설정 (config.yaml LOG_FLUSH_SEC / LOG_FSYNC / LOG_BACKEND 로 재정의 가능) ─────
+DEFAULT_BACKEND            = "csv"      # csv | sqlite
+BACKENDS                   = ("csv", "sqlite")
+DEFAULT_FLUSH_INTERVAL_SEC = 1.0        # 0 이하면 호출 즉시 기록 (백그라운드 스레드 없음)
+DEFAULT_FSYNC              = "batch"    # none | batch | close
+FSYNC_POLICIES             = ("none", "batch", "close")
+MAX_BATCH                  = 1000       # 이만큼 쌓이면 주기를 기다리지 않고 기록
+
+_STOP = object()
+
+
+def format_kst(ts: float) -> str:
+    return dt.datetime.fromtimestamp(ts, KST).isoformat(sep=" ", timespec="seconds")
+
+
+def _csv_frame(df: pd.DataFrame, columns: List[str], start: Optional[float], end: Optional[float]) -> pd.DataFrame:
+    """CSV 로그 → ts(epoch 초) + 값 컬럼, [start, end) 구간만"""
+    df = df.assign(ts=parse_times(df["time"]))[["ts", *columns]]
+    if start is not None:
+        df = df[df["ts"] >= start]
+    if end is not None:
+        df = df[df["ts"] < end]
+    return df.reset_index(drop=True)
+
+
+class CsvSink:
+    """
+    kind('trades' | 'equity') 별 CSV 파일에 일괄 추가
+    • 행의 첫 칸은 epoch 초로 받아 문자열로 변환 (같은 초는 캐시), equity 금액은 소수 둘째 자리
+    • fsync: none(OS 버퍼에 맡김) | batch(일괄 기록마다) | close(종료 시 한 번)
+    """
+
+    def __init__(
+        self,
+        paths: Dict[str, Path],
+        fsync: str = DEFAULT_FSYNC,
+        fmt_time: Callable[[float], str] = format_kst,
+    ) -> None:
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"LOG_FSYNC 는 {FSYNC_POLICIES} 중 하나여야 합니다: {fsync!r}")
+        self.paths    = paths
+        self.fsync    = fsync
+        self.fmt_time = fmt_time
+        self._last_ts: Tuple[int, str] = (-1, "")
+        self._touched: set = set()
+
+    def _fmt(self, ts: float) -> str:
+        sec = int(ts)
+        if sec != self._last_ts[0]:
+            self._last_ts = (sec, self.fmt_time(ts))
+        return self._last_ts[1]
+
+    def write(self, records: List[tuple]) -> None:
+        by_path: Dict[Path, List[list]] = {}
+        for kind, ts, row in records:
+            if kind == "equity":
+                row = [f"{x:.2f}" for x in row]
+            by_path.setdefault(self.paths[kind], []).append([self._fmt(ts), *row])
+        for path, rows in by_path.items():
+            with open(path, "a", encoding="utf-8", newline="") as f:
+                csv.writer(f).writerows(rows)
+                if self.fsync == "batch":
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._touched.add(path)
+
+    def position(self) -> int:
+        """거래 로그 위치 (trades.csv 바이트 크기) — Ledger 체크포인트용"""
+        try:
+            return self.paths["trades"].stat().st_size
+        except OSError:
+            return 0
+
+    def close(self) -> None:
+        if self.fsync == "close":
+            for path in self._touched:
+                with open(path, "a", encoding="utf-8") as f:
+                    os.fsync(f.fileno())
+
+
+class BufferedWriter:
+    """
+    로그 레코드 (kind, epoch 초, 값 목록) 를 메모리 큐에 모아 백그라운드 스레드에서 sink 로 일괄 기록
+    • 단일 FIFO 큐 + 단일 기록 스레드 → 넣은 순서대로 기록, 여러 스레드가 동시에 넣어도 섞이지 않음
+    • flush_interval 초마다 (또는 MAX_BATCH 개마다) sink.write(records) 한 번
+    • flush_interval ≤ 0 이면 호출 스레드에서 바로 기록
+    • ("checkpoint", ts, save) 레코드: 앞선 레코드를 기록한 직후 save(sink.position()) 호출
+      → 체크포인트가 가리키는 로그 위치와 그 시점 상태가 항상 일치
+    """
+
+    def __init__(self, sink, flush_interval: float = DEFAULT_FLUSH_INTERVAL_SEC, name: str = "trade-log") -> None:
+        self.sink           = sink
+        self.flush_interval = float(flush_interval)
+        self._lock   = threading.Lock()              # 닫힘 확인·큐 추가·동기 기록·close 를 한 잠금으로
+        self._closed = False
+        self._q: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        if self.flush_interval > 0:
+            self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+            self._thread.start()
+
+    # ─── 호출 측 ──────────────────────────────────────
+    def put(self, kind: str, ts: float, row: list) -> None:
+        """닫힌 여부 확인과 큐 추가를 같은 잠금 안에서 → close 이후(_STOP 뒤)에 들어온 레코드는 호출 스레드에서 바로 기록"""
+        with self._lock:
+            if self._thread is None or self._closed:
+                self._write([(kind, ts, row)])
+                return
+            self._q.put((kind, ts, row))
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """지금까지 넣은 레코드가 기록될 때까지 대기"""
+        with self._lock:
+            if self._thread is None or self._closed or not self._thread.is_alive():
+                return
+            done = threading.Event()
+            self._q.put(done)
+        done.wait(timeout)
+
+    def close(self) -> None:
+        """남은 레코드 기록 → 기록 스레드 종료 → sink.close() (끝날 때까지 put 은 대기 → 기록 스레드와 동시 기록 없음)"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is not None and self._thread.is_alive():
+                self._q.put(_STOP)
+                self._thread.join()
+            self.sink.close()
+
+    # ─── 기록 스레드 ───────────────────────────────────
+    def _run(self) -> None:
+        pending: List[tuple] = []
+        deadline: Optional[float] = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, tuple):
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(pending) < MAX_BATCH:
+                    continue
+            if pending:
+                self._write(pending)
+                pending, deadline = [], None
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return
+
+    def _write(self, records: List[tuple]) -> None:
+        start = 0
+        for i, (kind, _, save) in enumerate(records):
+            if kind != "checkpoint":
+                continue
+            self._write_rows(records[start:i])
+            start = i + 1
+            try:
+                save(self.sink.position())
+            except Exception as e:
+                print(f"⚠️ 장부 체크포인트 저장 실패: {e}")
+        self._write_rows(records[start:])
+
+    def _write_rows(self, records: List[tuple]) -> None:
+        if not records:
+            return
+        try:
+            with Metrics.timer("log.flush"):
+                self.sink.write(records)
+        except Exception as e:                       # 디스크·DB 오류로 기록 스레드가 죽지 않도록 알리고 계속
+            print(f"⚠️ 거래 로그 기록 실패 ({len(records)}건): {e}")
+        Metrics.inc("log_rows_total", len(records))
+
 
 class TradeLogger:
     def __init__(
@@ -16,24 +205,62 @@ class TradeLogger:
         log_dir: str = "logs",
         initial_cash: float = 0.0,
         currency: str = "USD",
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL_SEC,
+        fsync: str = DEFAULT_FSYNC,
+        backend: str = DEFAULT_BACKEND,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
     ) -> None:
         """
-        :param log_dir:      로그 디렉터리
-        :param initial_cash: 시작 시점의 현금 (USD)
-        :param currency:     통화 단위 표시 ("USD")
+        :param log_dir:        로그 디렉터리
+        :param initial_cash:   시작 시점의 현금 (USD)
+        :param currency:       통화 단위 표시 ("USD")
+        :param flush_interval: 백그라운드 일괄 기록 주기(초), 0 이하면 즉시 기록
+        :param fsync:          none | batch | close
+        :param backend:        csv (trades.csv · equity.csv) | sqlite (trades.db)
+        :param checkpoint_every: 체결 N건마다 장부 체크포인트 (ledger.json)
+
+        현금·보유·실현손익은 Ledger 가 관리, 재시작 시 체크포인트 + 그 이후 거래만 다시 반영해 복원
+        (체크포인트가 없으면 거래 로그 전체를 한 번 반영, 기록이 없으면 initial_cash 로 시작)
         """
-        self.dir = Path(log_dir)
-        self.dir.mkdir(exist_ok=True)
+        if backend not in BACKENDS:
+            raise ValueError(f"LOG_BACKEND 는 {BACKENDS} 중 하나여야 합니다: {backend!r}")
+        self.dir = Path(log_dir).resolve()     # 백그라운드 기록 시점에 작업 폴더가 바뀌어도 같은 위치
+        self.dir.mkdir(parents=True, exist_ok=True)
         self.currency = currency
+        self.backend  = backend
 
-        # 내부 현금 잔고를 시작 잔액으로 설정
-        self.cash_balance = initial_cash
-        self.realized_pnl = 0.0
+        self.checkpoint_every = checkpoint_every
 
         # 고정된 파일명 사용
         self.trade_csv = self.dir / "trades.csv"
         self.equity_csv = self.dir / "equity.csv"
+        self.db_path = self.dir / DEFAULT_DB_NAME
+        self.ledger_path = self.dir / DEFAULT_CHECKPOINT_NAME
+
+        # 잔고 갱신 + 기록 순서를 묶는 잠금 (주문 스레드 동시 호출 대비)
+        self._lock = threading.Lock()
+        self.store: Optional[SqliteStore] = None
+        if backend == "sqlite":
+            fresh = self._open_store(fsync, initial_cash)
+            sink  = self.store
+        else:
+            fresh = self._init_csv(initial_cash)
+            sink  = CsvSink({"trades": self.trade_csv, "equity": self.equity_csv}, fsync)
+        self.sink   = sink
+        self.ledger, replayed = self._recover(initial_cash)
+        self._checkpoint_seq = self.ledger.seq
+        self.writer = BufferedWriter(sink, flush_interval)
+        atexit.register(self.close)
+        if replayed:                                 # 다음 시작부터는 다시 반영할 필요 없도록
+            with self._lock:
+                self._checkpoint()
+
+        # 최초 스냅샷 기록 (stock_value=0, realized_pnl=0)
+        if fresh:
+            self._write_initial_snapshot()
 
+    def _init_csv(self, initial_cash: float) -> bool:
+        """CSV 헤더 생성 (파일 없을 때만), equity.csv 를 새로 만들었으면 True"""
         # ── trades.csv 헤더 생성 (파일 없을 때만) ──
         if not self.trade_csv.exists():
             self.trade_csv.write_text(
@@ -41,157 +268,250 @@ class TradeLogger:
             )
 
         # ── equity.csv 헤더 및 시작 잔액 주석 생성 (파일 없을 때만) ──
-        if not self.equity_csv.exists():
-            with self.equity_csv.open("w", encoding="utf-8", newline="") as f:
-                f.write(f"# starting_cash,{initial_cash:.2f}\n")
-                f.write("time,cash,stock_value,total_equity,realized_pnl\n")
+        if self.equity_csv.exists():
+            return False
+        with self.equity_csv.open("w", encoding="utf-8", newline="") as f:
+            f.write(f"# starting_cash,{initial_cash:.2f}\n")
+            f.write("time,cash,stock_value,total_equity,realized_pnl\n")
+        return True
 
-            # 최초 스냅샷 기록 (stock_value=0, realized_pnl=0)
-            self._write_initial_snapshot()
+    def _open_store(self, fsync: str, initial_cash: float) -> bool:
+        """trades.db 열기, 새 DB 면 기존 CSV 를 한 번 가져옴 → 시작 잔액이 없으면 True"""
+        self.store = SqliteStore(self.db_path, fsync)
+        if self.store.get_meta("starting_cash") is None:
+            n_t, n_e = self.store.migrate_csv(self.trade_csv, self.equity_csv)
+            if n_t or n_e:
+                print(f"📦 CSV 로그 → {self.db_path} 이전: 거래 {n_t}건 · 자산 {n_e}건")
+        if self.store.get_meta("starting_cash") is not None:
+            return False
+        self.store.set_meta("starting_cash", f"{initial_cash:.2f}")
+        return True
+
+    # ─── 장부 복원 · 체크포인트 ─────────────────────────
+    @property
+    def cash_balance(self) -> float:
+        return self.ledger.cash
+
+    @property
+    def realized_pnl(self) -> float:
+        return self.ledger.realized_pnl
+
+    def _starting_cash(self, initial_cash: float) -> float:
+        """기록된 시작 잔액 (sqlite meta 또는 equity.csv 첫 줄 주석), 없으면 initial_cash"""
+        if self.store is not None:
+            v = self.store.get_meta("starting_cash")
+            return float(v) if v is not None else initial_cash
+        try:
+            with self.equity_csv.open(encoding="utf-8") as f:
+                first = f.readline()
+        except OSError:
+            return initial_cash
+        return float(first.split(",", 1)[1]) if first.startswith("# starting_cash,") else initial_cash
+
+    def _trades_after(self, position: int) -> Tuple[List[tuple], int]:
+        """거래 로그 position 이후 (symbol, side, qty, price) 목록과 끝 위치"""
+        if self.store is not None:
+            return self.store.trades_after(position)
+        with open(self.trade_csv, "rb") as f:
+            f.seek(position)
+            data = f.read()
+        lines = data.decode("utf-8").splitlines()
+        if position == 0 and lines and lines[0].startswith("time,"):
+            lines = lines[1:]
+        rows = [(r[1], r[2], r[3], r[4]) for r in csv.reader(lines) if len(r) == 6]
+        return rows, position + len(data)
+
+    def _recover(self, initial_cash: float) -> Tuple[Ledger, int]:
+        """(복원된 장부, 체크포인트 이후 다시 반영한 거래 수)"""
+        t0 = time.perf_counter()
+        ck = load_checkpoint(self.ledger_path)
+        end = self.sink.position()
+        if ck is not None and ck.get("log") == self.backend and 0 <= ck.get("log_position", -1) <= end:
+            ledger, position = Ledger.from_dict(ck), ck["log_position"]
+        else:                                        # 체크포인트 없음·손상·로그가 더 짧아짐 → 처음부터
+            ledger, position = Ledger(self._starting_cash(initial_cash)), 0
+        rows, _ = self._trades_after(position)
+        n = ledger.replay(rows)
+        Metrics.observe("log.recover", time.perf_counter() - t0)
+        if n and ck is None:
+            print(f"📒 거래 로그 {n}건으로 장부 복원: 현금 {ledger.cash:,.2f}, 실현손익 {ledger.realized_pnl:+,.2f}")
+        return ledger, n
+
+    def _checkpoint(self) -> None:
+        """현재 장부 상태를 기록 큐에 넣음 → 앞선 거래가 기록된 직후 로그 위치와 함께 저장 (잠금 안에서 호출)"""
+        state = dict(self.ledger.to_dict(), log=self.backend)
+        path  = self.ledger_path
+        self.writer.put("checkpoint", Clock.time(), lambda position: save_checkpoint(path, dict(state, log_position=position)))
+        self._checkpoint_seq = self.ledger.seq
 
     def _write_initial_snapshot(self) -> None:
-        t = dt.datetime.now(KST).isoformat(sep=" ", timespec="seconds")
         total = self.cash_balance
-        with self.equity_csv.open("a", encoding="utf-8", newline="") as f:
-            csv.writer(f).writerow([
-                t,
-                f"{self.cash_balance:.2f}",
-                "0.00",
-                f"{total:.2f}",
-                f"{self.realized_pnl:.2f}",
-            ])
+        self.writer.put("equity", Clock.time(), [self.cash_balance, 0.0, total, self.realized_pnl])
 
+    @Metrics.timer("log.trade")
     def log_trade(self, *, symbol: str, side: str, qty: float, price: float) -> None:
         # amount: + for buy, – for sell
         amount = qty * price * (1 if side == "buy" else -1)
 
-        # 내부 현금 잔고 업데이트
-        self.cash_balance -= amount
-
-        # 실현손익 업데이트 (매도 시)
-        if side == "sell":
-            self.realized_pnl += -amount
-
-        t = dt.datetime.now(KST).isoformat(sep=" ", timespec="seconds")
-        with self.trade_csv.open("a", encoding="utf-8", newline="") as f:
-            csv.writer(f).writerow([t, symbol, side, qty, price, amount])
+        with self._lock:
+            # 현금·보유·평균 원가·실현손익 갱신
+            self.ledger.apply(symbol, side, qty, price)
+            self.writer.put("trades", Clock.time(), [symbol, side, qty, price, amount])
+            if self.checkpoint_every > 0 and self.ledger.seq - self._checkpoint_seq >= self.checkpoint_every:
+                self._checkpoint()
 
+    @Metrics.timer("log.snapshot")
     def log_snapshot(self, *, cash: float = None, stock_value: float) -> None:
         """
         :param cash:       무시하고 내부 cash_balance 사용
         :param stock_value: 보유 주식 가치 (USD)
         """
-        total = self.cash_balance + stock_value
-        t = dt.datetime.now(KST).isoformat(sep=" ", timespec="seconds")
-        with self.equity_csv.open("a", encoding="utf-8", newline="") as f:
-            csv.writer(f).writerow([
-                t,
-                f"{self.cash_balance:.2f}",
-                f"{stock_value:.2f}",
-                f"{total:.2f}",
-                f"{self.realized_pnl:.2f}",
-            ])
-
-    def draw_graphs(self) -> None:
+        with self._lock:
+            total = self.cash_balance + stock_value
+            self.writer.put("equity", Clock.time(), [self.cash_balance, stock_value, total, self.realized_pnl])
+
+    def flush(self) -> None:
+        """대기 중인 기록을 파일에 반영 (파일을 읽기 전에 호출)"""
+        self.writer.flush()
+
+    def close(self) -> None:
+        """남은 기록·장부 체크포인트 저장 후 기록 스레드 종료 (프로세스 종료 시 자동 호출)"""
+        with self._lock:
+            if self.ledger.seq != self._checkpoint_seq and not self.writer._closed:
+                self._checkpoint()
+        self.writer.close()
+        atexit.unregister(self.close)
+
+    # ─── 조회 (ts: epoch 초, 구간은 [start, end)) ───────
+    def load_equity(self, start: Optional[float] = None, end: Optional[float] = None) -> pd.DataFrame:
+        import pandas as pd
+
+        self.flush()
+        if self.store is not None:
+            return self.store.equity(start, end)
         if not self.equity_csv.exists():
-            print(f"🛑 {self.equity_csv} 가 없습니다. 먼저 로그를 생성하세요.")
-            return
+            return pd.DataFrame(columns=["ts", *EQUITY_COLUMNS])
+        df = pd.read_csv(self.equity_csv, comment="#")
+        return _csv_frame(df, EQUITY_COLUMNS, start, end)
 
-        equity = pd.read_csv(self.equity_csv, comment="#", parse_dates=["time"])
-        if equity.empty:
-            print("ℹ️ equity.csv 가 비어 있습니다.")
-            return
+    def load_trades(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        symbol: Optional[str] = None,
+    ) -> pd.DataFrame:
+        import pandas as pd
+
+        self.flush()
+        if self.store is not None:
+            return self.store.trades(start, end, symbol)
+        if not self.trade_csv.exists():
+            return pd.DataFrame(columns=["ts", *TRADE_COLUMNS])
+        df = _csv_frame(pd.read_csv(self.trade_csv), TRADE_COLUMNS, start, end)
+        return df if symbol is None else df[df["symbol"] == symbol].reset_index(drop=True)
 
-        for col in ["cash", "stock_value", "total_equity", "realized_pnl"]:
-            equity[col] = equity[col].astype(float)
-
-        start_time = equity["time"].iloc[0]
-        equity["elapsed_min"] = (equity["time"] - start_time).dt.total_seconds() / 60.0
-        mn, mx = 0.0, equity["elapsed_min"].max()
-
-        # 1. Total Equity
-        plt.figure()
-        plt.plot(equity["elapsed_min"], equity["total_equity"])
-        plt.title("Total Equity")
-        plt.xlabel("Elapsed Time (min)")
-        plt.ylabel(f"Amount ({self.currency})")
-        plt.xlim(mn, mx)
-        plt.tight_layout()
-
-        # 2. Cash vs Stock Value (+ 합산선)
-        plt.figure()
-        plt.plot(equity["elapsed_min"], equity["cash"], label="Cash")
-        plt.plot(equity["elapsed_min"], equity["stock_value"], label="Stock Value")
-        plt.plot(
-            equity["elapsed_min"],
-            equity["cash"] + equity["stock_value"],
-            "--",
-            label="Cash + Stock",
+    def iter_equity(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        chunksize: int = 100_000,
+    ) -> Iterator[pd.DataFrame]:
+        """load_equity 와 같은 형식을 chunksize 행씩 (전체를 메모리에 올리지 않음)"""
+        import pandas as pd
+
+        self.flush()
+        if self.store is not None:
+            yield from self.store.iter_rows("equity", start, end, chunksize)
+        elif self.equity_csv.exists():
+            for df in pd.read_csv(self.equity_csv, comment="#", chunksize=chunksize):
+                yield _csv_frame(df, EQUITY_COLUMNS, start, end)
+
+    def iter_trades(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        chunksize: int = 100_000,
+    ) -> Iterator[pd.DataFrame]:
+        """load_trades 와 같은 형식을 chunksize 행씩"""
+        import pandas as pd
+
+        self.flush()
+        if self.store is not None:
+            yield from self.store.iter_rows("trades", start, end, chunksize)
+        elif self.trade_csv.exists():
+            for df in pd.read_csv(self.trade_csv, chunksize=chunksize):
+                yield _csv_frame(df, TRADE_COLUMNS, start, end)
+
+    def data_version(self) -> tuple:
+        """기록이 늘어나면 바뀌는 값 (sqlite: 마지막 rowid, csv: 파일 크기·수정 시각)"""
+        self.flush()
+        if self.store is not None:
+            return self.store.version()
+        out = []
+        for path in (self.trade_csv, self.equity_csv):
+            try:
+                st = path.stat()
+                out += [st.st_size, st.st_mtime_ns]
+            except OSError:
+                out += [0, 0]
+        return tuple(out)
+
+    def render_report(
+        self,
+        out_dir: Optional[str] = None,
+        fmt: str = DEFAULT_FORMAT,
+        max_points: int = DEFAULT_MAX_POINTS,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        force: bool = False,
+    ) -> List[Path]:
+        """
+        창 없이 차트를 out_dir(기본 log_dir/charts)에 PNG/SVG 로 저장
+        • 마지막 렌더 이후 새 기록이 없으면 건너뜀 (빈 목록 반환)
+        """
+        report = ChartReport(out_dir or self.dir / "charts", fmt, max_points)
+        return report.render(
+            lambda: (self.load_equity(start, end), self.load_trades(start, end)),
+            version=[*self.data_version(), start, end],
+            currency=self.currency,
+            force=force,
         )
-        plt.title("Cash vs Stock Value")
-        plt.xlabel("Elapsed Time (min)")
-        plt.ylabel(f"Amount ({self.currency})")
-        plt.xlim(mn, mx)
-        plt.legend()
-        plt.tight_layout()
-
-        # 3. Cumulative Realized P/L
-        plt.figure()
-        plt.plot(equity["elapsed_min"], equity["realized_pnl"])
-        plt.title("Cumulative Realized P/L")
-        plt.xlabel("Elapsed Time (min)")
-        plt.ylabel(f"P/L ({self.currency})")
-        plt.xlim(mn, mx)
-        plt.tight_layout()
-
-        # 4. Buy / Sell by Symbol
-        trades = pd.read_csv(self.trade_csv, parse_dates=["time"])
-        if not trades.empty:
-            trades["elapsed_min"] = (
-                pd.to_datetime(trades["time"])
-                .dt.tz_localize(KST)
-                - start_time
-            ).dt.total_seconds() / 60.0
-
-            syms = trades["symbol"].unique()
-            cmap = plt.cm.get_cmap("tab10", len(syms))
-            colors = {s: cmap(i) for i, s in enumerate(syms)}
-
-            # Buy
-            buy = trades[trades["side"] == "buy"]
-            if not buy.empty:
-                plt.figure()
-                for s in syms:
-                    df = buy[buy["symbol"] == s]
-                    if df.empty:
-                        continue
-                    plt.scatter(df["elapsed_min"], df["amount"], label=s, color=colors[s])
-                plt.title("Buy Trade Amounts by Symbol")
-                plt.xlabel("Elapsed Time (min)")
-                plt.ylabel(f"Amount (+buy) ({self.currency})")
-                plt.xlim(mn, mx)
-                plt.legend()
-                plt.tight_layout()
-
-            # Sell
-            sell = trades[trades["side"] == "sell"]
-            if not sell.empty:
-                plt.figure()
-                for s in syms:
-                    df = sell[sell["symbol"] == s]
-                    if df.empty:
-                        continue
-                    plt.scatter(df["elapsed_min"], df["amount"], label=s, color=colors[s])
-                plt.title("Sell Trade Amounts by Symbol")
-                plt.xlabel("Elapsed Time (min)")
-                plt.ylabel(f"Amount (–sell) ({self.currency})")
-                plt.xlim(mn, mx)
-                plt.legend()
-                plt.tight_layout()
 
+    def draw_graphs(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        max_points: int = DEFAULT_MAX_POINTS,
+    ) -> None:
+        """차트를 창으로 출력 (선 그래프는 max_points 개로 다운샘플)"""
+        import matplotlib.pyplot as plt
+
+        equity = self.load_equity(start, end)
+        if equity.empty:
+            print(f"ℹ️ 자산 기록이 없습니다 ({self.db_path if self.store else self.equity_csv}).")
+            return
+        equity_figures(equity, self.load_trades(start, end), plt.figure, self.currency, max_points)
         plt.show()
 
 
 if __name__ == "__main__":
-    logger = TradeLogger("logs")
-    logger.draw_graphs()
+    import argparse
+
+    ap = argparse.ArgumentParser(description="거래·자산 기록 차트 (기본: 창 출력)")
+    ap.add_argument("--log-dir", default="logs")
+    ap.add_argument("--backend", choices=BACKENDS, default=None, help="기본: trades.db 가 있으면 sqlite")
+    ap.add_argument("--report", action="store_true", help="창 없이 파일로 저장 (새 기록이 있을 때만)")
+    ap.add_argument("--format", choices=FORMATS, default=DEFAULT_FORMAT)
+    ap.add_argument("--out", default=None, help="저장 폴더 (기본: <log-dir>/charts)")
+    ap.add_argument("--max-points", type=int, default=DEFAULT_MAX_POINTS)
+    ap.add_argument("--force", action="store_true", help="새 기록이 없어도 다시 그림")
+    args = ap.parse_args()
+
+    backend = args.backend or ("sqlite" if (Path(args.log_dir) / DEFAULT_DB_NAME).exists() else "csv")
+    logger = TradeLogger(args.log_dir, backend=backend)
+    if args.report:
+        paths = logger.render_report(args.out, args.format, args.max_points, force=args.force)
+        print("\n".join(f"🖼️ {p}" for p in paths) or "ℹ️ 새 기록 없음 → 차트 그대로")
+    else:
+        logger.draw_graphs(max_points=args.max_points)
+    logger.close()
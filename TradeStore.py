@@ -0,0 +1,268 @@
+from __future__ import annotations
+import csv
+import datetime as dt
+import sqlite3
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+if TYPE_CHECKING:                 # pandas 는 조회할 때 함수 안에서 import (모듈 import 는 가볍게)
+    import pandas as pd
+
+KST = ZoneInfo("Asia/Seoul")
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_DB_NAME = "trades.db"
+# LOG_FSYNC → PRAGMA synchronous (WAL 모드 기준)
+SYNCHRONOUS: Dict[str, str] = {
+    "none":  "OFF",          # OS 버퍼에 맡김
+    "batch": "FULL",         # 커밋(일괄 기록)마다 WAL fsync
+    "close": "NORMAL",       # 체크포인트 때만 fsync, 종료 시 체크포인트
+}
+
+TRADE_COLUMNS  = ["symbol", "side", "qty", "price", "amount"]
+EQUITY_COLUMNS = ["cash", "stock_value", "total_equity", "realized_pnl"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS trades (
+    ts      REAL    NOT NULL,
+    symbol  TEXT    NOT NULL,
+    side    TEXT    NOT NULL,
+    qty     REAL    NOT NULL,
+    price   REAL    NOT NULL,
+    amount  REAL    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS trades_ts     ON trades (ts);
+CREATE INDEX IF NOT EXISTS trades_sym_ts ON trades (symbol, ts);
+CREATE TABLE IF NOT EXISTS equity (
+    ts            REAL NOT NULL,
+    cash          REAL NOT NULL,
+    stock_value   REAL NOT NULL,
+    total_equity  REAL NOT NULL,
+    realized_pnl  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS equity_ts ON equity (ts);
+CREATE TABLE IF NOT EXISTS meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT
+);
+"""
+
+
+def parse_time(s: str) -> float:
+    """CSV time 칸 → epoch 초 (오프셋 없는 옛 로그는 KST 로 간주)"""
+    t = dt.datetime.fromisoformat(s.strip())
+    if t.tzinfo is None:
+        t = t.replace(tzinfo=KST)
+    return t.timestamp()
+
+
+def parse_times(s: pd.Series) -> np.ndarray:
+    """
+    parse_time 의 벡터 버전 (CSV time 컬럼 전체 → epoch 초 배열)
+    • 'YYYY-MM-DD HH:MM:SS' 19자 + 오프셋 접미사로 나눠 파싱 (접미사 종류는 몇 개뿐 → 한 번씩만 계산)
+    """
+    import pandas as pd
+
+    s = s.astype(str).str.strip()
+    try:
+        local = pd.to_datetime(s.str.slice(0, 19), format="ISO8601")
+    except ValueError:                                # 소수 초 등 비표준 형식 → 행 단위 파싱
+        return np.array([parse_time(x) for x in s], dtype=np.float64)
+    offsets = {}
+    for suffix in s.str.slice(19).unique():
+        if suffix in ("", "Z"):
+            offsets[suffix] = 9 * 3600.0 if suffix == "" else 0.0    # 오프셋 없는 옛 로그 → KST
+        else:
+            offsets[suffix] = dt.datetime.fromisoformat(f"2000-01-01 00:00:00{suffix}").utcoffset().total_seconds()
+    sec = (local - pd.Timestamp(0)) / pd.Timedelta(seconds=1)
+    return (sec - s.str.slice(19).map(offsets)).to_numpy(dtype=np.float64)
+
+
+class SqliteStore:
+    """
+    거래·자산 기록 SQLite 저장소 (WAL 모드, 타입 지정 컬럼, epoch 초 ts)
+    • trades: (ts), (symbol, ts) 인덱스 → 기간·종목별 조회가 전체 스캔 없이 처리
+    • equity: (ts) 인덱스
+    • meta:   starting_cash, 마이그레이션 여부 등
+    • BufferedWriter 의 sink 로 사용 (write(records) 한 번 = 트랜잭션 한 번)
+    • WAL 이라 기록 중에도 다른 프로세스(그래프·분석)가 잠금 없이 읽을 수 있음
+    """
+
+    def __init__(self, db_path: str | Path = f"logs/{DEFAULT_DB_NAME}", fsync: str = "batch") -> None:
+        if fsync not in SYNCHRONOUS:
+            raise ValueError(f"LOG_FSYNC 는 {tuple(SYNCHRONOUS)} 중 하나여야 합니다: {fsync!r}")
+        self.path = Path(db_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn  = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={SYNCHRONOUS[fsync]}")
+        self.conn.executescript(_SCHEMA)
+
+    # ─── 기록 ─────────────────────────────────────────
+    def write(self, records: List[tuple]) -> None:
+        """(kind, ts, 값 목록) 레코드 일괄 기록"""
+        trades = [(ts, *row) for kind, ts, row in records if kind == "trades"]
+        equity = [(ts, *row) for kind, ts, row in records if kind == "equity"]
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                if trades:
+                    self.conn.executemany("INSERT INTO trades VALUES (?, ?, ?, ?, ?, ?)", trades)
+                if equity:
+                    self.conn.executemany("INSERT INTO equity VALUES (?, ?, ?, ?, ?)", equity)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def set_meta(self, key: str, value) -> None:
+        with self._lock:
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    def get_meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def close(self) -> None:
+        with self._lock:
+            if self.conn is None:
+                return
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.close()
+            self.conn = None
+
+    # ─── 조회 ─────────────────────────────────────────
+    def version(self) -> Tuple[int, int]:
+        """(마지막 거래 rowid, 마지막 자산 rowid) — 새 기록이 있었는지 O(1) 확인"""
+        with self._lock:
+            return tuple(
+                self.conn.execute(f"SELECT COALESCE(MAX(rowid), 0) FROM {t}").fetchone()[0]
+                for t in ("trades", "equity")
+            )
+
+    def position(self) -> int:
+        """거래 로그 위치 (마지막 거래 rowid) — Ledger 체크포인트용"""
+        return self.version()[0]
+
+    def trades_after(self, rowid: int) -> Tuple[List[tuple], int]:
+        """rowid 이후 거래 (symbol, side, qty, price) 목록과 마지막 rowid"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT rowid, symbol, side, qty, price FROM trades WHERE rowid > ? ORDER BY rowid", (int(rowid),)
+            ).fetchall()
+        return [r[1:] for r in rows], (rows[-1][0] if rows else int(rowid))
+
+    @staticmethod
+    def _range(start: Optional[float], end: Optional[float]) -> Tuple[List[str], list]:
+        where, args = [], []
+        if start is not None:
+            where.append("ts >= ?")
+            args.append(float(start))
+        if end is not None:
+            where.append("ts < ?")
+            args.append(float(end))
+        return where, args
+
+    def _query(self, sql: str, args: list) -> pd.DataFrame:
+        import pandas as pd
+
+        with self._lock:
+            return pd.read_sql_query(sql, self.conn, params=args)
+
+    def trades(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        symbol: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """[start, end) 구간 거래 (epoch 초), symbol 지정 시 해당 종목만"""
+        where, args = self._range(start, end)
+        if symbol is not None:
+            where.insert(0, "symbol = ?")
+            args.insert(0, symbol)
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        return self._query(f"SELECT ts, {', '.join(TRADE_COLUMNS)} FROM trades{clause} ORDER BY ts, rowid", args)
+
+    def equity(self, start: Optional[float] = None, end: Optional[float] = None) -> pd.DataFrame:
+        """[start, end) 구간 자산 스냅샷 (epoch 초)"""
+        where, args = self._range(start, end)
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        return self._query(f"SELECT ts, {', '.join(EQUITY_COLUMNS)} FROM equity{clause} ORDER BY ts, rowid", args)
+
+    def iter_rows(
+        self,
+        table: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        chunksize: int = 100_000,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        [start, end) 구간을 ts 순서로 chunksize 행씩 (메모리보다 큰 기록 분석용)
+        • 읽기 전용 연결을 따로 열어 기록 스레드·잠금과 무관 (WAL 동시 읽기)
+        """
+        import pandas as pd
+
+        columns = {"trades": TRADE_COLUMNS, "equity": EQUITY_COLUMNS}[table]
+        where, args = self._range(start, end)
+        clause = f" WHERE {' AND '.join(where)}" if where else ""
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            yield from pd.read_sql_query(
+                f"SELECT ts, {', '.join(columns)} FROM {table}{clause} ORDER BY ts, rowid",
+                conn, params=args, chunksize=chunksize,
+            )
+        finally:
+            conn.close()
+
+    # ─── CSV 마이그레이션 ──────────────────────────────
+    def migrate_csv(self, trade_csv: str | Path, equity_csv: str | Path) -> Tuple[int, int]:
+        """
+        기존 trades.csv / equity.csv 를 한 번만 가져옴 (meta 'migrated_csv' 로 중복 방지)
+        • time 문자열 → epoch 초, '# starting_cash' 주석 → meta starting_cash
+        • 반환: (거래 행 수, 자산 행 수)
+        """
+        if self.get_meta("migrated_csv"):
+            return 0, 0
+        records: List[tuple] = []
+        trade_csv, equity_csv = Path(trade_csv), Path(equity_csv)
+
+        if trade_csv.exists():
+            with trade_csv.open(encoding="utf-8", newline="") as f:
+                for r in csv.DictReader(f):
+                    records.append(("trades", parse_time(r["time"]), [
+                        r["symbol"], r["side"], float(r["qty"]), float(r["price"]), float(r["amount"]),
+                    ]))
+        n_trades = len(records)
+
+        if equity_csv.exists():
+            with equity_csv.open(encoding="utf-8", newline="") as f:
+                lines = f.read().splitlines()
+            for line in lines:
+                if line.startswith("# starting_cash,"):
+                    self.set_meta("starting_cash", float(line.split(",", 1)[1]))
+            for r in csv.DictReader(l for l in lines if l and not l.startswith("#")):
+                records.append(("equity", parse_time(r["time"]), [float(r[c]) for c in EQUITY_COLUMNS]))
+
+        self.write(records)
+        self.set_meta("migrated_csv", dt.datetime.now(KST).isoformat(timespec="seconds"))
+        return n_trades, len(records) - n_trades
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python TradeStore.py migrate [log_dir]  → log_dir/trades.csv·equity.csv 를 log_dir/trades.db 로
+    if len(sys.argv) >= 2 and sys.argv[1] == "migrate":
+        log_dir = Path(sys.argv[2] if len(sys.argv) > 2 else "logs")
+        store = SqliteStore(log_dir / DEFAULT_DB_NAME)
+        n_t, n_e = store.migrate_csv(log_dir / "trades.csv", log_dir / "equity.csv")
+        store.close()
+        print(f"✅ {log_dir / DEFAULT_DB_NAME}: 거래 {n_t}건 · 자산 {n_e}건 가져옴")
+    else:
+        print("사용법: python TradeStore.py migrate [log_dir]")
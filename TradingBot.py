@@ -1,19 +1,30 @@
 from __future__ import annotations
 import json
 import os
+import time
 import yaml
 import datetime as dt
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from zoneinfo import ZoneInfo
+import Clock
+import Metrics
+from Bars import MinuteBars
+from RateLimiter import RateLimiter
 from TradeLogger import TradeLogger 
+from TokenManager import TokenManager, get_token_manager
 
 # ───── 상수 ───────────────────────────────────────────────────
 ET        = ZoneInfo("US/Eastern")      # 미국 동부시간 (나스닥)
 KST       = ZoneInfo("Asia/Seoul")      # 한국
-TOKEN_LIFE = 18 * 3600                   # 토큰 유효 18 h (24 h 안전 마진)
+
+# ───── 요청 제한 (config.yaml에서 재정의 가능) ─────────────────
+DEFAULT_API_RATE_PER_SEC   = 15          # KIS REST 전체 (실전 계좌 한도 20건/초)
+DEFAULT_ORDER_RATE_PER_SEC = 1           # 주문 (기존 종목당 1초 간격과 동일)
+HTTP_POOL_SIZE             = 32          # 호스트별 keep-alive 연결 수 (틱 파이프라인 스레드 수 상한)
 
 class TradingBot:
     def __init__(
@@ -24,13 +35,20 @@ class TradingBot:
         nasd_list: list[str] | None = None,
         nyse_list: list[str] | None = None,
         amex_list: list[str] | None = None,
+        config: Optional[Dict] = None,
     ):
-        self._load_config(config_path)
+        """config: 파일 대신 쓸 설정 (StrategyEngine 전략별 계좌)"""
+        self._load_config(config_path, config)
+        self.name = ""          # 알림 앞에 붙일 전략 이름 (여러 전략이 같은 Discord 채널을 쓸 때 구분)
+
+        # HTTP 연결 재사용 (KIS · Discord keep-alive, 스레드 간 공유)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
         # 상태 변수
-        self.access_token: str       = ""
-        self.token_issue_time: dt.datetime | None = None
-        self.TOKEN_FILE: Path       = Path("token.json")
+        self.TOKEN_FILE: Path       = Path(self._token_file)
 
         # 매매 파라미터
         self.buy_percent      = buy_percent
@@ -39,30 +57,68 @@ class TradingBot:
         self.nyse_list        = nyse_list or []
         self.amex_list        = amex_list or []
 
-        # 저장된 토큰 불러오기
-        self._load_saved_token()
-        
+        # 공유 토큰 관리자 연결 (저장된 토큰 로드 + 백그라운드 선제 재발급)
+        self.tokens: TokenManager = get_token_manager(
+            url_base=self.URL_BASE,
+            app_key=self.APP_KEY,
+            app_secret=self.APP_SECRET,
+            token_file=self.TOKEN_FILE,
+        )
+        if self.tokens.notify is None:
+            self.tokens.notify = self.send_message
+        self.tokens.start()
+
         # Logger 연동
         self.logger: Optional[TradeLogger] = None
 
-    def _load_config(self, path: str) -> None:
-        with open(path, encoding="utf-8") as f:
-            cfg = yaml.load(f, Loader=yaml.FullLoader)
+    def _load_config(self, path: str, cfg: Optional[Dict] = None) -> None:
+        if cfg is None:
+            with open(path, encoding="utf-8") as f:
+                cfg = yaml.load(f, Loader=yaml.FullLoader)
         self.APP_KEY             = cfg["APP_KEY"]
         self.APP_SECRET          = cfg["APP_SECRET"]
         self.CANO                = cfg["CANO"]
         self.ACNT_PRDT_CD        = cfg["ACNT_PRDT_CD"]
         self.DISCORD_WEBHOOK_URL = cfg["DISCORD_WEBHOOK_URL"]
         self.URL_BASE            = cfg["URL_BASE"]
+        self._token_file         = cfg.get("TOKEN_FILE", "token.json")
+        self.apply_limits(cfg)
+
+    def apply_limits(self, cfg: dict) -> None:
+        """요청 제한 설정 (config.yaml 재적용 시 AutoTrader 에서도 호출)"""
+        self.limiter       = RateLimiter(cfg.get("API_RATE_PER_SEC", DEFAULT_API_RATE_PER_SEC))
+        self.order_limiter = RateLimiter(cfg.get("ORDER_RATE_PER_SEC", DEFAULT_ORDER_RATE_PER_SEC))
 
     def send_message(self, msg: str) -> None:
-        now = dt.datetime.now(KST)
-        payload = {"content": f"[{now:%Y-%m-%d %H:%M:%S}] {msg}"}
+        now = Clock.now(KST)
+        tag     = f"[{self.name}] " if self.name else ""
+        payload = {"content": f"[{now:%Y-%m-%d %H:%M:%S}] {tag}{msg}"}
         try:
-            requests.post(self.DISCORD_WEBHOOK_URL, data=payload, timeout=3)
+            with Metrics.timer("webhook"):
+                self.session.post(self.DISCORD_WEBHOOK_URL, data=payload, timeout=3)
         except Exception:
             pass
         
+    # ─── KIS REST 호출 (요청 제한기 경유) ──────────────────
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        return self._request("GET", url, **kwargs)
+
+    def _post(self, url: str, **kwargs) -> requests.Response:
+        return self._request("POST", url, **kwargs)
+
+    def _request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """엔드포인트별 지연·오류 집계 (제한기 대기 시간은 api.wait 로 분리)"""
+        Metrics.observe("api.wait", self.limiter.acquire())
+        stage = f"api.{url.rsplit('/', 1)[-1]}"
+        t0    = time.perf_counter()
+        try:
+            resp = self.session.request(method, url, **kwargs)
+        except Exception:
+            Metrics.observe(stage, time.perf_counter() - t0, error=True)
+            raise
+        Metrics.observe(stage, time.perf_counter() - t0, error=resp.status_code >= 400)
+        return resp
+
     def _hashkey(self, data: dict) -> str:
         url     = f"{self.URL_BASE}/uapi/hashkey"
         headers = {
@@ -70,76 +126,36 @@ class TradingBot:
             "appKey": self.APP_KEY,
             "appSecret": self.APP_SECRET,
         }
-        res = requests.post(url, headers=headers, data=json.dumps(data))
+        res = self._post(url, headers=headers, data=json.dumps(data))
         return res.json().get("HASH", "")
 
     # ─────────────────────────────────────────────────────────
     # 토큰 관리
     # ─────────────────────────────────────────────────────────
-    def _save_token(self) -> None:
-        blob = {
-            "access_token":     self.access_token,
-            "token_issue_time": self.token_issue_time.isoformat() if self.token_issue_time else None,
-        }
-        self.TOKEN_FILE.write_text(json.dumps(blob), encoding="utf-8")
+    @property
+    def access_token(self) -> str:
+        """요청 경로용 캐시 토큰 (재발급은 TokenManager 백그라운드 스레드가 담당)"""
+        return self.tokens.get()
 
-    def _load_saved_token(self) -> None:
-        if not self.TOKEN_FILE.exists():
-            return
-        try:
-            blob = json.loads(self.TOKEN_FILE.read_text(encoding="utf-8"))
-            self.access_token = blob.get("access_token", "")
-            ts = blob.get("token_issue_time")
-            if ts:
-                t = dt.datetime.fromisoformat(ts)
-                if t.tzinfo is None:
-                    t = t.replace(tzinfo=ET)
-                self.token_issue_time = t
-        except Exception:
-            pass
+    @property
+    def token_issue_time(self) -> dt.datetime | None:
+        return self.tokens.token_issue_time
 
     def _request_new_token(self) -> str:
-        body = {"grant_type": "client_credentials", "appkey": self.APP_KEY, "appsecret": self.APP_SECRET}
-        headers = {"Content-Type": "application/json"}
-        url     = f"{self.URL_BASE}/oauth2/tokenP"
-        res     = requests.post(url, headers=headers, json=body, timeout=3)
-        res.raise_for_status()
-        self.access_token     = res.json()["access_token"]
-        self.token_issue_time = dt.datetime.now(ET)
-        self._save_token()
-        self.send_message("🔑 새 Access Token 발급 완료")
-        return self.access_token
+        return self.tokens.ensure_valid(force=True)
 
     def refresh_token_if_needed(self) -> None:
-        now = dt.datetime.now(ET)
-        t0  = self.token_issue_time
-
-        # 1) 토큰이 없거나 token_issue_time 이 세팅되지 않았으면
-        if t0 is None or not self.access_token:
-            self.send_message("🔄 Access Token 발급")
-            self._request_new_token()
-            return
-
-        # 2) timezone 보정 (fromisoformat 으로 불러올 때 tzinfo 누락 시)
-        if t0.tzinfo is None:
-            t0 = t0.replace(tzinfo=ET)
-
-        # 3) 남은 수명 확인 (여유 마진 5분 포함)
-        elapsed = (now - t0).total_seconds()
-        if elapsed >= TOKEN_LIFE - 300:  # 300초 = 5분 여유
-            self.send_message("🔄 Access Token 재발급 (만료 예정)")
-            self._request_new_token()
+        self.tokens.ensure_valid()
 
     # ─────────────────────────────────────────────────────────
     # 현재가 조회
     # ─────────────────────────────────────────────────────────
     def get_current_price(self, market: str, code: str) -> float:
-        self.refresh_token_if_needed()
         headers = {"Content-Type": "application/json", "authorization": f"Bearer {self.access_token}",
                    "appKey": self.APP_KEY, "appSecret": self.APP_SECRET, "tr_id": "HHDFS00000300"}
         params = {"AUTH": "", "EXCD": market, "SYMB": code}
         url    = f"{self.URL_BASE}/uapi/overseas-price/v1/quotations/price"
-        last   = requests.get(url, headers=headers, params=params).json()["output"]["last"]
+        last   = self._get(url, headers=headers, params=params).json()["output"]["last"]
         price  = float(last)
         self.send_message(f"📈 {code} 현재가 {price}")
         return price
@@ -147,14 +163,18 @@ class TradingBot:
     # ─────────────────────────────────────────────────────────
     # 분봉 차트 데이터 조회
     # ─────────────────────────────────────────────────────────
-    def get_chart_data(
+    def get_chart_bars(
         self,
         market: str = "NAS",
         code:   str = "AAPL",
         interval: str = "1",
         count:   int = 120,
-    ) -> List[Dict[str, Any]]:
-        self.refresh_token_if_needed()
+        notify:  bool = True,
+        before:  Optional[int] = None,
+    ) -> MinuteBars:
+        """
+        before: epoch 초 → 그 시각 이전 봉 페이지 (NEXT·KEYB 연속 조회, 전일 포함) — 과거 분봉 백필용
+        """
         headers = {
             "Content-Type": "application/json",
             "authorization": f"Bearer {self.access_token}",
@@ -166,34 +186,37 @@ class TradingBot:
             "AUTH": "", "EXCD": market, "SYMB": code,
             "TIMETYPE": "1", "CNT": str(count), "INTERVAL": interval,
         }
+        if before is not None:
+            params.update(NEXT="1", PINC="1", KEYB=dt.datetime.fromtimestamp(before, ET).strftime("%Y%m%d%H%M%S"))
         url = f"{self.URL_BASE}/uapi/overseas-price/v1/quotations/inquire-time-itemchartprice"
 
         # ① 응답 JSON 구조 확인
-        resp = requests.get(url, headers=headers, params=params, timeout=5)
+        resp = self._get(url, headers=headers, params=params, timeout=5)
+        if before is not None and resp.status_code >= 400:
+            # 연속 조회는 빈 응답을 '더 이상 과거 봉 없음' 으로 보므로 오류는 빈 결과 대신 예외로
+            raise RuntimeError(f"분봉 연속 조회 실패 (HTTP {resp.status_code})")
         data = resp.json()
+        if before is not None and data.get("rt_cd", "0") != "0":
+            raise RuntimeError(f"분봉 연속 조회 실패: {data.get('msg1', data.get('rt_cd'))}")
         raw = data.get("output2", [])
         if raw:
             print("[DEBUG] chart data fields:", raw[0].keys())
 
-        chart = []
-        for it in raw:
-            # 실제 필드명 'tymd' + 'xhms' 조합으로 datetime 생성
-            date = it.get("tymd") or it.get("xymd")
-            hms  = it.get("xhms") or it.get("khms")
-            if not date or not hms:
-                continue
-            dt_obj = dt.datetime.strptime(date + hms, "%Y%m%d%H%M%S").replace(tzinfo=ET)
-
-            chart.append({
-                "time": dt_obj.strftime("%Y-%m-%d %H:%M:%S %Z"),
-                "open": float(it.get("open", 0)),
-                "high": float(it.get("high", 0)),
-                "low":  float(it.get("low", 0)),
-                "last": float(it.get("last", 0)),
-                "evol": int(it.get("evol", 0)),
-            })
-        self.send_message(f"🗂️ {code} 차트 {len(chart)}개 조회 완료")
-        return chart
+        # ② 'tymd' + 'xhms' → epoch 초, OHLC·거래량 → 배열로 바로 변환
+        bars = MinuteBars.from_kis(raw)
+        if notify:
+            self.send_message(f"🗂️ {code} 차트 {len(bars)}개 조회 완료")
+        return bars
+
+    def get_chart_data(
+        self,
+        market: str = "NAS",
+        code:   str = "AAPL",
+        interval: str = "1",
+        count:   int = 120,
+    ) -> List[Dict[str, Any]]:
+        """get_chart_bars() 결과를 기존 list[dict] 형식으로 반환 (호환용)"""
+        return self.get_chart_bars(market, code, interval, count).to_dicts()
 
     # ─────────────────────────────────────────────────────────
     # 체결 추이 조회
@@ -209,7 +232,6 @@ class TradingBot:
         • code:   종목 심볼
         • tday:   조회할 날짜(YYYYMMDD)
         """
-        self.refresh_token_if_needed()
         headers = {
             "Content-Type": "application/json",
             "authorization": f"Bearer {self.access_token}",
@@ -221,7 +243,7 @@ class TradingBot:
             "AUTH": "", "EXCD": market, "SYMB": code, "TDAY": tday
         }
         url  = f"{self.URL_BASE}/uapi/overseas-price/v1/quotations/inquire-ccnl"
-        resp = requests.get(url, headers=headers, params=params, timeout=5)
+        resp = self._get(url, headers=headers, params=params, timeout=5)
         resp.raise_for_status()
         raw = resp.json().get("output1", [])
         if raw:
@@ -244,8 +266,6 @@ class TradingBot:
     # 잔고·환율·평가
     # ─────────────────────────────────────────────────────────
     def get_balance(self) -> int:
-        self.refresh_token_if_needed()
-
         headers = {
             "Content-Type": "application/json",
             "authorization": f"Bearer {self.access_token}",
@@ -264,14 +284,12 @@ class TradingBot:
             "OVRS_ICLD_YN":    "Y",
         }
         url  = f"{self.URL_BASE}/uapi/domestic-stock/v1/trading/inquire-psbl-order"
-        cash = int(requests.get(url, headers=headers, params=params)
+        cash = int(self._get(url, headers=headers, params=params)
                    .json()["output"]["ord_psbl_cash"])
         self.send_message(f"💰 현금 {cash:,} KRW")
         return cash
 
     def get_stock_balance(self) -> dict[str, int]:
-        self.refresh_token_if_needed()
-
         headers = {
             "Content-Type": "application/json",
             "authorization": f"Bearer {self.access_token}",
@@ -289,15 +307,13 @@ class TradingBot:
             "CTX_AREA_NK200": "",
         }
         url  = f"{self.URL_BASE}/uapi/overseas-stock/v1/trading/inquire-balance"
-        rows = requests.get(url, headers=headers, params=params).json().get("output1", [])
+        rows = self._get(url, headers=headers, params=params).json().get("output1", [])
         stock = {r["ovrs_pdno"]: int(r["ovrs_cblc_qty"])
                  for r in rows if int(r["ovrs_cblc_qty"]) > 0}
         self.send_message(f"📦 보유 종목 {stock}")
         return stock
 
     def get_account_summary(self) -> Dict[str, float]:
-        self.refresh_token_if_needed()
-
         # 1) USD/KRW
         headers = {
             "Content-Type": "application/json",
@@ -316,12 +332,12 @@ class TradingBot:
             "INQR_DVSN_CD":    "00",
         }
         url_rate = f"{self.URL_BASE}/uapi/overseas-stock/v1/trading/inquire-present-balance"
-        usdkrw   = float(requests.get(url_rate, headers=headers, params=params)
+        usdkrw   = float(self._get(url_rate, headers=headers, params=params)
                          .json()["output2"][0]["frst_bltn_exrt"])
 
         # 2) 잔고·평가·손익 조회
         headers["tr_id"] = "JTTT3012R"
-        bal = requests.get(
+        bal = self._get(
             f"{self.URL_BASE}/uapi/overseas-stock/v1/trading/inquire-balance",
             headers=headers,
             params={
@@ -362,8 +378,6 @@ class TradingBot:
         }
         
     def get_usd_balance(self) -> float:
-        self.refresh_token_if_needed()
-
         headers = {
             "Content-Type":  "application/json",
             "authorization": f"Bearer {self.access_token}",
@@ -382,7 +396,7 @@ class TradingBot:
         }
 
         url  = f"{self.URL_BASE}/uapi/overseas-stock/v1/trading/inquire-balance"
-        res  = requests.get(url, headers=headers, params=params, timeout=5).json()
+        res  = self._get(url, headers=headers, params=params, timeout=5).json()
 
         # output1·2·3 → list 로 정규화
         def _n(x): return x if isinstance(x, list) else ([x] if isinstance(x, dict) else [])
@@ -416,7 +430,6 @@ class TradingBot:
     # 주문
     # ─────────────────────────────────────────────────────────
     def buy(self, market: str, code: str, qty: int, price: float) -> bool:
-        self.refresh_token_if_needed()
         data = {
             "CANO":         self.CANO,
             "ACNT_PRDT_CD": self.ACNT_PRDT_CD,
@@ -437,7 +450,8 @@ class TradingBot:
             "hashkey": self._hashkey(data),
         }
         url = f"{self.URL_BASE}/uapi/overseas-stock/v1/trading/order"
-        res = requests.post(url, headers=headers, data=json.dumps(data)).json()
+        self.order_limiter.acquire()
+        res = self._post(url, headers=headers, data=json.dumps(data)).json()
         ok = res.get("rt_cd") == "0"
 
         if ok:
@@ -455,7 +469,6 @@ class TradingBot:
         return ok
 
     def sell(self, market: str, code: str, qty: int, price: float) -> bool:
-        self.refresh_token_if_needed()
         data = {
             "CANO":            self.CANO,
             "ACNT_PRDT_CD":    self.ACNT_PRDT_CD,
@@ -476,7 +489,8 @@ class TradingBot:
             "hashkey":          self._hashkey(data),
         }
         url = f"{self.URL_BASE}/uapi/overseas-stock/v1/trading/order"
-        res = requests.post(url, headers=headers, data=json.dumps(data)).json()
+        self.order_limiter.acquire()
+        res = self._post(url, headers=headers, data=json.dumps(data)).json()
         ok = res.get("rt_cd") == "0"
 
         if ok:
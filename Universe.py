@@ -0,0 +1,86 @@
+from __future__ import annotations
+from typing import Dict, List, Mapping, Optional
+
+# ───── 기본 설정값 ──────────────────────────────────────────────
+DEFAULT_BATCH_SIZE = 25        # 한 번에 동시 처리할 종목 수
+NEWS_WEIGHT        = 0.1       # 뉴스 1건(neutral 제외)당 우선순위 가산점
+AGING_WEIGHT       = 0.2       # 처리되지 못한 틱 1회당 우선순위 가산점 (장기 미처리 방지)
+
+
+def chunked(items: List[str], size: int) -> List[List[str]]:
+    size = max(1, size)
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+class UniversePlanner:
+    """
+    대규모 종목(universe) 모드의 틱별 처리 순서와 커버리지 관리
+    • 우선순위: 보유 종목 → 아직 한 번도 처리하지 않은 종목
+      → |직전 점수| + 뉴스 활동 × NEWS_WEIGHT + 미처리 틱 수 × AGING_WEIGHT 큰 순
+    • plan() 이 돌려준 배치를 앞에서부터 시간 예산 안에서 처리하고 covered() 로 결과 보고
+    """
+
+    def __init__(self, symbols: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.symbols    = list(symbols)
+        self.batch_size = batch_size
+        self.tick       = 0
+        self.last_total: Dict[str, float] = {}
+        self.news_count: Dict[str, int]   = {}
+        self.last_tick:  Dict[str, int]   = {}
+
+    # ─── 상태 갱신 ─────────────────────────────────────
+    def record_score(self, sym: str, total: float) -> None:
+        self.last_total[sym] = total
+        self.last_tick[sym]  = self.tick
+
+    def record_news(self, sym: str, count: int) -> None:
+        self.news_count[sym] = count
+
+    # ─── 계획 ─────────────────────────────────────────
+    def priority(self, sym: str, holdings: Mapping[str, int]) -> tuple:
+        if holdings.get(sym, 0) > 0:
+            return (0, 0.0)
+        if sym not in self.last_tick:
+            return (1, 0.0)
+        age = self.tick - self.last_tick[sym]
+        strength = (
+            abs(self.last_total.get(sym, 0.0))
+            + self.news_count.get(sym, 0) * NEWS_WEIGHT
+            + age * AGING_WEIGHT
+        )
+        return (2, -strength)
+
+    def plan(self, holdings: Mapping[str, int]) -> List[List[str]]:
+        """이번 틱 처리 순서 (배치 목록), 호출할 때마다 틱 번호 증가"""
+        self.tick += 1
+        order = sorted(self.symbols, key=lambda s: self.priority(s, holdings))
+        return chunked(order, self.batch_size)
+
+    # ─── 커버리지 ─────────────────────────────────────
+    def coverage(self, covered: List[str], holdings: Mapping[str, int], elapsed: float) -> Dict[str, float]:
+        held     = [s for s in self.symbols if holdings.get(s, 0) > 0]
+        done     = set(covered)
+        stale    = [self.tick - self.last_tick[s] for s in self.symbols if s in self.last_tick]
+        never    = sum(1 for s in self.symbols if s not in self.last_tick)
+        total    = len(self.symbols)
+        return {
+            "tick":         self.tick,
+            "covered":      len(done),
+            "total":        total,
+            "pct":          100.0 * len(done) / total if total else 100.0,
+            "held_covered": sum(1 for s in held if s in done),
+            "held_total":   len(held),
+            "never_seen":   never,
+            "max_stale":    max(stale) if stale else 0,
+            "elapsed":      elapsed,
+        }
+
+    @staticmethod
+    def format(cov: Optional[Dict[str, float]]) -> str:
+        if not cov:
+            return ""
+        return (
+            f"🌐 커버리지 {cov['covered']}/{cov['total']} ({cov['pct']:.0f}%) · "
+            f"보유 {cov['held_covered']}/{cov['held_total']} · "
+            f"미처리 {cov['never_seen']} · 최대 지연 {cov['max_stale']}틱 · {cov['elapsed']:.1f}s"
+        )
@@ -1,7 +1,8 @@
-import threading, signal, sys, time
+import threading, signal, sys
 import datetime as dt
+from typing import Optional
 from zoneinfo import ZoneInfo
-from AutoTrader import AutoTrader
+from Supervisor import Supervisor
 from TradingBot import TradingBot
 
 ET = ZoneInfo("US/Eastern")
@@ -9,8 +10,8 @@ ET = ZoneInfo("US/Eastern")
 # ─── 전역 STOP 이벤트 ───────────────────────────────────────
 STOP_EVENT = threading.Event()
 
-# ─── 전역용 Bot 인스턴스 (메시지 전송용) ─────────────────────
-BOT = TradingBot(config_path="config.yaml")
+# ─── 전역용 Bot 인스턴스 (메시지 전송용, 샤드 워커 프로세스가 이 모듈을 다시 import 해도 만들지 않도록 실행 시 생성) ──
+BOT: Optional[TradingBot] = None
 
 # ─── SIGINT 핸들러 ─────────────────────────────────────────
 def _sigint_handler(sig, frame):
@@ -19,32 +20,14 @@ def _sigint_handler(sig, frame):
     STOP_EVENT.set()          # AutoTrader에게도 종료 신호
     sys.exit(0)               # 메인 스레드 강제 종료
 
-signal.signal(signal.SIGINT, _sigint_handler)
-
 # ─── 메인 루프 ──────────────────────────────────────────────
 def main():
-    while not STOP_EVENT.is_set():
-        trader = AutoTrader(stop_event=STOP_EVENT)
-
-        th = threading.Thread(
-            target=trader.run,
-            name="AutoTrader",
-            daemon=True
-        )
-        th.start()
-
-        # AutoTrader 종료 또는 SIGINT 대기
-        while th.is_alive() and not STOP_EVENT.is_set():
-            th.join(timeout=1)
-
-        if STOP_EVENT.is_set():
-            break
-
-        # AutoTrader 예외 종료 → 30초 뒤 재시작
-        BOT.send_message("❌ AutoTrader 종료 : 30초 후 재시작")
-        time.sleep(30)
-
+    # AutoTrader 예외 종료 → 상태(토큰·잔고·캐시) 유지한 채 지수 백오프 후 재시작
+    # config.yaml 변경 → 실행 중 반영 또는 워커만 교체
+    Supervisor(STOP_EVENT, config_path="config.yaml", notify=BOT.send_message).run()
     BOT.send_message("👋 main.py 정상 종료")
 
 if __name__ == "__main__":
+    BOT = TradingBot(config_path="config.yaml")
+    signal.signal(signal.SIGINT, _sigint_handler)
     main()